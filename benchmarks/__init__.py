@@ -0,0 +1 @@
+"""Benchmarks for the compiler stages, run as modules from the repository root."""
@@ -0,0 +1,198 @@
+"""
+Lexer micro-benchmarks over synthetic C corpora.
+
+Each corpus stresses one shape of input (long lines, identifiers, operators, comment blocks,
+#ifdef nests). The benchmark times LexerService on a temporary file holding the corpus, reports
+tokens per second and peak traced memory, and can save the results as JSON or compare them
+against a saved baseline.
+
+	python -m benchmarks.lexer_benchmark --size 1000000 --save baseline.json
+	python -m benchmarks.lexer_benchmark --size 1000000 --baseline baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from modules.lexer.LexerService import LexerService
+
+RESULTS_VERSION = 1
+IDENTIFIER_CHARACTERS = "abcdefghijklmnopqrstuvwxyz_ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+OPERATORS = ["+", "-", "*", "/", "%", "<<", ">>", "&", "|", "^", "&&", "||", "==", "!=", "<=", ">=", "<", ">"]
+
+
+def _identifier(rng: random.Random, length: int) -> str:
+	return rng.choice("abcdefghijklmnopqrstuvwxyz_") + "".join(rng.choices(IDENTIFIER_CHARACTERS, k=length - 1))
+
+
+def long_lines(rng: random.Random) -> str:
+	terms = " + ".join(f"(x{index} * {rng.randint(0, 999)})" for index in range(400))
+	return f"int f(void) {{ return {terms}; }}\n"
+
+
+def identifiers(rng: random.Random) -> str:
+	names = [_identifier(rng, rng.randint(1, 24)) for _ in range(8)]
+	return f"int {names[0]}(int {names[1]}) {{\n\tint {names[2]} = {names[3]} + {names[4]};\n\treturn {names[5]}({names[6]}, {names[7]});\n}}\n"
+
+
+def operators(rng: random.Random) -> str:
+	expression = "a"
+	for _ in range(30):
+		expression += f" {rng.choice(OPERATORS)} {rng.choice(['~', '!', '-', ''])}({rng.randint(0, 9)})"
+	return f"\tx = {expression};\n"
+
+
+def comments(rng: random.Random) -> str:
+	lines = "\n".join(f"   * {_identifier(rng, 10)} {_identifier(rng, 6)} @ $ ` (/ not code)" for _ in range(20))
+	return f"/*\n{lines}\n */\nint x; // {_identifier(rng, 30)}\n"
+
+
+def ifdef_nests(rng: random.Random) -> str:
+	depth = rng.randint(1, 8)
+	opening = "".join(f"{'#ifdef' if level % 2 else '#ifndef'} {_identifier(rng, 8)}\n" for level in range(depth))
+	closing = "".join("#else\nint y;\n#endif\n" for _ in range(depth))
+	return f"{opening}int x = {rng.randint(0, 99)};\n{closing}"
+
+
+CORPORA: Dict[str, Callable[[random.Random], str]] = {
+	"long_lines": long_lines,
+	"identifiers": identifiers,
+	"operators": operators,
+	"comments": comments,
+	"ifdef_nests": ifdef_nests,
+}
+
+
+def generate_corpus(name: str, size: int, seed: int = 0) -> str:
+	"""Repeat the corpus generator until the text is at least `size` characters long"""
+	rng = random.Random(seed)
+	unit = CORPORA[name]
+	parts: List[str] = []
+	length = 0
+	while length < size:
+		part = unit(rng)
+		parts.append(part)
+		length += len(part)
+	return "".join(parts)
+
+
+MODES: Dict[str, Callable[[LexerService, str], object]] = {
+	"lex_file": lambda lexer, file_name: lexer.lex_file(file_name),
+	"whole_file": lambda lexer, file_name: lexer.lex_file(file_name, whole_file=True),
+	"buffer": lambda lexer, file_name: lexer.lex_buffer(file_name),
+	"mmap": lambda lexer, file_name: lexer.lex_mmap(file_name),
+}
+
+
+def benchmark_file(file_name: str, mode: str = "lex_file", repeat: int = 3) -> Dict[str, float]:
+	"""Best of `repeat` timed runs, then one run under tracemalloc for the peak memory"""
+	lex = MODES[mode]
+	best = float("inf")
+	tokens = 0
+	for _ in range(repeat):
+		lexer = LexerService()
+		start = time.perf_counter()
+		result = lex(lexer, file_name)
+		best = min(best, time.perf_counter() - start)
+		tokens = len(result)
+		del result
+
+	tracemalloc.start()
+	result = lex(LexerService(), file_name)
+	_, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	del result
+
+	size = os.path.getsize(file_name)
+	return {
+		"bytes": size,
+		"tokens": tokens,
+		"seconds": best,
+		"tokens_per_second": tokens / best if best else 0.0,
+		"megabytes_per_second": size / best / 1e6 if best else 0.0,
+		"peak_memory_bytes": peak,
+	}
+
+
+def run(size: int, mode: str = "lex_file", repeat: int = 3, corpora: List[str] | None = None, seed: int = 0) -> Dict:
+	results = {}
+	with tempfile.TemporaryDirectory() as directory:
+		for name in corpora or list(CORPORA):
+			file_name = os.path.join(directory, f"{name}.c")
+			with open(file_name, "w") as file:
+				file.write(generate_corpus(name, size, seed))
+			results[name] = benchmark_file(file_name, mode, repeat)
+	return {
+		"version": RESULTS_VERSION,
+		"mode": mode,
+		"size": size,
+		"python": platform.python_version(),
+		"results": results,
+	}
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = 0.05) -> List[str]:
+	"""Corpora whose tokens/sec dropped, or peak memory grew, by more than `threshold`"""
+	regressions = []
+	for name, result in current["results"].items():
+		base = baseline["results"].get(name)
+		if base is None:
+			continue
+		speed = result["tokens_per_second"] / base["tokens_per_second"]
+		if speed < 1 - threshold:
+			regressions.append(f"{name}: {speed:.2f}x tokens/sec of baseline")
+		memory = result["peak_memory_bytes"] / max(base["peak_memory_bytes"], 1)
+		if memory > 1 + threshold:
+			regressions.append(f"{name}: {memory:.2f}x peak memory of baseline")
+	return regressions
+
+
+def format_report(current: Dict, baseline: Dict | None = None) -> str:
+	lines = [f"{'corpus':<14}{'tokens':>10}{'seconds':>10}{'tokens/s':>12}{'MB/s':>8}{'peak KiB':>10}" + ("  vs baseline" if baseline else "")]
+	for name, result in current["results"].items():
+		line = (f"{name:<14}{result['tokens']:>10}{result['seconds']:>10.3f}{result['tokens_per_second']:>12.0f}"
+			f"{result['megabytes_per_second']:>8.2f}{result['peak_memory_bytes'] / 1024:>10.0f}")
+		base = baseline["results"].get(name) if baseline else None
+		if base:
+			line += f"  {result['tokens_per_second'] / base['tokens_per_second']:.2f}x"
+		lines.append(line)
+	return "\n".join(lines)
+
+
+def main(argv: List[str] | None = None) -> int:
+	argparser = argparse.ArgumentParser(description="Benchmark the lexer on synthetic C corpora.")
+	argparser.add_argument('--size', type=int, default=200_000, help='Approximate size of each corpus in characters')
+	argparser.add_argument('--mode', choices=list(MODES), default="lex_file", help='LexerService entry point to time')
+	argparser.add_argument('--repeat', type=int, default=3, help='Timed runs per corpus, the best one is reported')
+	argparser.add_argument('--corpus', action='append', choices=list(CORPORA), help='Only run this corpus (repeatable)')
+	argparser.add_argument('--seed', type=int, default=0, help='Seed for the corpus generators')
+	argparser.add_argument('--save', type=str, help='Write the results to this JSON file')
+	argparser.add_argument('--baseline', type=str, help='Compare against results saved with --save')
+	argparser.add_argument('--threshold', type=float, default=0.05, help='Relative change reported as a regression')
+	args = argparser.parse_args(argv)
+
+	current = run(args.size, args.mode, args.repeat, args.corpus, args.seed)
+	baseline = None
+	if args.baseline:
+		with open(args.baseline) as file:
+			baseline = json.load(file)
+	print(format_report(current, baseline))
+	if args.save:
+		with open(args.save, "w") as file:
+			json.dump(current, file, indent=2)
+	if baseline:
+		regressions = compare(current, baseline, args.threshold)
+		for regression in regressions:
+			print(f"REGRESSION {regression}")
+		return 1 if regressions else 0
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
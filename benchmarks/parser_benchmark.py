@@ -0,0 +1,136 @@
+"""
+Expression parser benchmarks over deeply nested synthetic expressions.
+
+Each shape nests one kind of construct `depth` levels deep (parentheses, right-nested operator
+chains, prefix operators). The benchmark times ExpressionParser in both modes at every depth and
+reports microseconds per level, which stays flat when parsing is linear. The recursive mode is
+reported as failing once the nesting exceeds Python's recursion limit.
+
+	python -m benchmarks.parser_benchmark --depth 1000 --depth 10000 --depth 50000
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Callable, Dict, List
+
+from modules.lexer.LexerService import LexerService
+from modules.lexer.models.TokenBuffer import TokenBuffer
+from modules.parser.Services.BufferedTokenIteratorService import BufferedTokenIteratorService
+from modules.parser.Services.ExpressionParser import ExpressionParser
+
+RESULTS_VERSION = 1
+DEFAULT_DEPTHS = [1000, 10_000, 50_000]
+
+
+def parentheses(depth: int) -> str:
+	return "(" * depth + "1" + ")" * depth
+
+
+def right_nested(depth: int) -> str:
+	return "1 + (" * depth + "1" + ")" * depth
+
+
+def mixed(depth: int) -> str:
+	operators = ["+", "*", "<<", "&", "==", "||", "-", "%"]
+	return "".join(f"{index} {operators[index % len(operators)]} (" for index in range(depth)) + "1" + ")" * depth
+
+
+def prefix(depth: int) -> str:
+	return "-~" * (depth // 2) + "1"
+
+
+def chain(depth: int) -> str:
+	return " + ".join(["1"] * depth)
+
+
+SHAPES: Dict[str, Callable[[int], str]] = {
+	"parentheses": parentheses,
+	"right_nested": right_nested,
+	"mixed": mixed,
+	"prefix": prefix,
+	"chain": chain,
+}
+
+MODES = {"recursive": False, "iterative": True}
+
+
+def time_parse(tokens: TokenBuffer, iterative: bool, repeat: int = 3) -> float | None:
+	"""Best of `repeat` parses, None when the parser runs out of recursion depth"""
+	best = float("inf")
+	for _ in range(repeat):
+		parser = ExpressionParser(BufferedTokenIteratorService(tokens), iterative)
+		start = time.perf_counter()
+		try:
+			expression = parser.parse_expression()
+		except RecursionError:
+			return None
+		best = min(best, time.perf_counter() - start)
+		del expression
+	return best
+
+
+def run(depths: List[int], modes: List[str] | None = None, shapes: List[str] | None = None, repeat: int = 3) -> Dict:
+	results: Dict[str, Dict] = {}
+	lexer = LexerService()
+	for shape in shapes or list(SHAPES):
+		for depth in depths:
+			tokens = lexer.buffer_text(SHAPES[shape](depth))
+			for mode in modes or list(MODES):
+				seconds = time_parse(tokens, MODES[mode], repeat)
+				results.setdefault(shape, {}).setdefault(mode, {})[str(depth)] = {
+					"tokens": len(tokens),
+					"seconds": seconds,
+					"microseconds_per_level": seconds / depth * 1e6 if seconds is not None else None,
+				}
+	return {
+		"version": RESULTS_VERSION,
+		"depths": depths,
+		"python": platform.python_version(),
+		"recursion_limit": sys.getrecursionlimit(),
+		"results": results,
+	}
+
+
+def growth(results: Dict, shape: str, mode: str) -> float | None:
+	"""Cost per level at the deepest depth relative to the shallowest, about 1.0 when linear"""
+	timings = [result["microseconds_per_level"] for result in results["results"][shape][mode].values()]
+	if len(timings) < 2 or None in timings or not timings[0]:
+		return None
+	return timings[-1] / timings[0]
+
+
+def format_report(results: Dict) -> str:
+	depths = results["depths"]
+	lines = [f"{'shape':<14}{'mode':<11}" + "".join(f"{f'{depth} us/lvl':>16}" for depth in depths) + f"{'growth':>8}"]
+	for shape, modes in results["results"].items():
+		for mode, timings in modes.items():
+			cells = ""
+			for depth in depths:
+				value = timings[str(depth)]["microseconds_per_level"]
+				cells += f"{'recursion':>16}" if value is None else f"{value:>16.2f}"
+			ratio = growth(results, shape, mode)
+			lines.append(f"{shape:<14}{mode:<11}{cells}{'-' if ratio is None else f'{ratio:.2f}x':>8}")
+	return "\n".join(lines)
+
+
+def main(argv: List[str] | None = None) -> int:
+	argparser = argparse.ArgumentParser(description="Benchmark expression parsing on deeply nested input.")
+	argparser.add_argument('--depth', type=int, action='append', help=f'Nesting depth to time (repeatable, default {DEFAULT_DEPTHS})')
+	argparser.add_argument('--mode', action='append', choices=list(MODES), help='Only time this parser mode (repeatable)')
+	argparser.add_argument('--shape', action='append', choices=list(SHAPES), help='Only run this expression shape (repeatable)')
+	argparser.add_argument('--repeat', type=int, default=3, help='Timed runs per depth, the best one is reported')
+	argparser.add_argument('--save', type=str, help='Write the results to this JSON file')
+	args = argparser.parse_args(argv)
+
+	results = run(sorted(args.depth or DEFAULT_DEPTHS), args.mode, args.shape, args.repeat)
+	print(format_report(results))
+	if args.save:
+		with open(args.save, "w") as file:
+			json.dump(results, file, indent=2)
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -13,8 +13,7 @@ export OUTPUT_EXECUTABLE='dist/'$FILE_NAME
 echo "INPUT: " $INPUT_FILE
 echo "OUTPUT: " $OUTPUT_FILE
 
-gcc -E -P $INPUT_FILE -o $OUTPUT_FILE
-uv run main.py
+uv run main.py --preprocess -S $INPUT_ASSEMBLY $INPUT_FILE
 gcc $INPUT_ASSEMBLY -o $OUTPUT_EXECUTABLE
 
 echo "Running compiled application:"
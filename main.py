@@ -4,7 +4,11 @@ import logging
 from modules.codeGenerator.AssemblyGenerator import AssemblyGenerator
 from modules.lexer.LexerService import LexerService
 from modules.parser.ParserServiceV2 import ParserServiceV2
+from modules.preprocessor.PreprocessorService import PreprocessorService
+from modules.parser.Services.BufferedTokenIteratorService import BufferedTokenIteratorService
+from modules.parser.Services.StreamingTokenIteratorService import StreamingTokenIteratorService
 from modules.IntermediateGenerator.IRGenerator import IRGenerator
+from modules.models.nodes.ASTNode import set_ast_validation
 from modules.utils import logger
 
 argparser = argparse.ArgumentParser(description="A C Compiler implementation.")
@@ -23,6 +27,20 @@ def main():
 	argparser.add_argument('--codegen',"-c", action='store_true', help='Perform codegen')
 	argparser.add_argument('--tacky',"-t", action='store_true', help='Perform tacky')
 	argparser.add_argument('--output', "-S", type=str, help='File location to process', default="output.s")
+	argparser.add_argument('--stream', action='store_true', help='Stream tokens from the lexer into the parser instead of lexing the whole file first')
+	argparser.add_argument('--mmap', action='store_true', help='Lex ASCII input straight from a memory map of the file')
+	argparser.add_argument('--jobs', "-j", type=int, default=1, help='Lex and parse large files in chunks across this many processes')
+	argparser.add_argument('--token-cache', type=str, help='Directory used to cache lexed tokens by file content')
+	argparser.add_argument('--ast-cache', type=str, help='Directory used to cache parsed programs by file content, a hit goes straight to lowering')
+	argparser.add_argument('--preprocess', "-P", action='store_true', help='Run the built-in preprocessor before lexing')
+	argparser.add_argument('--include', "-I", action='append', default=[], help='Add a directory to the #include search path')
+	argparser.add_argument('--define', "-D", action='append', default=[], help='Predefine a macro as NAME or NAME=VALUE')
+	argparser.add_argument('--header-cache', type=str, help='Directory used to cache parsed headers by path and modification time')
+	argparser.add_argument('--iterative-expressions', action='store_true', help='Parse expressions with an explicit stack instead of recursion, for deeply nested input')
+	argparser.add_argument('--lazy-bodies', action='store_true', help='Record function bodies as token ranges and only parse them when a later stage needs them')
+	argparser.add_argument('--optimize', "-O", action='store_true', help='Run the optimization passes before emitting code')
+	argparser.add_argument('--ssa', action='store_true', help='Run the Tacky passes in SSA form, entering it after lowering and leaving it before legalization')
+	argparser.add_argument('--validate-ast', action='store_true', help='Type-check the fields of every AST node as it is built (slow, for debugging)')
 	argparser.add_argument('--verbose', "-v", action='store_true', help='Enable verbose logging')
 	argparser.add_argument('--log-file', type=str, help='Log to file instead of console')
 	argparser.add_argument('file', type=ascii, help='File to process')
@@ -36,27 +54,71 @@ def main():
 	
 	_logger.info("Compiler starting...")
 	_logger.debug(f"Arguments: {args}")
+	if args.validate_ast:
+		set_ast_validation(True)
 	
 	if(args.file):
 		try:
 			file_path = args.file.strip("'")
 			_logger.info(f"Processing file: {file_path}")
 			
-			# Lexical analysis
-			_logger.debug("Starting lexical analysis...")
-			lexer = LexerService()
-			tokens = lexer.lex_file(file_path)
-			_logger.info(f"Lexical analysis complete. Generated {len(tokens)} tokens.")
-			if(args.lex):
-				_logger.debug("Stopping after lexical analysis as requested.")
-				sys.exit(0)
-			
-			# Parsing
-			_logger.debug("Starting parsing...")
-			#parser = ParserService()
-			parserV2 = ParserServiceV2()
-			#ast = parser.parse_lex(tokens) # type: ignore
-			ast = parserV2.parse_lex(tokens) # type: ignore
+			source = None
+			if args.preprocess:
+				_logger.debug("Starting preprocessing...")
+				defines = dict(define.split("=", 1) if "=" in define else (define, "1") for define in args.define)
+				preprocessor = PreprocessorService(args.include, defines, cache_dir=args.header_cache)
+				source = preprocessor.preprocess_file(file_path)
+				_logger.info("Preprocessing complete.")
+				preprocessor.log_stats()
+
+			lexer = LexerService(cache_dir=args.token_cache)
+			parserV2 = ParserServiceV2(StreamingTokenIteratorService() if args.stream and not args.lex else BufferedTokenIteratorService(),
+				args.iterative_expressions, args.lazy_bodies, cache_dir=args.ast_cache)
+
+			def lex_and_parse():
+				if args.stream and not args.lex:
+					# Lexing and parsing overlap, tokens are pulled by the parser as needed
+					_logger.debug("Starting streamed lexical analysis and parsing...")
+					tokens = lexer.iter_source(source) if source is not None else lexer.iter_tokens(file_path)
+					return parserV2.parse_stream(tokens)
+				else:
+					# Lexical analysis
+					_logger.debug("Starting lexical analysis...")
+					if source is not None:
+						tokens = lexer.buffer_text(source, args.jobs)
+					elif args.mmap:
+						tokens = lexer.lex_mmap(file_path)
+					elif args.jobs > 1:
+						tokens = lexer.lex_parallel(file_path, args.jobs)
+					else:
+						tokens = lexer.lex_buffer(file_path)
+					_logger.info(f"Lexical analysis complete. Generated {len(tokens)} tokens.")
+					if lexer.token_cache is not None:
+						lexer.token_cache.log_stats()
+					if(args.lex):
+						_logger.debug("Stopping after lexical analysis as requested.")
+						sys.exit(0)
+					
+					# Parsing
+					_logger.debug("Starting parsing...")
+					#parser = ParserService()
+					#ast = parser.parse_lex(tokens) # type: ignore
+					if args.jobs > 1:
+						return parserV2.parse_parallel(tokens, args.jobs)
+					else:
+						return parserV2.parse_lex(tokens) # type: ignore
+
+			if args.lex or parserV2.ast_cache is None:
+				ast = lex_and_parse()
+			else:
+				# A cached tree skips lexing and parsing
+				if source is not None:
+					content = source.encode('utf-8', 'surrogatepass')
+				else:
+					with open(file_path, 'rb') as file:
+						content = file.read()
+				ast = parserV2.parse_cached(content, lex_and_parse)
+				parserV2.ast_cache.log_stats()
 			_logger.info("Parsing complete. AST generated.")
 			if(args.parse):
 				_logger.debug("Stopping after parsing as requested.")
@@ -64,7 +126,7 @@ def main():
 			
 			# Tacky intermediate representation
 			_logger.debug("Converting to Tacky IR...")
-			ir_Generator = IRGenerator()
+			ir_Generator = IRGenerator(args.optimize, args.ssa)
 			intermediate_representation = ir_Generator.parse_ast(ast)
 			_logger.info("Tacky IR generation complete.")
 			if(args.tacky):
@@ -1,6 +1,13 @@
 from typing import List
 from modules.models.nodes.BaseNode import BaseNode, IRNode 
 from modules.models.nodes.AST.ProgramNode import ProgramNode
+from modules.IntermediateGenerator.optimizations.ConstantFolder import ConstantFolder
+from modules.IntermediateGenerator.optimizations.ControlFlowGraph import ControlFlowGraph
+from modules.IntermediateGenerator.optimizations.CopyPropagation import CopyPropagation
+from modules.IntermediateGenerator.optimizations.DeadStoreElimination import DeadStoreElimination
+from modules.IntermediateGenerator.optimizations.InstructionEffects import effect, is_temporary, location
+from modules.IntermediateGenerator.optimizations.StaticSingleAssignment import StaticSingleAssignment
+from modules.IntermediateGenerator.optimizations.UnreachableCodeElimination import UnreachableCodeElimination
 from modules.IntermediateGenerator.visitors.ASTLegalizerVisitor import ASTLegalizer
 from modules.IntermediateGenerator.visitors.ASTLowererVisitor import ASTLowerer
 from modules.models.nodes.IR.IRProgramNode import IRFunctionDefinition, IRProgramNode
@@ -8,14 +15,20 @@ from modules.IntermediateGenerator.visitors.StackAllocator import StackAllocator
 from modules.utils.logger import get_logger
 
 class IRGenerator:
-    def __init__(self):
+    def __init__(self, optimize: bool = False, ssa: bool = False):
         self.logger = get_logger()
+        self.optimize = optimize
+        # Run the Tacky passes on SSA form instead, opt-in while it is new
+        self.ssa = ssa
         self.first_pass_instructions: list[BaseNode] = []
         self.second_pass_instructions: list[BaseNode] = []
         self.third_pass_instructions: list[BaseNode] = []
     
     def parse_ast(self, node: ProgramNode) -> IRProgramNode:
         functions: list[IRFunctionDefinition] = []
+        if self.optimize:
+            #phase 0 - constant folding
+            node = ConstantFolder().fold(node) # type: ignore
         for func in node.functions:
             allocator = StackAllocator()
             lowerer = ASTLowerer(allocator=allocator)
@@ -25,6 +38,8 @@ class IRGenerator:
             lowered_instructions: List[BaseNode] = []
             func.accept(lowerer, lowered_instructions)
             self.logger.debug(f"Lowered instructions for function: {func.name}")
+            if self.optimize or self.ssa:
+                lowered_instructions = self.__optimize(lowered_instructions, allocator)
             #phase 2 - legalizer
             legalized_instructions: List[IRNode] = []
             for instr in lowered_instructions:
@@ -37,4 +52,28 @@ class IRGenerator:
                     instructions=legalized_instructions
                 )
             )
-        return IRProgramNode(functions=functions)
\ No newline at end of file
+        return IRProgramNode(functions=functions)
+
+    def __optimize(self, instructions: List[BaseNode], allocator: StackAllocator) -> List[BaseNode]:
+        """Tacky passes, run while operands are still pseudos. Temporaries they remove give their stack slots back."""
+        instructions = UnreachableCodeElimination().run(instructions) # type: ignore
+        if self.ssa:
+            instructions = self.__optimize_ssa(instructions) # type: ignore
+        else:
+            instructions = CopyPropagation().run(instructions)
+            instructions = DeadStoreElimination().run(instructions)
+        used = []
+        for instruction in instructions:
+            read_fields, write_fields, _, _ = effect(instruction) # type: ignore
+            used.extend(name for name in (location(getattr(instruction, field)) for field in read_fields + write_fields) if is_temporary(name))
+        allocator.compact(used)
+        return instructions
+
+    def __optimize_ssa(self, instructions: List[IRNode]) -> List[IRNode]:
+        """CopyPropagation and DeadStoreElimination run between entering and leaving SSA form"""
+        ssa = StaticSingleAssignment()
+        instructions = ssa.construct(instructions).to_instructions()
+        instructions = CopyPropagation().run(instructions)
+        instructions = DeadStoreElimination().run(instructions)
+        instructions = UnreachableCodeElimination().run(instructions)
+        return ssa.destruct(ControlFlowGraph.from_instructions(instructions))
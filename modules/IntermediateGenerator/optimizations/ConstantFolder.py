@@ -0,0 +1,182 @@
+from typing import Any, Callable, Dict, List, Tuple
+from modules.models.nodes.AST.Functions.LazyBody import LazyBody
+from modules.models.nodes.AST.Operands.BinaryOperators import BinaryAdd, BinaryDivide, BinaryMinus, BinaryModulus, BinaryMultiply, LogicalAnd, LogicalOr
+from modules.models.nodes.AST.Operands.BitwiseOperators import BitwiseAnd, BitwiseLeftShift, BitwiseOr, BitwiseRightShift, BitwiseXor
+from modules.models.nodes.AST.Operands.ConstantInteger import ConstantInteger
+from modules.models.nodes.AST.Operands.RelationalOperators import EqualRelation, GreaterThanEqualRelation, GreaterThanRelation, LessThanEqualRelation, LessThanRelation, NotEqualRelation
+from modules.models.nodes.AST.Operands.UnaryOperators import BitwiseNot, Negate
+from modules.models.nodes.BaseNode import BaseNode
+from modules.utils.logger import get_logger
+
+INT_MIN = -2 ** 31
+
+
+def wrap(value: int) -> int:
+    """Reduce to a signed 32-bit int the way the generated code's 32-bit registers do"""
+    return (value + 2 ** 31) % 2 ** 32 - 2 ** 31
+
+
+def literal_value(text: str) -> int | None:
+    """Value of an integer literal as the assembler reads it (a leading 0 means octal), None if it is not one"""
+    try:
+        return wrap(int(text, 8) if len(text) > 1 and text[0] == "0" else int(text))
+    except ValueError:
+        return None
+
+
+def constant_value(node: BaseNode) -> int | None:
+    """Value of a ConstantInteger, None for anything else"""
+    if node.__class__ is not ConstantInteger:
+        return None
+    return literal_value(node.value)
+
+
+def _divide(left: int, right: int) -> int | None:
+    # Division by zero and INT_MIN / -1 trap at run time, leave them to do so
+    if right == 0 or (left == INT_MIN and right == -1):
+        return None
+    quotient = abs(left) // abs(right)
+    return quotient if (left < 0) == (right < 0) else -quotient
+
+
+def _modulus(left: int, right: int) -> int | None:
+    quotient = _divide(left, right)
+    return None if quotient is None else left - quotient * right
+
+
+def _shift_left(left: int, right: int) -> int | None:
+    return wrap(left << right) if 0 <= right < 32 else None
+
+
+def _shift_right(left: int, right: int) -> int | None:
+    # The code generator shifts logically and C shifts negative values arithmetically, only fold where they agree
+    return left >> right if 0 <= right < 32 and left >= 0 else None
+
+
+# Operation for each node, returning the folded value or None when it must be left to run time
+BINARY_FOLDS: Dict[type, Callable[[int, int], int | None]] = {
+    BinaryAdd: lambda left, right: wrap(left + right),
+    BinaryMinus: lambda left, right: wrap(left - right),
+    BinaryMultiply: lambda left, right: wrap(left * right),
+    BinaryDivide: _divide,
+    BinaryModulus: _modulus,
+    BitwiseAnd: lambda left, right: left & right,
+    BitwiseOr: lambda left, right: left | right,
+    BitwiseXor: lambda left, right: left ^ right,
+    BitwiseLeftShift: _shift_left,
+    BitwiseRightShift: _shift_right,
+    LogicalAnd: lambda left, right: int(bool(left) and bool(right)),
+    LogicalOr: lambda left, right: int(bool(left) or bool(right)),
+    EqualRelation: lambda left, right: int(left == right),
+    NotEqualRelation: lambda left, right: int(left != right),
+    LessThanRelation: lambda left, right: int(left < right),
+    LessThanEqualRelation: lambda left, right: int(left <= right),
+    GreaterThanRelation: lambda left, right: int(left > right),
+    GreaterThanEqualRelation: lambda left, right: int(left >= right),
+}
+# LogicalNot is left out: it is still lowered to a bitwise not, folding it either way would change results
+UNARY_FOLDS: Dict[type, Callable[[int], int]] = {
+    Negate: lambda operand: wrap(-operand),
+    BitwiseNot: lambda operand: ~operand,
+}
+# Operators with an identity element: x op identity is x
+RIGHT_IDENTITIES: Dict[type, int] = {
+    BinaryAdd: 0, BinaryMinus: 0, BinaryMultiply: 1, BinaryDivide: 1,
+    BitwiseOr: 0, BitwiseXor: 0, BitwiseLeftShift: 0, BitwiseRightShift: 0,
+}
+LEFT_IDENTITIES: Dict[type, int] = {BinaryAdd: 0, BinaryMultiply: 1, BitwiseOr: 0, BitwiseXor: 0}
+# Operators with an absorbing element: x op zero is zero whatever x is
+ZERO_ABSORBING = (BinaryMultiply, BitwiseAnd)
+
+
+class ConstantFolder:
+    """
+    Folds constant subexpressions of an AST into single ConstantIntegers before lowering, with the
+    32-bit wrap around of the generated code, and applies algebraic identities (x+0, x*1, x*0, x&0,
+    x^x, --x, ~~x) to what is left. Expressions have no side effects, so dropping an operand is safe.
+    Operations that trap or whose result differs between C and the generated code are kept as they are.
+
+    The tree is walked without recursion, so deeply nested expressions fold as well. Unchanged
+    subtrees, including arena views, are reused rather than copied.
+    """
+    folded: int
+
+    def __init__(self):
+        self.folded = 0
+        self.logger = get_logger()
+
+    def fold(self, tree: BaseNode) -> BaseNode:
+        nodes: List[Any] = [tree]
+        # (field, child position or list of child positions) for every node in `nodes`
+        links: List[List[Tuple[str, Any]]] = []
+        index = 0
+        # Parents are listed before their children, so walking the list backwards folds children first
+        while index < len(nodes):
+            node = nodes[index]
+            if isinstance(node, LazyBody):
+                node = nodes[index] = node.node
+            node_links = []
+            for field in getattr(node.__class__, "_fields", ()):
+                value = getattr(node, field)
+                if isinstance(value, (BaseNode, LazyBody)):
+                    node_links.append((field, len(nodes)))
+                    nodes.append(value)
+                elif isinstance(value, list) and value and all(isinstance(item, (BaseNode, LazyBody)) for item in value):
+                    node_links.append((field, list(range(len(nodes), len(nodes) + len(value)))))
+                    nodes.extend(value)
+            links.append(node_links)
+            index += 1
+
+        folded: List[Any] = [None] * len(nodes)
+        for index in range(len(nodes) - 1, -1, -1):
+            node = nodes[index]
+            changes = {}
+            for field, position in links[index]:
+                if isinstance(position, list):
+                    values = [folded[child] for child in position]
+                    if any(value is not nodes[child] for value, child in zip(values, position)):
+                        changes[field] = values
+                elif folded[position] is not nodes[position]:
+                    changes[field] = folded[position]
+            if changes:
+                fields = {field: getattr(node, field) for field in node.__class__._fields}
+                fields.update(changes)
+                node = node.__class__(**fields)
+            folded[index] = self.__simplify(node)
+        if self.folded:
+            self.logger.debug(f"Constant folding simplified {self.folded} expressions")
+        return folded[0]
+
+    def __simplify(self, node: BaseNode) -> BaseNode:
+        node_class = node.__class__
+        operation = BINARY_FOLDS.get(node_class)
+        if operation is not None:
+            left, right = constant_value(node.left), constant_value(node.right)
+            if left is not None and right is not None:
+                value = operation(left, right)
+                if value is not None:
+                    return self.__constant(value)
+            if right is not None and RIGHT_IDENTITIES.get(node_class) == right:
+                self.folded += 1
+                return node.left
+            if left is not None and LEFT_IDENTITIES.get(node_class) == left:
+                self.folded += 1
+                return node.right
+            if node_class in ZERO_ABSORBING and 0 in (left, right):
+                return self.__constant(0)
+            if node_class is BitwiseXor and node.left == node.right:
+                return self.__constant(0)
+            return node
+        operation = UNARY_FOLDS.get(node_class)
+        if operation is not None:
+            operand = constant_value(node.operand)
+            if operand is not None:
+                return self.__constant(operation(operand))
+            if node.operand.__class__ is node_class:
+                self.folded += 1
+                return node.operand.operand
+        return node
+
+    def __constant(self, value: int) -> ConstantInteger:
+        self.folded += 1
+        return ConstantInteger(value=str(value))
@@ -0,0 +1,282 @@
+"""
+Control-flow graph of one function's Tacky instructions. Blocks are the runs split_blocks finds, in
+the order they appear, and edges follow IRJump/IRJumpIfZero/IRJumpIfNotZero targets and fall
+throughs. Blocks are numbered by position, so they can index plain lists of per-block facts.
+
+Everything here is iterative and linear in the number of blocks and edges, apart from the
+dominator computation, which is Lengauer-Tarjan with path compression, O(E log V).
+"""
+from typing import Dict, Iterable, Iterator, List, Set
+from modules.models.nodes.BaseNode import IRNode
+from modules.models.nodes.IR.Statements.IRJump import IRJump, IRLabel
+from modules.models.nodes.IR.Statements.IRReturnValue import IRreturn
+from modules.IntermediateGenerator.optimizations.InstructionEffects import CONDITIONAL_JUMPS, split_blocks
+
+
+class BasicBlock:
+    """Straight-line run of instructions, entered only at the top and left only at the bottom"""
+    __slots__ = ('index', 'instructions', 'successors', 'predecessors', 'fall_through')
+
+    def __init__(self, index: int, instructions: List[IRNode]):
+        self.index = index
+        self.instructions = instructions
+        self.successors: List[int] = []
+        self.predecessors: List[int] = []
+        # Block control reaches by running off the end of this one, None after a jump or return
+        self.fall_through: int | None = None
+
+    @property
+    def label(self) -> str | None:
+        first = self.instructions[0] if self.instructions else None
+        return first.name if isinstance(first, IRLabel) else None
+
+    @property
+    def terminator(self) -> IRNode | None:
+        last = self.instructions[-1] if self.instructions else None
+        return last if isinstance(last, (IRJump, IRreturn) + CONDITIONAL_JUMPS) else None
+
+
+class ControlFlowGraph:
+    blocks: List[BasicBlock]
+    # Index of the block control enters the function at
+    entry = 0
+
+    def __init__(self, blocks: List[BasicBlock]):
+        self.blocks = blocks
+        self.__labels: Set[str] = {block.label for block in blocks if block.label is not None}
+
+    @classmethod
+    def from_instructions(cls, instructions: List[IRNode]) -> "ControlFlowGraph":
+        blocks = [BasicBlock(index, block) for index, block in enumerate(split_blocks(instructions))]
+        labels: Dict[str, int] = {block.label: block.index for block in blocks if block.label is not None}
+        for block in blocks:
+            terminator = block.terminator
+            if isinstance(terminator, (IRJump,) + CONDITIONAL_JUMPS):
+                if terminator.label not in labels:
+                    raise KeyError(f"Jump to unknown label {terminator.label}")
+                block.successors.append(labels[terminator.label])
+            if not isinstance(terminator, (IRJump, IRreturn)) and block.index + 1 < len(blocks):
+                block.fall_through = block.index + 1
+                if block.fall_through not in block.successors:
+                    block.successors.append(block.fall_through)
+            for successor in block.successors:
+                blocks[successor].predecessors.append(block.index)
+        return cls(blocks)
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    def __iter__(self) -> Iterator[BasicBlock]:
+        return iter(self.blocks)
+
+    def to_instructions(self, order: Iterable[int] | None = None) -> List[IRNode]:
+        """
+        Lay the blocks out again, in `order` if given (blocks left out are dropped) or as they
+        were. A block whose fall through no longer comes next gets an IRJump to it.
+        """
+        order = list(range(len(self.blocks)) if order is None else order)
+        instructions: List[IRNode] = []
+        for position, index in enumerate(order):
+            block = self.blocks[index]
+            instructions.extend(block.instructions)
+            following = order[position + 1] if position + 1 < len(order) else None
+            if block.fall_through is not None and block.fall_through != following:
+                instructions.append(IRJump(label=self.ensure_label(block.fall_through)))
+        return instructions
+
+    def split_edge(self, source: int, target: int) -> BasicBlock:
+        """Put a new block, appended to the graph, on the edge from source to target and return it"""
+        target_label = self.ensure_label(target)
+        block = BasicBlock(len(self.blocks), [])
+        block.instructions = [IRLabel(name=self.__new_label(block.index)), IRJump(label=target_label)]
+        block.successors = [target]
+        block.predecessors = [source]
+        self.blocks.append(block)
+        origin = self.blocks[source]
+        terminator = origin.terminator
+        if isinstance(terminator, (IRJump,) + CONDITIONAL_JUMPS) and terminator.label == target_label:
+            origin.instructions[-1] = terminator.model_copy(update={"label": block.label})
+        if origin.fall_through == target:
+            origin.fall_through = block.index
+        origin.successors = [block.index if successor == target else successor for successor in origin.successors]
+        self.blocks[target].predecessors = [block.index if predecessor == source else predecessor for predecessor in self.blocks[target].predecessors]
+        return block
+
+    def ensure_label(self, index: int) -> str:
+        """Label of the block, giving it a new one first if it has none"""
+        block = self.blocks[index]
+        if block.label is None:
+            block.instructions.insert(0, IRLabel(name=self.__new_label(index)))
+        return block.label # type: ignore
+
+    def __new_label(self, index: int) -> str:
+        # Blocks are renumbered when a graph is rebuilt, so the plain name may already be taken
+        name = f"lbl.block.{index}"
+        suffix = 0
+        while name in self.__labels:
+            suffix += 1
+            name = f"lbl.block.{index}.{suffix}"
+        self.__labels.add(name)
+        return name
+
+    def postorder(self) -> List[int]:
+        """Blocks reachable from the entry, each after all the blocks it reaches first in a depth-first walk"""
+        order: List[int] = []
+        visited = [False] * len(self.blocks)
+        if not self.blocks:
+            return order
+        visited[self.entry] = True
+        # (block, position of the next successor to visit)
+        stack = [(self.entry, 0)]
+        while stack:
+            index, position = stack[-1]
+            successors = self.blocks[index].successors
+            if position < len(successors):
+                stack[-1] = (index, position + 1)
+                successor = successors[position]
+                if not visited[successor]:
+                    visited[successor] = True
+                    stack.append((successor, 0))
+            else:
+                stack.pop()
+                order.append(index)
+        return order
+
+    def reverse_postorder(self) -> List[int]:
+        """Reachable blocks with every block before its successors, loop back edges aside. The order forward analyses converge fastest in."""
+        order = self.postorder()
+        order.reverse()
+        return order
+
+    def immediate_dominators(self) -> List[int | None]:
+        """
+        Closest strict dominator of every block, None for the entry and for unreachable blocks.
+        Lengauer-Tarjan: semidominators from a depth-first numbering, then the dominators from them.
+        """
+        count = len(self.blocks)
+        idom: List[int | None] = [None] * count
+        if not count:
+            return idom
+        # Depth-first preorder numbering: vertex[n] is the block numbered n
+        number = [-1] * count
+        vertex: List[int] = []
+        parent: List[int] = []
+        stack = [(self.entry, -1)]
+        while stack:
+            index, from_number = stack.pop()
+            if number[index] != -1:
+                continue
+            number[index] = len(vertex)
+            vertex.append(index)
+            parent.append(from_number)
+            for successor in reversed(self.blocks[index].successors):
+                if number[successor] == -1:
+                    stack.append((successor, number[index]))
+
+        size = len(vertex)
+        semi = list(range(size))
+        label = list(range(size))
+        ancestor = [-1] * size
+        dominator = [0] * size
+        bucket: List[List[int]] = [[] for _ in range(size)]
+
+        def evaluate(node: int) -> int:
+            if ancestor[node] == -1:
+                return node
+            # Compress the forest path above `node`, top first, so every node on it points past the root's child
+            path = []
+            current = node
+            while ancestor[ancestor[current]] != -1:
+                path.append(current)
+                current = ancestor[current]
+            for current in reversed(path):
+                above = ancestor[current]
+                if semi[label[above]] < semi[label[current]]:
+                    label[current] = label[above]
+                ancestor[current] = ancestor[above]
+            return label[node]
+
+        for current in range(size - 1, 0, -1):
+            for predecessor in self.blocks[vertex[current]].predecessors:
+                if number[predecessor] == -1:
+                    continue
+                candidate = semi[evaluate(number[predecessor])]
+                if candidate < semi[current]:
+                    semi[current] = candidate
+            bucket[semi[current]].append(current)
+            above = parent[current]
+            ancestor[current] = above
+            for node in bucket[above]:
+                lowest = evaluate(node)
+                dominator[node] = lowest if semi[lowest] < semi[node] else above
+            bucket[above].clear()
+        for current in range(1, size):
+            if dominator[current] != semi[current]:
+                dominator[current] = dominator[dominator[current]]
+            idom[vertex[current]] = vertex[dominator[current]]
+        return idom
+
+    def dominator_tree(self) -> "DominatorTree":
+        return DominatorTree(self.entry, self.immediate_dominators())
+
+    def dominance_frontiers(self, tree: "DominatorTree | None" = None) -> List[Set[int]]:
+        """
+        For every block, the blocks where its dominance ends: reachable from it, but not strictly
+        dominated by it. Walks up from the predecessors of each join block (Cooper, Harvey and
+        Kennedy), so the cost is the size of the frontiers.
+        """
+        tree = tree or self.dominator_tree()
+        frontiers: List[Set[int]] = [set() for _ in self.blocks]
+        for block in self.blocks:
+            if len(block.predecessors) < 2 or not tree.is_reachable(block.index):
+                continue
+            for predecessor in block.predecessors:
+                runner: int | None = predecessor
+                while runner is not None and runner != tree.idom[block.index] and tree.is_reachable(runner):
+                    frontiers[runner].add(block.index)
+                    runner = tree.idom[runner]
+        return frontiers
+
+
+class DominatorTree:
+    """Immediate dominators as a tree rooted at the entry, with constant time dominance queries"""
+
+    def __init__(self, entry: int, idom: List[int | None]):
+        self.entry = entry
+        self.idom = idom
+        self.children: List[List[int]] = [[] for _ in idom]
+        for index, dominator in enumerate(idom):
+            if dominator is not None:
+                self.children[dominator].append(index)
+        # Entry and exit times of a walk over the tree: a dominates b when b's span lies inside a's
+        self.enter = [-1] * len(idom)
+        self.exit = [-1] * len(idom)
+        self.__preorder: List[int] = []
+        if not idom:
+            return
+        clock = 0
+        stack = [(entry, False)]
+        while stack:
+            index, done = stack.pop()
+            if done:
+                self.exit[index] = clock
+                clock += 1
+                continue
+            self.enter[index] = clock
+            clock += 1
+            self.__preorder.append(index)
+            stack.append((index, True))
+            stack.extend((child, False) for child in reversed(self.children[index]))
+
+    def is_reachable(self, block: int) -> bool:
+        return self.enter[block] != -1
+
+    def dominates(self, dominator: int, block: int) -> bool:
+        """True when every path from the entry to `block` passes through `dominator`, a block dominates itself"""
+        if self.enter[dominator] == -1 or self.enter[block] == -1:
+            return False
+        return self.enter[dominator] <= self.enter[block] and self.exit[block] <= self.exit[dominator]
+
+    def preorder(self) -> List[int]:
+        """Reachable blocks with every block before the blocks it dominates"""
+        return list(self.__preorder)
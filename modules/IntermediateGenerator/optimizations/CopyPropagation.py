@@ -0,0 +1,136 @@
+from typing import Dict, List, Set
+from modules.models.nodes.BaseNode import BaseNode, IRNode
+from modules.models.nodes.IR.Operands.Immediate import Immediate
+from modules.models.nodes.IR.Operands.Pseudo import Pseudo
+from modules.models.nodes.IR.Statements.IRCopy import IRCopy
+from modules.models.nodes.IR.Statements.IRPhi import IRPhi
+from modules.IntermediateGenerator.optimizations.InstructionEffects import effect, immediate_allowed, is_temporary, location, split_blocks, writes
+from modules.utils.logger import get_logger
+
+
+class CopyPropagation:
+    """
+    Removes the IRCopys ASTLowerer emits to forward a value into a fresh temporary. Runs on one
+    function's Tacky instructions while operands are still pseudos, before ASTLegalizer.
+
+    Within each straight-line block, read-only uses of a temporary written by `tmp := source` are
+    replaced by `source` for as long as neither is overwritten (immediates only where x86 takes
+    them). A copy `tmp := other` whose source temporary is not used again and whose destination
+    first appears there is coalesced, so `tmp := other; neg tmp` becomes `neg other`. Copies into
+    temporaries that are never read afterwards are dropped. Only temporaries used in a single
+    block are touched, registers are never renamed or removed, and neither are the temporaries
+    phis name in SSA form.
+    """
+    removed: int
+
+    def __init__(self):
+        self.removed = 0
+        self.logger = get_logger()
+
+    def run(self, instructions: List[IRNode]) -> List[IRNode]:
+        blocks = split_blocks(instructions)
+        local = self.__block_local_temporaries(blocks)
+        for block in blocks:
+            self.__forward(block, local)
+            self.__coalesce(block, local)
+        result = self.__drop_unread([instruction for block in blocks for instruction in block], local)
+        if self.removed:
+            self.logger.debug(f"Copy propagation removed {self.removed} of {len(instructions)} instructions")
+        return result
+
+    def __block_local_temporaries(self, blocks: List[List[IRNode]]) -> Set[str]:
+        owners: Dict[str, int] = {}
+        shared: Set[str] = set()
+        for index, block in enumerate(blocks):
+            for instruction in block:
+                if instruction.__class__ is IRPhi:
+                    # Sources are read in other blocks, at the end of the predecessors
+                    names = [location(instruction.dest)] + [location(source) for source in instruction.sources.values()]
+                    shared.update(name for name in names if is_temporary(name)) # type: ignore
+                    continue
+                read_fields, write_fields, _, _ = effect(instruction)
+                for field in read_fields + write_fields:
+                    name = location(getattr(instruction, field))
+                    if is_temporary(name) and owners.setdefault(name, index) != index:
+                        shared.add(name)
+        return set(owners) - shared
+
+    def __forward(self, block: List[IRNode], local: Set[str]):
+        # Temporary -> operand it currently holds a copy of
+        available: Dict[str, BaseNode] = {}
+        kept: List[IRNode] = []
+        for instruction in block:
+            read_fields, write_fields, _, _ = effect(instruction)
+            for field in read_fields:
+                if field in write_fields:
+                    continue
+                source = available.get(location(getattr(instruction, field)))
+                if source is None or (isinstance(source, Immediate) and not immediate_allowed(instruction, field)):
+                    continue
+                setattr(instruction, field, source)
+            if instruction.__class__ is IRCopy and location(instruction.src) is not None and location(instruction.src) == location(instruction.dest):
+                self.removed += 1
+                continue
+            for name in writes(instruction):
+                available.pop(name, None)
+                for stale in [target for target, source in available.items() if location(source) == name]:
+                    del available[stale]
+            if instruction.__class__ is IRCopy and location(instruction.dest) in local:
+                available[instruction.dest.value] = instruction.src
+            kept.append(instruction)
+        block[:] = kept
+
+    def __coalesce(self, block: List[IRNode], local: Set[str]):
+        first: Dict[str, int] = {}
+        last: Dict[str, int] = {}
+        for index, instruction in enumerate(block):
+            for name in self.__temporaries(instruction):
+                first.setdefault(name, index)
+                last[name] = index
+        # Renamed temporary -> the temporary that takes its place
+        alias: Dict[str, str] = {}
+        for index, instruction in enumerate(block):
+            if instruction.__class__ is not IRCopy:
+                continue
+            dest, src = location(instruction.dest), location(instruction.src)
+            if dest not in local or src not in local or dest in alias:
+                continue
+            while src in alias:
+                src = alias[src]
+            if first[dest] == index and last[src] == index:
+                alias[dest] = src
+                last[src] = last[dest]
+        if not alias:
+            return
+        kept: List[IRNode] = []
+        for instruction in block:
+            if instruction.__class__ is IRCopy and location(instruction.dest) in alias:
+                self.removed += 1
+                continue
+            read_fields, write_fields, _, _ = effect(instruction)
+            for field in set(read_fields + write_fields):
+                name = location(getattr(instruction, field))
+                if name in alias:
+                    while name in alias:
+                        name = alias[name]
+                    setattr(instruction, field, Pseudo(value=name))
+            kept.append(instruction)
+        block[:] = kept
+
+    def __drop_unread(self, instructions: List[IRNode], local: Set[str]) -> List[IRNode]:
+        read: Set[str] = set()
+        for instruction in instructions:
+            read_fields, _, _, _ = effect(instruction)
+            read.update(location(getattr(instruction, field)) for field in read_fields)
+        kept: List[IRNode] = []
+        for instruction in instructions:
+            if instruction.__class__ is IRCopy and location(instruction.dest) in local and location(instruction.dest) not in read:
+                self.removed += 1
+                continue
+            kept.append(instruction)
+        return kept
+
+    def __temporaries(self, instruction: IRNode) -> List[str]:
+        read_fields, write_fields, _, _ = effect(instruction)
+        names = [location(getattr(instruction, field)) for field in read_fields + write_fields]
+        return [name for name in names if is_temporary(name)]
@@ -0,0 +1,76 @@
+from typing import List, Set, Tuple
+from modules.models.nodes.BaseNode import IRNode
+from modules.models.nodes.IR.Operands.UnaryInstruction import UnaryInstruction
+from modules.models.nodes.IR.Statements.IRCopy import IRCopy
+from modules.models.nodes.IR.Statements.IRPhi import IRPhi
+from modules.IntermediateGenerator.optimizations.ControlFlowGraph import BasicBlock, ControlFlowGraph
+from modules.IntermediateGenerator.optimizations.InstructionEffects import ARITHMETIC_INSTRUCTIONS, RELATIONAL_INSTRUCTIONS, phi_reads, reads, writes
+from modules.utils.logger import get_logger
+
+# Instructions whose only effect is the locations they write. Division is left out, it traps on a zero divisor
+REMOVABLE_INSTRUCTIONS = (IRCopy, IRPhi, UnaryInstruction) + ARITHMETIC_INSTRUCTIONS + RELATIONAL_INSTRUCTIONS
+
+
+class DeadStoreElimination:
+    """
+    Removes Tacky instructions whose results are never read, registers included. Liveness is
+    computed backwards over the function's ControlFlowGraph until it settles, skipping the reads of
+    instructions that are themselves dead, so a chain of stores that only feed each other goes at
+    once. The return reads AX, relations read the AX they only partly overwrite, and a copy
+    between two stack temporaries writes R10, so the x86 the legalizer emits sees the same values.
+    In SSA form, a phi's sources are live at the end of their predecessors while the phi is kept.
+    """
+    removed: int
+
+    def __init__(self):
+        self.removed = 0
+        self.logger = get_logger()
+
+    def run(self, instructions: List[IRNode]) -> List[IRNode]:
+        graph = ControlFlowGraph.from_instructions(instructions)
+        live_in: List[Set[str]] = [set() for _ in graph.blocks]
+        # Instructions each block keeps so far, only its phis are read by other blocks
+        kept: List[List[IRNode]] = [[] for _ in graph.blocks]
+        # Liveness flows backwards, so visiting successors first settles it in few rounds
+        order = graph.postorder()
+        changed = True
+        while changed:
+            changed = False
+            for index in order:
+                block_kept, live = self.__sweep(graph.blocks[index].instructions, self.__live_out(graph.blocks[index], live_in, kept))
+                # Both only grow, so a change shows in the sizes
+                if live != live_in[index] or len(block_kept) != len(kept[index]):
+                    live_in[index] = live
+                    kept[index] = block_kept
+                    changed = True
+        result: List[IRNode] = []
+        for block in graph:
+            result.extend(self.__sweep(block.instructions, self.__live_out(block, live_in, kept))[0])
+        self.removed += len(instructions) - len(result)
+        if self.removed:
+            self.logger.debug(f"Dead store elimination removed {self.removed} of {len(instructions)} instructions")
+        return result
+
+    def __live_out(self, block: BasicBlock, live_in: List[Set[str]], kept: List[List[IRNode]]) -> Set[str]:
+        live: Set[str] = set()
+        for successor in block.successors:
+            live |= live_in[successor]
+            live.update(phi_reads(kept[successor], block.label))
+        return live
+
+    def __sweep(self, block: List[IRNode], live: Set[str]) -> Tuple[List[IRNode], Set[str]]:
+        """Instructions of the block that are not dead and the locations live at its start"""
+        live = set(live)
+        kept: List[IRNode] = []
+        for instruction in reversed(block):
+            written = writes(instruction)
+            if self.__is_dead(instruction, written, live):
+                continue
+            live.difference_update(written)
+            live.update(reads(instruction))
+            kept.append(instruction)
+        kept.reverse()
+        return kept, live
+
+    def __is_dead(self, instruction: IRNode, written: List[str], live: Set[str]) -> bool:
+        return isinstance(instruction, REMOVABLE_INSTRUCTIONS) and not live.intersection(written)
@@ -0,0 +1,144 @@
+"""
+What each Tacky instruction reads and writes, for the passes that run between ASTLowerer and
+ASTLegalizer. Locations are pseudo names: temporaries ("tmp.N") and register pseudos
+("reg.GenericRegisterEnum.AX"). Register operands map to the same names as their register pseudos,
+so Register(AX) and Pseudo("reg.GenericRegisterEnum.AX") are one location. Immediates are not
+locations.
+
+The effects follow the x86 code each instruction becomes, not its field names: arithmetic and
+bitwise instructions compute `src = src op dest`, division reads and writes AX and clobbers DX,
+and a relation only sets AL, so it reads AX as well as writing it.
+
+An IRPhi writes its dest on entry to its block and reads each source at the end of the
+predecessor the source is keyed by, so `effect` only lists the write and `phi_reads` gives the
+reads of one edge.
+"""
+from typing import Dict, FrozenSet, List, Tuple
+from modules.models.enums.GenericRegisterEnum import GenericRegisterEnum
+from modules.models.nodes.BaseNode import BaseNode, IRNode
+from modules.models.nodes.IR.Operands.BinaryInstruction import AddInstruction, DivInstruction, ModInstruction, MulInstruction, SubInstruction
+from modules.models.nodes.IR.Operands.BitwiseInstruction import BitwiseAndInstruction, BitwiseLeftShiftInstruction, BitwiseOrInstruction, BitwiseRightShiftInstruction, BitwiseXorInstruction
+from modules.models.nodes.IR.Operands.Pseudo import Pseudo
+from modules.models.nodes.IR.Operands.Register import Register
+from modules.models.nodes.IR.Operands.RelationalInstruction import EqualRelationInstruction, GreaterThanEqualRelationInstruction, GreaterThanRelationInstruction, LessThanEqualRelationInstruction, LessThanRelationInstruction, NotEqualRelationInstruction
+from modules.models.nodes.IR.Operands.UnaryInstruction import UnaryInstruction
+from modules.models.nodes.IR.Statements.IRCopy import IRCopy
+from modules.models.nodes.IR.Statements.IRJump import IRJump, IRJumpIfNotZero, IRJumpIfZero, IRLabel
+from modules.models.nodes.IR.Statements.IRPhi import IRPhi
+from modules.models.nodes.IR.Statements.IRReturnValue import IRreturn
+from modules.IntermediateGenerator.visitors.StackAllocator import PSEUDO_REGISTERS, REGISTER_PSEUDOS
+
+AX = REGISTER_PSEUDOS[GenericRegisterEnum.AX]
+DX = REGISTER_PSEUDOS[GenericRegisterEnum.DX]
+# Scratch register ASTLegalizer moves through when a copy has a stack slot on both sides
+R10 = REGISTER_PSEUDOS[GenericRegisterEnum.R10]
+
+ARITHMETIC_INSTRUCTIONS = (
+    AddInstruction, SubInstruction, MulInstruction,
+    BitwiseAndInstruction, BitwiseOrInstruction, BitwiseXorInstruction, BitwiseLeftShiftInstruction, BitwiseRightShiftInstruction,
+)
+RELATIONAL_INSTRUCTIONS = (
+    EqualRelationInstruction, NotEqualRelationInstruction, LessThanRelationInstruction,
+    LessThanEqualRelationInstruction, GreaterThanRelationInstruction, GreaterThanEqualRelationInstruction,
+)
+CONDITIONAL_JUMPS = (IRJumpIfZero, IRJumpIfNotZero)
+
+# (fields read, fields written, locations read implicitly, locations written implicitly)
+Effect = Tuple[Tuple[str, ...], Tuple[str, ...], FrozenSet[str], FrozenSet[str]]
+NO_LOCATIONS: FrozenSet[str] = frozenset()
+EFFECTS: Dict[type, Effect] = {
+    IRCopy: (("src",), ("dest",), NO_LOCATIONS, NO_LOCATIONS),
+    UnaryInstruction: (("operand",), ("operand",), NO_LOCATIONS, NO_LOCATIONS),
+    DivInstruction: (("src", "dest"), ("dest",), frozenset({AX}), frozenset({AX, DX})),
+    ModInstruction: (("src", "dest"), ("dest",), frozenset({AX}), frozenset({AX, DX})),
+    IRJumpIfZero: (("src",), (), NO_LOCATIONS, NO_LOCATIONS),
+    IRJumpIfNotZero: (("src",), (), NO_LOCATIONS, NO_LOCATIONS),
+    IRreturn: (("value",), (), NO_LOCATIONS, NO_LOCATIONS),
+    IRJump: ((), (), NO_LOCATIONS, NO_LOCATIONS),
+    IRLabel: ((), (), NO_LOCATIONS, NO_LOCATIONS),
+    IRPhi: ((), ("dest",), NO_LOCATIONS, NO_LOCATIONS),
+}
+EFFECTS.update({instruction: (("src", "dest"), ("src",), NO_LOCATIONS, NO_LOCATIONS) for instruction in ARITHMETIC_INSTRUCTIONS})
+EFFECTS.update({instruction: (("src", "dest"), (), frozenset({AX}), frozenset({AX})) for instruction in RELATIONAL_INSTRUCTIONS})
+
+# Read-only fields that may hold an Immediate in the emitted x86 (movl, the first operand of
+# add/imul/shl/cmp...). idivl, neg/not, the compared register of a relation and jump tests cannot.
+IMMEDIATE_FIELDS: Dict[type, Tuple[str, ...]] = {IRCopy: ("src",)}
+IMMEDIATE_FIELDS.update({instruction: ("dest",) for instruction in ARITHMETIC_INSTRUCTIONS + RELATIONAL_INSTRUCTIONS})
+
+
+def location(operand: BaseNode) -> str | None:
+    """Pseudo name of the storage an operand refers to, None for immediates"""
+    if isinstance(operand, Pseudo):
+        return operand.value
+    if isinstance(operand, Register):
+        return REGISTER_PSEUDOS[operand.value]
+    return None
+
+
+def is_temporary(name: str | None) -> bool:
+    """True for stack temporaries, which the passes may rename or remove, and False for registers"""
+    return name is not None and name not in PSEUDO_REGISTERS and name[:4] != "reg."
+
+
+def effect(instruction: IRNode) -> Effect:
+    try:
+        return EFFECTS[instruction.__class__]
+    except KeyError:
+        raise NotImplementedError(f"No effects known for {type(instruction).__name__}") from None
+
+
+def reads(instruction: IRNode) -> List[str]:
+    fields, _, implicit, _ = effect(instruction)
+    names = [location(getattr(instruction, field)) for field in fields]
+    return [name for name in names if name is not None] + list(implicit)
+
+
+def writes(instruction: IRNode) -> List[str]:
+    _, fields, _, implicit = effect(instruction)
+    names = [location(getattr(instruction, field)) for field in fields]
+    written = [name for name in names if name is not None] + list(implicit)
+    if instruction.__class__ is IRCopy and is_temporary(location(instruction.src)) and is_temporary(location(instruction.dest)):
+        written.append(R10)
+    return written
+
+
+def block_phis(block: List[IRNode]) -> List[IRPhi]:
+    """The IRPhis at the start of a block, after its label"""
+    start = 1 if block and isinstance(block[0], IRLabel) else 0
+    end = start
+    while end < len(block) and block[end].__class__ is IRPhi:
+        end += 1
+    return block[start:end] # type: ignore
+
+
+def phi_reads(block: List[IRNode], predecessor: str | None) -> List[str]:
+    """Locations the phis of a block read at the end of the predecessor block labelled `predecessor`"""
+    names = [location(phi.sources[predecessor]) for phi in block_phis(block) if predecessor in phi.sources]
+    return [name for name in names if name is not None]
+
+
+def is_block_end(instruction: IRNode) -> bool:
+    return isinstance(instruction, (IRJump, IRreturn) + CONDITIONAL_JUMPS)
+
+
+def split_blocks(instructions: List[IRNode]) -> List[List[IRNode]]:
+    """Straight-line runs of instructions: a label starts a block, a jump or return ends one"""
+    blocks: List[List[IRNode]] = []
+    block: List[IRNode] = []
+    for instruction in instructions:
+        if isinstance(instruction, IRLabel) and block:
+            blocks.append(block)
+            block = []
+        block.append(instruction)
+        if is_block_end(instruction):
+            blocks.append(block)
+            block = []
+    if block:
+        blocks.append(block)
+    return blocks
+
+
+def immediate_allowed(instruction: IRNode, field: str) -> bool:
+    return field in IMMEDIATE_FIELDS.get(instruction.__class__, ())
+
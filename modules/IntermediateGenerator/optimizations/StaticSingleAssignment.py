@@ -0,0 +1,302 @@
+from typing import Dict, List, Set, Tuple
+from modules.models.nodes.BaseNode import BaseNode, IRNode
+from modules.models.nodes.IR.Operands.Pseudo import Pseudo
+from modules.models.nodes.IR.Statements.IRCopy import IRCopy
+from modules.models.nodes.IR.Statements.IRJump import IRJump, IRLabel
+from modules.models.nodes.IR.Statements.IRPhi import IRPhi
+from modules.IntermediateGenerator.optimizations.ControlFlowGraph import ControlFlowGraph
+from modules.IntermediateGenerator.optimizations.InstructionEffects import CONDITIONAL_JUMPS, block_phis, effect, is_temporary, location, phi_reads
+from modules.utils.logger import get_logger
+
+
+class StaticSingleAssignment:
+    """
+    Puts one function's Tacky instructions into pruned SSA form and takes them back out, between
+    ASTLowerer and ASTLegalizer. Sparse passes work on the graph `construct` returns and hand it to
+    `destruct`. IRGenerator only does so when built with ssa=True (main.py --ssa), the default
+    -O pipeline runs its passes on the instructions as lowered.
+
+    Only temporaries that are always written whole are renamed, each write getting its own version
+    "tmp.N.V". Temporaries updated in place (`neg tmp`) and registers keep their names, the x86 the
+    legalizer emits needs those in one place. Phis are placed on the iterated dominance frontier
+    of a temporary's writes, and only where it is live. Going back, versions tied by a phi that
+    never hold different values at once share one name, so the phi needs no copies. The phis that
+    are left become copies at the end of each predecessor, emitted as a parallel copy, with edges
+    from blocks with several successors split first.
+    """
+    phis: int
+    copies: int
+
+    def __init__(self):
+        self.phis = 0
+        self.copies = 0
+        # Labels construct gave blocks only so phis could name them, destruct drops the ones no jump needs
+        self.__labels: Set[str] = set()
+        self.logger = get_logger()
+
+    def construct(self, instructions: List[IRNode]) -> ControlFlowGraph:
+        """Control-flow graph of the instructions in SSA form. Blocks the entry cannot reach are dropped."""
+        graph = ControlFlowGraph.from_instructions(instructions)
+        reachable = graph.postorder()
+        if len(reachable) < len(graph):
+            graph = ControlFlowGraph.from_instructions(graph.to_instructions(sorted(reachable)))
+        variables, definitions = self.__promotable(graph)
+        if not variables:
+            return graph
+        tree = graph.dominator_tree()
+        frontiers = graph.dominance_frontiers(tree)
+        live_in = self.__variables_live_in(graph, variables)
+
+        # Block -> (variable, phi) for the phis placed at its start
+        placed: Dict[int, List[Tuple[str, IRPhi]]] = {}
+        for variable in sorted(variables):
+            pending = list(definitions[variable])
+            visited = set(pending)
+            while pending:
+                for frontier in frontiers[pending.pop()]:
+                    if variable not in live_in[frontier] or any(name == variable for name, _ in placed.get(frontier, ())):
+                        continue
+                    placed.setdefault(frontier, []).append((variable, IRPhi(dest=Pseudo(value=variable), sources={})))
+                    if frontier not in visited:
+                        visited.add(frontier)
+                        pending.append(frontier)
+        for index, phis in placed.items():
+            # Sources are keyed by predecessor label, which outlives block numbers when passes rebuild the graph
+            for predecessor in graph.blocks[index].predecessors:
+                if graph.blocks[predecessor].label is None:
+                    self.__labels.add(graph.ensure_label(predecessor))
+            block = graph.blocks[index]
+            start = 1 if block.label is not None else 0
+            block.instructions[start:start] = [phi for _, phi in phis]
+            self.phis += len(phis)
+
+        self.__rename(graph, tree.children, variables, placed)
+        return graph
+
+    def destruct(self, graph: ControlFlowGraph) -> List[IRNode]:
+        """Instructions of a function in SSA form, with the phis replaced by coalescing or copies"""
+        phis = [(block.index, phi) for block in graph for phi in block_phis(block.instructions)]
+        if not phis:
+            return self.__drop_added_labels(graph.to_instructions())
+        related: Set[str] = set()
+        for _, phi in phis:
+            related.add(phi.dest.value)
+            related.update(location(source) for source in phi.sources.values() if is_temporary(location(source)))
+        interference = self.__interference(graph, related)
+
+        # Union find over the names tied by phis, merging two groups only if no members interfere
+        group: Dict[str, str] = {name: name for name in related}
+        members: Dict[str, List[str]] = {name: [name] for name in related}
+
+        def find(name: str) -> str:
+            while group[name] != name:
+                group[name] = group[group[name]]
+                name = group[name]
+            return name
+
+        for _, phi in phis:
+            for source in phi.sources.values():
+                name = location(source)
+                if not is_temporary(name):
+                    continue
+                left, right = find(phi.dest.value), find(name) # type: ignore
+                if left == right or any(other in interference.get(member, ()) for member in members[left] for other in members[right]):
+                    continue
+                if len(members[left]) < len(members[right]):
+                    left, right = right, left
+                group[right] = left
+                members[left].extend(members.pop(right))
+
+        renamed = {name: find(name) for name in related if find(name) != name}
+        if renamed:
+            for block in graph:
+                for instruction in block.instructions:
+                    self.__rename_fields(instruction, renamed)
+
+        # Phis whose operands did not all coalesce become copies on the incoming edges
+        labels = {block.label: block.index for block in graph if block.label is not None}
+        edge_copies: Dict[Tuple[int, int], List[Tuple[str, BaseNode]]] = {}
+        for index, phi in phis:
+            for predecessor, source in phi.sources.items():
+                if location(source) != phi.dest.value:
+                    edge_copies.setdefault((labels[predecessor], index), []).append((phi.dest.value, source))
+        for block in graph:
+            block.instructions[:] = [instruction for instruction in block.instructions if instruction.__class__ is not IRPhi]
+        for (predecessor, index), copies in edge_copies.items():
+            origin = graph.blocks[predecessor]
+            if len(origin.successors) > 1 or not isinstance(origin.terminator, (IRJump, type(None))):
+                origin = graph.split_edge(predecessor, index)
+            end = len(origin.instructions) - (origin.terminator is not None)
+            origin.instructions[end:end] = self.__sequentialize(copies)
+        self.logger.debug(f"Leaving SSA turned {len(phis)} phis into {self.copies} copies")
+        return self.__drop_added_labels(graph.to_instructions())
+
+    def __drop_added_labels(self, instructions: List[IRNode]) -> List[IRNode]:
+        if not self.__labels:
+            return instructions
+        targets = {instruction.label for instruction in instructions if isinstance(instruction, (IRJump,) + CONDITIONAL_JUMPS)}
+        return [instruction for instruction in instructions if not (isinstance(instruction, IRLabel) and instruction.name in self.__labels and instruction.name not in targets)]
+
+    def __promotable(self, graph: ControlFlowGraph) -> Tuple[Set[str], Dict[str, Set[int]]]:
+        """Temporaries only ever written whole, and the blocks writing each of them"""
+        definitions: Dict[str, Set[int]] = {}
+        in_place: Set[str] = set()
+        for block in graph:
+            for instruction in block.instructions:
+                read_fields, write_fields, _, _ = effect(instruction)
+                for field in write_fields:
+                    name = location(getattr(instruction, field))
+                    if not is_temporary(name):
+                        continue
+                    if field in read_fields:
+                        in_place.add(name) # type: ignore
+                    definitions.setdefault(name, set()).add(block.index) # type: ignore
+        variables = set(definitions) - in_place
+        return variables, definitions
+
+    def __variables_live_in(self, graph: ControlFlowGraph, variables: Set[str]) -> List[Set[str]]:
+        uses: List[Set[str]] = []
+        kills: List[Set[str]] = []
+        for block in graph:
+            used: Set[str] = set()
+            killed: Set[str] = set()
+            for instruction in block.instructions:
+                read_fields, write_fields, _, _ = effect(instruction)
+                used.update(name for name in self.__names(instruction, read_fields) if name in variables and name not in killed)
+                killed.update(name for name in self.__names(instruction, write_fields) if name in variables)
+            uses.append(used)
+            kills.append(killed)
+        live_in: List[Set[str]] = [set(used) for used in uses]
+        order = graph.postorder()
+        changed = True
+        while changed:
+            changed = False
+            for index in order:
+                live_out: Set[str] = set()
+                for successor in graph.blocks[index].successors:
+                    live_out |= live_in[successor]
+                live = uses[index] | (live_out - kills[index])
+                if live != live_in[index]:
+                    live_in[index] = live
+                    changed = True
+        return live_in
+
+    def __rename(self, graph: ControlFlowGraph, children: List[List[int]], variables: Set[str], placed: Dict[int, List[Tuple[str, IRPhi]]]):
+        counters: Dict[str, int] = {}
+        # Variable -> its versions visible at this point of the dominator tree walk, innermost last
+        versions: Dict[str, List[str]] = {variable: [] for variable in variables}
+        defined: Dict[int, List[str]] = {}
+
+        def define(variable: str, block: int) -> Pseudo:
+            counters[variable] = counters.get(variable, 0) + 1
+            name = f"{variable}.{counters[variable]}"
+            versions[variable].append(name)
+            defined[block].append(variable)
+            return Pseudo(value=name)
+
+        stack = [(graph.entry, False)]
+        while stack:
+            index, leaving = stack.pop()
+            if leaving:
+                for variable in defined.pop(index):
+                    versions[variable].pop()
+                continue
+            defined[index] = []
+            for variable, phi in placed.get(index, ()):
+                phi.dest = define(variable, index)
+            for instruction in graph.blocks[index].instructions:
+                if instruction.__class__ is IRPhi:
+                    continue
+                read_fields, write_fields, _, _ = effect(instruction)
+                for field in read_fields:
+                    name = location(getattr(instruction, field))
+                    if name in variables and versions[name]:
+                        setattr(instruction, field, Pseudo(value=versions[name][-1]))
+                for field in write_fields:
+                    name = location(getattr(instruction, field))
+                    if name in variables:
+                        setattr(instruction, field, define(name, index)) # type: ignore
+            for successor in graph.blocks[index].successors:
+                for variable, phi in placed.get(successor, ()):
+                    # A path with no write reads the temporary uninitialized, as it did before
+                    phi.sources[graph.blocks[index].label] = Pseudo(value=versions[variable][-1] if versions[variable] else variable)
+            stack.append((index, True))
+            stack.extend((child, False) for child in reversed(children[index]))
+
+    def __interference(self, graph: ControlFlowGraph, related: Set[str]) -> Dict[str, Set[str]]:
+        """Pairs of temporaries, one of them in `related`, where one is live where the other is written"""
+        phi_uses: List[Set[str]] = [set() for _ in graph.blocks]
+        for block in graph:
+            for successor in block.successors:
+                phi_uses[block.index].update(name for name in phi_reads(graph.blocks[successor].instructions, block.label) if is_temporary(name))
+        live_in: List[Set[str]] = [set() for _ in graph.blocks]
+        order = graph.postorder()
+        changed = True
+        while changed:
+            changed = False
+            for index in order:
+                live = self.__scan(graph.blocks[index].instructions, self.__live_out(graph, index, live_in, phi_uses), None, related)
+                if live != live_in[index]:
+                    live_in[index] = live
+                    changed = True
+        interference: Dict[str, Set[str]] = {}
+        for index in order:
+            self.__scan(graph.blocks[index].instructions, self.__live_out(graph, index, live_in, phi_uses), interference, related)
+        return interference
+
+    def __live_out(self, graph: ControlFlowGraph, index: int, live_in: List[Set[str]], phi_uses: List[Set[str]]) -> Set[str]:
+        live = set(phi_uses[index])
+        for successor in graph.blocks[index].successors:
+            live |= live_in[successor]
+        return live
+
+    def __scan(self, instructions: List[IRNode], live: Set[str], interference: Dict[str, Set[str]] | None, related: Set[str]) -> Set[str]:
+        """Temporaries live at the start of a block, recording interference on the way if asked to"""
+        live = set(live)
+        for instruction in reversed(instructions):
+            read_fields, write_fields, _, _ = effect(instruction)
+            written = [name for name in self.__names(instruction, write_fields) if is_temporary(name)]
+            read = [name for name in self.__names(instruction, read_fields) if is_temporary(name)]
+            if interference is not None:
+                # A copy's destination holds the same value as its source, they may share a name
+                same = location(instruction.src) if instruction.__class__ is IRCopy else None
+                for name in written:
+                    for other in live:
+                        if other != name and other != same and (name in related or other in related):
+                            interference.setdefault(name, set()).add(other)
+                            interference.setdefault(other, set()).add(name)
+            live.difference_update(written)
+            live.update(read)
+        return live
+
+    def __rename_fields(self, instruction: IRNode, renamed: Dict[str, str]):
+        if instruction.__class__ is IRPhi:
+            instruction.dest = Pseudo(value=renamed.get(instruction.dest.value, instruction.dest.value))
+            instruction.sources = {predecessor: Pseudo(value=renamed[location(source)]) if location(source) in renamed else source for predecessor, source in instruction.sources.items()}
+            return
+        read_fields, write_fields, _, _ = effect(instruction)
+        for field in set(read_fields + write_fields):
+            name = location(getattr(instruction, field))
+            if name in renamed:
+                setattr(instruction, field, Pseudo(value=renamed[name]))
+
+    def __sequentialize(self, copies: List[Tuple[str, BaseNode]]) -> List[IRNode]:
+        """IRCopys with the effect of doing all `dest := source` at once, breaking cycles with a fresh temporary"""
+        pending: Dict[str, BaseNode] = dict(copies)
+        result: List[IRNode] = []
+        while pending:
+            sources = {location(source) for source in pending.values()}
+            ready = [dest for dest in pending if dest not in sources]
+            if not ready:
+                dest = next(iter(pending))
+                saved = f"{dest}.saved"
+                result.append(IRCopy(src=Pseudo(value=dest), dest=Pseudo(value=saved)))
+                pending = {target: Pseudo(value=saved) if location(source) == dest else source for target, source in pending.items()}
+                continue
+            for dest in ready:
+                result.append(IRCopy(src=pending.pop(dest), dest=Pseudo(value=dest)))
+        self.copies += len(result)
+        return result
+
+    def __names(self, instruction: IRNode, fields: Tuple[str, ...]) -> List[str]:
+        return [name for name in (location(getattr(instruction, field)) for field in fields) if name is not None]
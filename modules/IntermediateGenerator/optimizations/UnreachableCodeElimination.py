@@ -0,0 +1,106 @@
+from typing import Dict, List, Set
+from modules.models.nodes.BaseNode import IRNode
+from modules.models.nodes.IR.Operands.Immediate import Immediate
+from modules.models.nodes.IR.Statements.IRCopy import IRCopy
+from modules.models.nodes.IR.Statements.IRJump import IRJump, IRJumpIfZero, IRLabel
+from modules.models.nodes.IR.Statements.IRPhi import IRPhi
+from modules.IntermediateGenerator.optimizations.ConstantFolder import literal_value
+from modules.IntermediateGenerator.optimizations.ControlFlowGraph import BasicBlock, ControlFlowGraph
+from modules.IntermediateGenerator.optimizations.InstructionEffects import CONDITIONAL_JUMPS, block_phis, location, writes
+from modules.utils.logger import get_logger
+
+
+class UnreachableCodeElimination:
+    """
+    Removes Tacky instructions control can never reach. Conditional jumps whose operand is known
+    within its block (`R11 := 0; jz R11`, as left by a folded side of && and ||) become an IRJump
+    or disappear, then every block that cannot be reached from the function entry through jumps
+    and fall throughs is dropped, which takes care of code after a return as well. Jumps to the
+    label that follows them and labels no jump targets are removed last. In SSA form, phis drop
+    the operands of predecessors that no longer reach them, and labels phis name are kept.
+    """
+    removed: int
+
+    def __init__(self):
+        self.removed = 0
+        self.logger = get_logger()
+
+    def run(self, instructions: List[IRNode]) -> List[IRNode]:
+        graph = ControlFlowGraph.from_instructions(instructions)
+        for block in graph:
+            self.__fold_branches(block.instructions)
+        # Folding changed some edges
+        graph = ControlFlowGraph.from_instructions(graph.to_instructions())
+        reachable = set(graph.postorder())
+        self.removed += sum(len(block.instructions) for block in graph if block.index not in reachable)
+        for block in graph:
+            self.__drop_phi_sources(graph, block, reachable)
+        result = self.__drop_unused_labels(self.__drop_jumps_to_next(graph.to_instructions(sorted(reachable))))
+        if self.removed:
+            self.logger.debug(f"Unreachable code elimination removed {self.removed} of {len(instructions)} instructions")
+        return result
+
+    def __fold_branches(self, block: List[IRNode]):
+        # Location -> constant it is known to hold at this point of the block
+        known: Dict[str, int] = {}
+        for position, instruction in enumerate(block):
+            if isinstance(instruction, CONDITIONAL_JUMPS):
+                value = self.__value(instruction.src, known)
+                if value is None:
+                    return
+                # A conditional jump always ends its block
+                if (value == 0) == (instruction.__class__ is IRJumpIfZero):
+                    block[position] = IRJump(label=instruction.label)
+                else:
+                    del block[position]
+                    self.removed += 1
+                return
+            for name in writes(instruction):
+                known.pop(name, None)
+            if instruction.__class__ is IRCopy and location(instruction.dest) is not None:
+                value = self.__value(instruction.src, known)
+                if value is not None:
+                    known[location(instruction.dest)] = value
+
+    def __drop_phi_sources(self, graph: ControlFlowGraph, block: BasicBlock, reachable: Set[int]):
+        """In SSA form, forget the operands phis take from predecessors that are gone or no longer jump here"""
+        phis = block_phis(block.instructions)
+        if not phis:
+            return
+        predecessors = {graph.blocks[predecessor].label for predecessor in block.predecessors if predecessor in reachable}
+        for phi in phis:
+            phi.sources = {label: source for label, source in phi.sources.items() if label in predecessors}
+
+    def __value(self, operand: IRNode, known: Dict[str, int]) -> int | None:
+        if isinstance(operand, Immediate):
+            return literal_value(operand.value)
+        return known.get(location(operand)) # type: ignore
+
+    def __drop_jumps_to_next(self, instructions: List[IRNode]) -> List[IRNode]:
+        kept: List[IRNode] = []
+        for index, instruction in enumerate(instructions):
+            if instruction.__class__ is IRJump:
+                following = index + 1
+                while following < len(instructions) and isinstance(instructions[following], IRLabel):
+                    if instructions[following].name == instruction.label:
+                        break
+                    following += 1
+                if following < len(instructions) and isinstance(instructions[following], IRLabel):
+                    self.removed += 1
+                    continue
+            kept.append(instruction)
+        return kept
+
+    def __drop_unused_labels(self, instructions: List[IRNode]) -> List[IRNode]:
+        targets = {instruction.label for instruction in instructions if isinstance(instruction, (IRJump,) + CONDITIONAL_JUMPS)}
+        # Phis name their predecessors by label
+        targets.update(label for instruction in instructions if instruction.__class__ is IRPhi for label in instruction.sources)
+        # Phis must stay at the start of their block, so the label before them does too
+        targets.update(instruction.name for instruction, following in zip(instructions, instructions[1:]) if isinstance(instruction, IRLabel) and following.__class__ is IRPhi)
+        kept: List[IRNode] = []
+        for instruction in instructions:
+            if isinstance(instruction, IRLabel) and instruction.name not in targets:
+                self.removed += 1
+                continue
+            kept.append(instruction)
+        return kept
@@ -1,5 +1,5 @@
 
-from typing import List
+from typing import Any, Dict, List
 from modules.models.enums.GenericRegisterEnum import GenericRegisterEnum
 from modules.models.nodes.AST.Operands.BinaryOperators import *
 from modules.models.nodes.AST.Operands.BitwiseOperators import *
@@ -24,6 +24,33 @@ from modules.models.nodes.IR.Statements.IRCopy import IRCopy
 from modules.models.nodes.IR.Statements.IRJump import *
 from modules.models.nodes.IR.Statements.IRReturnValue import IRreturn
 from modules.IntermediateGenerator.visitors.StackAllocator import StackAllocator
+from modules.models.nodes.IR.Operands.Pseudo import Pseudo
+from modules.utils.interning import intern
+
+# Looked up on node.__class__ rather than type(node) so arena NodeViews dispatch like the nodes they
+# stand for, see ASTLowerer.__lookup for subclasses of these nodes
+ARITHMETIC_OPERATIONS = {
+    BinaryAdd: BinaryOperationEnum.ADD,
+    BinaryMinus: BinaryOperationEnum.MINUS,
+    BinaryMultiply: BinaryOperationEnum.MULTIPLY,
+    BinaryDivide: BinaryOperationEnum.DIVIDE,
+    BinaryModulus: BinaryOperationEnum.MODULUS,
+}
+BITWISE_OPERATIONS = {
+    BitwiseAnd: BitwiseOperationEnum.BITWISE_AND,
+    BitwiseOr: BitwiseOperationEnum.BITWISE_OR,
+    BitwiseXor: BitwiseOperationEnum.BITWISE_XOR,
+    BitwiseLeftShift: BitwiseOperationEnum.SHIFT_LEFT,
+    BitwiseRightShift: BitwiseOperationEnum.SHIFT_RIGHT,
+}
+RELATIONAL_INSTRUCTIONS = {
+    EqualRelation: EqualRelationInstruction,
+    NotEqualRelation: NotEqualRelationInstruction,
+    LessThanRelation: LessThanRelationInstruction,
+    LessThanEqualRelation: LessThanEqualRelationInstruction,
+    GreaterThanRelation: GreaterThanRelationInstruction,
+    GreaterThanEqualRelation: GreaterThanEqualRelationInstruction,
+}
 
 
 class ASTLowerer(VisitorModel):
@@ -38,18 +65,14 @@ class ASTLowerer(VisitorModel):
         dividend = node.left.accept(self, instructions)
         divisor = node.right.accept(self, instructions)
         
-        src_name = f"tmp.{self.allocator.temp_counter}"
-        self.allocator.temp_counter += 1
-        src_pseudo = self.allocator.allocate_pseudo(src_name)
-        
-        dest_pseudo = f"reg.{GenericRegisterEnum.AX}"
-        dest_pseudo = self.allocator.allocate_pseudo(dest_pseudo)
+        src_pseudo = self.__allocate_temp()
+        dest_pseudo = self.allocator.allocate_register(GenericRegisterEnum.AX)
         
         instructions.append(IRCopy(src=divisor, dest=src_pseudo))
         instructions.append(IRCopy(src=dividend, dest=dest_pseudo))
         
         if(op == BinaryOperationEnum.MODULUS):
-            target_pseudo = self.allocator.allocate_pseudo(f"reg.{GenericRegisterEnum.DX}")
+            target_pseudo = self.allocator.allocate_register(GenericRegisterEnum.DX)
             instructions.append(ModInstruction(src=src_pseudo, dest=dest_pseudo))
             instructions.append(IRCopy(src=target_pseudo, dest=dest_pseudo))
             return dest_pseudo
@@ -60,11 +83,8 @@ class ASTLowerer(VisitorModel):
     def __visit_add_sub_or_mult(self, node: BinaryNode, instructions: List[BaseNode], op: BinaryOperationEnum):
         left_result = node.left.accept(self, instructions)
         right_result = node.right.accept(self, instructions)
-        src_name = f"tmp.{self.allocator.temp_counter}"
-        self.allocator.temp_counter += 1
-        dest_pseudo = self.allocator.allocate_pseudo(src_name)
-        scratch_name = f"reg.{GenericRegisterEnum.R11}"
-        scratch_pseudo = self.allocator.allocate_pseudo(scratch_name)
+        dest_pseudo = self.__allocate_temp()
+        scratch_pseudo = self.allocator.allocate_register(GenericRegisterEnum.R11)
         instructions.append(IRCopy(src=left_result, dest=scratch_pseudo))
         match op:
             case BinaryOperationEnum.ADD:
@@ -81,11 +101,8 @@ class ASTLowerer(VisitorModel):
     def __visit_bitwise_and_or_xor(self, node: BinaryNode, instructions: List[BaseNode], op: BitwiseOperationEnum):
         left_result = node.left.accept(self, instructions)
         right_result = node.right.accept(self, instructions)
-        src_name = f"tmp.{self.allocator.temp_counter}"
-        self.allocator.temp_counter += 1
-        dest_pseudo = self.allocator.allocate_pseudo(src_name)
-        scratch_name = f"reg.{GenericRegisterEnum.R11}"
-        scratch_pseudo = self.allocator.allocate_pseudo(scratch_name)
+        dest_pseudo = self.__allocate_temp()
+        scratch_pseudo = self.allocator.allocate_register(GenericRegisterEnum.R11)
         instructions.append(IRCopy(src=left_result, dest=scratch_pseudo))
         match op:
             case BitwiseOperationEnum.BITWISE_AND:
@@ -107,10 +124,9 @@ class ASTLowerer(VisitorModel):
         left_result = node.left.accept(self, instructions)
         right_result = node.right.accept(self, instructions)
         dest_pseudo = self.__allocate_temp()
-        scratch_name = f"reg.{GenericRegisterEnum.R11}"
-        scratch_pseudo = self.allocator.allocate_pseudo(scratch_name)
-        false_label = IRLabel(name=f"lbl.false.{self.allocator.temp_counter}")
-        end_label = IRLabel(name=f"lbl.end.{self.allocator.temp_counter}")
+        scratch_pseudo = self.allocator.allocate_register(GenericRegisterEnum.R11)
+        false_label = IRLabel(name=intern(f"lbl.false.{self.allocator.temp_counter}"))
+        end_label = IRLabel(name=intern(f"lbl.end.{self.allocator.temp_counter}"))
         
         instructions.append(IRCopy(src=left_result, dest=scratch_pseudo))
         instructions.append(IRJumpIfNotZero(src=scratch_pseudo, label=false_label.name))
@@ -127,10 +143,9 @@ class ASTLowerer(VisitorModel):
         left_result = node.left.accept(self, instructions)
         right_result = node.right.accept(self, instructions)
         dest_pseudo = self.__allocate_temp()
-        scratch_name = f"reg.{GenericRegisterEnum.R11}"
-        scratch_pseudo = self.allocator.allocate_pseudo(scratch_name)
-        false_label = IRLabel(name=f"lbl.false.{self.allocator.temp_counter}")
-        end_label = IRLabel(name=f"lbl.end.{self.allocator.temp_counter}")
+        scratch_pseudo = self.allocator.allocate_register(GenericRegisterEnum.R11)
+        false_label = IRLabel(name=intern(f"lbl.false.{self.allocator.temp_counter}"))
+        end_label = IRLabel(name=intern(f"lbl.end.{self.allocator.temp_counter}"))
         
         instructions.append(IRCopy(src=left_result, dest=scratch_pseudo))
         instructions.append(IRJumpIfZero(src=scratch_pseudo, label=false_label.name))
@@ -143,63 +158,45 @@ class ASTLowerer(VisitorModel):
         instructions.append(end_label)
         return dest_pseudo
      
+    def __lookup(self, table: Dict[type, Any], node: BaseNode) -> Any:
+        """Entry of `table` for the node's class, or for the first class in it the node is an instance of"""
+        found = table.get(node.__class__)
+        if found is None:
+            for kind, entry in table.items():
+                if isinstance(node, kind):
+                    return entry
+        return found
+
     def visit_binary_expression(self, node: BinaryNode, instructions: List[BaseNode]):
-        if isinstance(node, BinaryMinus):
-            return self.__visit_add_sub_or_mult(node, instructions,BinaryOperationEnum.MINUS)
-        elif isinstance(node, BinaryAdd):
-            return self.__visit_add_sub_or_mult(node, instructions,BinaryOperationEnum.ADD)
-        elif isinstance(node, BinaryMultiply):  
-            return self.__visit_add_sub_or_mult(node, instructions,BinaryOperationEnum.MULTIPLY)
-        elif isinstance(node, BinaryDivide):
-            return self.__visit_divisor_or_modulo(node, instructions,BinaryOperationEnum.DIVIDE)
-        elif isinstance(node, BinaryModulus):
-            return self.__visit_divisor_or_modulo(node, instructions,BinaryOperationEnum.MODULUS)
-        else:
+        op = self.__lookup(ARITHMETIC_OPERATIONS, node)
+        if op is None:
             raise NotImplementedError(f"Binary operation for {type(node)} not implemented in ASTLowerer")
+        if op in (BinaryOperationEnum.DIVIDE, BinaryOperationEnum.MODULUS):
+            return self.__visit_divisor_or_modulo(node, instructions, op)
+        return self.__visit_add_sub_or_mult(node, instructions, op)
     
     def visit_bitwise_expression(self, node: BinaryNode, instructions: List[BaseNode]):
-        if isinstance(node, BitwiseAnd):
-            return self.__visit_bitwise_and_or_xor(node, instructions,BitwiseOperationEnum.BITWISE_AND)
-        elif isinstance(node, BitwiseOr):
-            return self.__visit_bitwise_and_or_xor(node, instructions,BitwiseOperationEnum.BITWISE_OR)
-        elif isinstance(node, BitwiseXor):
-            return self.__visit_bitwise_and_or_xor(node, instructions,BitwiseOperationEnum.BITWISE_XOR)
-        elif isinstance(node, BitwiseLeftShift):
-            return self.__visit_bitwise_and_or_xor(node, instructions,BitwiseOperationEnum.SHIFT_LEFT)
-        elif isinstance(node, BitwiseRightShift):
-            return self.__visit_bitwise_and_or_xor(node, instructions,BitwiseOperationEnum.SHIFT_RIGHT)
-        else:
+        op = self.__lookup(BITWISE_OPERATIONS, node)
+        if op is None:
             raise NotImplementedError(f"Binary operation for {type(node)} not implemented in ASTLowerer")
+        return self.__visit_bitwise_and_or_xor(node, instructions, op)
         
     def visit_conditional_expression(self, node: BaseNode, instructions: List[BaseNode]):
+        instruction = self.__lookup(RELATIONAL_INSTRUCTIONS, node)
+        if instruction is None:
+            raise NotImplementedError(f"Conditional operation for {type(node)} not implemented in ASTLowerer")
         #clears and writes to the AL register
         src = node.left.accept(self, instructions)
         dest = node.right.accept(self, instructions)
-        temp = self.allocator.allocate_pseudo(f"reg.{GenericRegisterEnum.R10}")
+        temp = self.allocator.allocate_register(GenericRegisterEnum.R10)
         self.__zero_out_ax(instructions)
         instructions.append(IRCopy(src=src, dest=temp))
-        if isinstance(node, EqualRelation):
-            instructions.append(EqualRelationInstruction(src=temp, dest=dest))
-        elif isinstance(node, NotEqualRelation):
-            instructions.append(NotEqualRelationInstruction(src=temp, dest=dest))
-        elif isinstance(node, LessThanRelation):
-            instructions.append(LessThanRelationInstruction(src=temp, dest=dest))
-        elif isinstance(node, LessThanEqualRelation):
-            instructions.append(LessThanEqualRelationInstruction(src=temp, dest=dest))
-        elif isinstance(node, GreaterThanRelation):
-            instructions.append(GreaterThanRelationInstruction(src=temp, dest=dest))
-        elif isinstance(node, GreaterThanEqualRelation):
-            instructions.append(GreaterThanEqualRelationInstruction(src=temp, dest=dest))
-        else:
-            raise NotImplementedError(f"Conditional operation for {type(node)} not implemented in ASTLowerer")
+        instructions.append(instruction(src=temp, dest=dest))
         instructions.append(IRCopy(src=Register(value=GenericRegisterEnum.AX), dest=temp)) 
         return temp
     
-    def __allocate_temp(self) -> Register:
-        temp_name = f"tmp.{self.allocator.temp_counter}"
-        self.allocator.temp_counter += 1
-        temp = self.allocator.allocate_pseudo(temp_name)
-        return temp
+    def __allocate_temp(self) -> Pseudo:
+        return self.allocator.allocate_pseudo(self.allocator.next_temp_name())
 
     def visit_negate(self, node: Negate, instructions: List[BaseNode]):
         operand_result = node.operand.accept(self, instructions)
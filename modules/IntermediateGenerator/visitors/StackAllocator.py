@@ -1,7 +1,16 @@
+from typing import Iterable, List
 from modules.models.enums.GenericRegisterEnum import GenericRegisterEnum
 from modules.models.nodes.IR.Operands.Register import Register 
 from modules.models.nodes.IR.Operands.Stack import Stack
 from modules.models.nodes.IR.Operands.Pseudo import Pseudo
+from modules.utils.interning import intern
+
+# Interned pseudo names of the generic registers, e.g. "reg.GenericRegisterEnum.AX"
+REGISTER_PSEUDOS: dict[GenericRegisterEnum, str] = {register: intern(f"reg.{register}") for register in GenericRegisterEnum}
+PSEUDO_REGISTERS: dict[str, GenericRegisterEnum] = {name: register for register, name in REGISTER_PSEUDOS.items()}
+
+# "tmp.N" names, shared by every function since each one numbers its temporaries from 0
+_TEMP_NAMES: List[str] = []
 
 
 class StackAllocator:
@@ -11,12 +20,24 @@ class StackAllocator:
         self.register_map: dict[str, int] = {}
         
     def __is_register(self, value: str) -> bool:
-        if value[:4] == "reg.":
+        if value in PSEUDO_REGISTERS or value[:4] == "reg.":
             return True
         return False
 
         
+    def next_temp_name(self) -> str:
+        """Interned name of the next temporary, "tmp.N", advancing temp_counter"""
+        index = self.temp_counter
+        while len(_TEMP_NAMES) <= index:
+            _TEMP_NAMES.append(intern(f"tmp.{len(_TEMP_NAMES)}"))
+        self.temp_counter += 1
+        return _TEMP_NAMES[index]
+
+    def allocate_register(self, register: GenericRegisterEnum) -> Pseudo:
+        return self.allocate_pseudo(REGISTER_PSEUDOS[register])
+
     def allocate_pseudo(self, name:str, size: int = 4) -> Pseudo:
+        name = intern(name)
         if self.__is_register(name):
             self.register_map[name] = 0
             return Pseudo(value=name)
@@ -25,9 +46,23 @@ class StackAllocator:
             self.register_map[name] = self.stack_offset
             return Pseudo(value=name)
     
+    def compact(self, names: Iterable[str]):
+        """Give the named temporaries consecutive stack slots, in order, and release the slots of every other temporary. Names the passes made up are allocated too."""
+        self.stack_offset = 0
+        register_map = {name: offset for name, offset in self.register_map.items() if self.__is_register(name)}
+        for name in names:
+            if name in register_map:
+                continue
+            self.stack_offset -= 4
+            register_map[name] = self.stack_offset
+        self.register_map = register_map
+
     def resolve_pseudo(self, pseudo: Pseudo) -> Stack | Register:
         if pseudo.value not in self.register_map:
             raise KeyError("Pseudo not registered to stack")
+        register = PSEUDO_REGISTERS.get(pseudo.value)
+        if register is not None:
+            return Register(value=register)
         if self.__is_register(pseudo.value):
             reg = pseudo.value[4:]
             regEnum = GenericRegisterEnum.from_reg_label(reg)
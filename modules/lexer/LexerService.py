@@ -1,43 +1,64 @@
-from typing import List
-import re
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+import mmap
+import os
+from typing import Callable, Iterator, List, Tuple
 from modules.lexer.models.LexerToken import LexerToken
-from modules.models.enums.keyword_patterns import KeyWordPatterns
+from modules.lexer.models.TokenBuffer import KEYWORD_CODE, KIND_CODES, TokenBuffer
+from modules.lexer.ScannerPatterns import COMMENT_END_PATTERN, TOKEN_PATTERN
+from modules.lexer.SourceScanner import SourceScanner
+from modules.models.enums.keyword_patterns import BINARY_KEYWORD_LOOKUP, KEYWORD_LOOKUP
 from modules.models.enums.token_type import TokenType
 from modules.models.lexer.Token import Token
+from modules.utils.content_cache import DEFAULT_CACHE_SIZE, ContentCache
+from modules.utils.interning import symbols
 from modules.utils.logger import get_logger, debug, info
 
+# Part of every token cache key, bump it whenever a change to the lexer changes its output
+LEXER_VERSION = "1"
+
+# Below this many characters per chunk a process pool costs more than it saves
+MIN_PARALLEL_CHUNK_SIZE = 256 * 1024
+
+
+def _lex_chunk_worker(chunk: str, base: int, line: int) -> Tuple[bytes, bool, str | None]:
+	"""
+	Process pool entry point. Lexes one chunk assuming it does not start inside a comment and
+	returns the serialized columns, whether the chunk ends inside a comment, and the lexer error
+	if there was one, so the parent can decide whether the assumption held before raising it.
+	"""
+	try:
+		buffer, in_comment = LexerService().lex_chunk(chunk, base, line)
+	except ValueError as e:
+		return b"", False, str(e)
+	return buffer.to_bytes(), in_comment, None
+
 
 class LexerService():
 	comment_skip_mode = False
+	token_cache: ContentCache | None
+
+	def __init__(self, cache_dir: str | None = None, cache_size: int = DEFAULT_CACHE_SIZE):
+		self.token_cache = ContentCache(cache_dir, cache_size, suffix=".tokens", name="Token cache") if cache_dir else None
 
 	def __test_token(self, input: str, comment_skip_mode: bool = False) -> LexerToken:
-		token_type = None
-		token_value = None
 		if comment_skip_mode:
-			for tokenPattern in [TokenType.COMMENT_MULTI_END]:
-				regex = tokenPattern.value.pattern
-				match = re.match(regex, input)
-				if match:
-					token_type = tokenPattern
-					token_value = match.group(0)
-					return LexerToken(type=token_type, value=token_value)
-			return LexerToken(type=TokenType.COMMENT_LINE, value=input)
-		for tokenPattern in [pattern for pattern in TokenType if pattern != TokenType.ERROR]:
-			regex = tokenPattern.value.pattern
-			match = re.match(regex, input, flags=re.DOTALL | re.MULTILINE)
+			match = COMMENT_END_PATTERN.match(input)
 			if match:
-				token_type = tokenPattern
-				token_value = match.group(0)
-				return LexerToken(type=token_type, value=token_value)
+				return LexerToken(type=TokenType.COMMENT_MULTI_END, value=match.group(0))
+			return LexerToken(type=TokenType.COMMENT_LINE, value=input)
+		match = TOKEN_PATTERN.match(input)
+		if match:
+			return LexerToken(type=TokenType[match.lastgroup], value=match.group(0))
 		return LexerToken(type=TokenType.ERROR, value=input[0])
 	
-	def __test_for_keyword(self, identifier: str)->LexerToken:
-		for keyword in KeyWordPatterns:
-			regex = keyword.value
-			match = re.match(regex, identifier)
-			if match:
-				return LexerToken(type=TokenType.KEYWORD, value=keyword.name)
-		return LexerToken(type=TokenType.IDENTIFIER, value=identifier)
+	def __test_for_keyword(self, identifier: str) -> Tuple[TokenType, str]:
+		"""Token type and value of an identifier: the keyword's name if it is one, else the interned identifier"""
+		keyword = KEYWORD_LOOKUP.get(identifier)
+		if keyword is not None:
+			return TokenType.KEYWORD, keyword.name
+		return TokenType.IDENTIFIER, symbols.intern(identifier)
 
 	def __tokenize_string(self, data: str) -> List[LexerToken]:
 		input = data
@@ -61,7 +82,8 @@ class LexerService():
 					input = input[len(lexerToken.value):]
 					continue
 				case TokenType.IDENTIFIER:
-					lexerToken = self.__test_for_keyword(lexerToken.value)
+					token_type, value = self.__test_for_keyword(lexerToken.value)
+					lexerToken = LexerToken(type=token_type, value=value)
 				case TokenType.ERROR:
 					raise ValueError(f"Unexpected character: {input[0]}")
 			tokens.append(lexerToken)
@@ -71,7 +93,243 @@ class LexerService():
 	def map_token_type(self, token: LexerToken) -> TokenType:
 		return TokenType[token.type.name]
 
-	def lex_file(self,file_name: str) -> List[Token]:
+	def __scan_source(self, source: str) -> Iterator[Token]:
+		scanner = SourceScanner(source)
+		intern = symbols.intern
+		test_for_keyword = self.__test_for_keyword
+		for token_type, start, end, line, column in scanner.scan():
+			value = source[start:end]
+			if token_type == TokenType.IDENTIFIER:
+				token_type, value = test_for_keyword(value)
+			elif token_type == TokenType.CONSTANT:
+				value = intern(value)
+			yield Token(type=token_type, lineNumber=line, value=value, column=column)
+
+	def lex_source(self, source: str) -> List[Token]:
+		"""Lex a whole source text in one pass, advancing an offset instead of slicing lines."""
+		return list(self.__scan_source(source))
+
+	def __scan_columns(self, scanner: SourceScanner) -> Iterator[Tuple[int, int, int, int]]:
+		"""Yield (kind code, start, length, line) for every token the scanner finds"""
+		source = scanner.text
+		keywords = KEYWORD_LOOKUP if isinstance(source, str) else BINARY_KEYWORD_LOOKUP
+		for token_type, start, end, line, column in scanner.scan():
+			kind = KIND_CODES[token_type]
+			if token_type == TokenType.IDENTIFIER and source[start:end] in keywords:
+				kind = KEYWORD_CODE
+			yield kind, start, end - start, line
+
+	def buffer_source(self, source: str | bytes | mmap.mmap) -> TokenBuffer:
+		"""Lex a whole source text straight into compact TokenBuffer columns"""
+		buffer = TokenBuffer(source)
+		append = buffer.append
+		for kind, start, length, line in self.__scan_columns(SourceScanner(source)):
+			append(kind, start, length, line)
+		return buffer
+
+	def lex_chunk(self, chunk: str, base: int = 0, line: int = 1, in_comment: bool = False) -> Tuple[TokenBuffer, bool]:
+		"""
+		Lex a slice of a larger source that begins at offset `base` on line `line`. Token starts
+		are stored as offsets into the whole source. Returns the buffer and whether the chunk
+		ends inside a multi-line comment.
+		"""
+		scanner = SourceScanner(chunk, line=line, in_comment=in_comment)
+		buffer = TokenBuffer(chunk)
+		append = buffer.append
+		for kind, start, length, token_line in self.__scan_columns(scanner):
+			append(kind, base + start, length, token_line)
+		return buffer, scanner.in_comment
+
+	def __split_points(self, source: str, count: int) -> List[int]:
+		"""
+		Chunk boundaries close to `count` equal parts. Every boundary is just after a newline, which
+		also ends line comments and string constants, and a boundary that looks like it falls inside
+		a multi-line comment is moved past the comment's end. The guess is checked after lexing.
+		"""
+		size = len(source)
+		bounds = [0]
+		for part in range(1, count):
+			pos = max(size * part // count, bounds[-1])
+			opened = source.rfind('/*', bounds[-1], pos)
+			if opened != -1 and source.find('*/', opened + 2, pos) == -1:
+				closed = source.find('*/', pos)
+				pos = size if closed == -1 else closed + 2
+			newline = source.find('\n', pos)
+			if newline == -1:
+				break
+			if newline + 1 > bounds[-1]:
+				bounds.append(newline + 1)
+		if bounds[-1] != size:
+			bounds.append(size)
+		return bounds
+
+	def buffer_parallel(self, source: str, jobs: int | None = None, min_chunk_size: int = MIN_PARALLEL_CHUNK_SIZE) -> TokenBuffer:
+		"""
+		Lex a source in chunks across a process pool and merge the chunks into one TokenBuffer,
+		identical to buffer_source. Workers assume their chunk starts outside a comment. When the
+		previous chunk actually ended inside one, that chunk is lexed again here with the right state.
+		"""
+		jobs = jobs or os.cpu_count() or 1
+		count = min(jobs, len(source) // max(min_chunk_size, 1))
+		if count < 2:
+			return self.buffer_source(source)
+		bounds = self.__split_points(source, count)
+		chunks = []
+		line = 1
+		for start, end in zip(bounds, bounds[1:]):
+			chunks.append((start, end, line))
+			line += source.count('\n', start, end)
+
+		buffer = TokenBuffer(source)
+		relexed = 0
+		with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as pool:
+			futures = [pool.submit(_lex_chunk_worker, source[start:end], start, line) for start, end, line in chunks]
+			in_comment = False
+			for (start, end, line), future in zip(chunks, futures):
+				data, ends_in_comment, error = future.result()
+				if in_comment:
+					chunk_buffer, ends_in_comment = self.lex_chunk(source[start:end], start, line, in_comment=True)
+					relexed += 1
+				elif error is not None:
+					raise ValueError(error)
+				else:
+					chunk_buffer = TokenBuffer.from_bytes(source, data)
+				buffer.kinds.extend(chunk_buffer.kinds)
+				buffer.starts.extend(chunk_buffer.starts)
+				buffer.lengths.extend(chunk_buffer.lengths)
+				buffer.lines.extend(chunk_buffer.lines)
+				in_comment = ends_in_comment
+		get_logger().debug(f"Lexed {len(chunks)} chunks in parallel, {relexed} relexed after a comment crossed a boundary")
+		return buffer
+
+	def relex(self, buffer: TokenBuffer, offset: int, removed: int, inserted: str | bytes) -> TokenBuffer:
+		"""
+		Update `buffer` in place for an edit that replaces `removed` characters at `offset` with `inserted`.
+		Lexing restarts at the first token of the line before the edit, where the scanner is known to be
+		outside a comment, and stops as soon as a new token lines up with an old token after the edit.
+		From there the lexer would produce the old tokens again, so they are kept and only shifted.
+		Buffers over bytes or a memory map count offsets in bytes, and `inserted` is converted to the
+		buffer's type as ASCII, like the sources lex_mmap reads.
+		"""
+		if isinstance(buffer.source, mmap.mmap):
+			buffer.source = buffer.source[:]
+		old_source = buffer.source
+		if isinstance(old_source, str):
+			newline = '\n'
+			if not isinstance(inserted, str):
+				inserted = inserted.decode('ascii')
+		else:
+			newline = b'\n'
+			if isinstance(inserted, str):
+				inserted = inserted.encode('ascii')
+		old_edit_end = offset + removed
+		new_edit_end = offset + len(inserted)
+		delta = len(inserted) - removed
+		line_delta = inserted.count(newline) - old_source.count(newline, offset, old_edit_end)
+		source = old_source[:offset] + inserted + old_source[old_edit_end:]
+		kinds, starts, lengths, lines = buffer.kinds, buffer.starts, buffer.lengths, buffer.lines
+		count = len(kinds)
+
+		# The token touching the edit may change, and so may the one before it (e.g. '<' + '=')
+		touching = bisect_left(starts, offset)
+		if touching > 0 and starts[touching - 1] + lengths[touching - 1] >= offset:
+			touching -= 1
+		if touching > 1:
+			restart = bisect_left(lines, lines[touching - 1])
+			scanner = SourceScanner(source, pos=starts[restart], line=lines[restart])
+		else:
+			restart = 0
+			scanner = SourceScanner(source)
+
+		relexed = TokenBuffer(source)
+		resync = count
+		old_index = restart
+		for kind, start, length, line in self.__scan_columns(scanner):
+			if start >= new_edit_end:
+				old_start = start - delta
+				while old_index < count and starts[old_index] < old_start:
+					old_index += 1
+				if (old_index < count and starts[old_index] == old_start
+						and kinds[old_index] == kind and lengths[old_index] == length):
+					resync = old_index
+					break
+			relexed.append(kind, start, length, line)
+
+		kinds[restart:resync] = relexed.kinds
+		starts[restart:resync] = relexed.starts
+		lengths[restart:resync] = relexed.lengths
+		lines[restart:resync] = relexed.lines
+		tail = restart + len(relexed)
+		if delta:
+			starts[tail:] = array('Q', map(delta.__add__, starts[tail:]))
+		if line_delta:
+			lines[tail:] = array('I', map(line_delta.__add__, lines[tail:]))
+		buffer.source = source
+		get_logger().debug(f"Relexed {len(relexed)} tokens, replaced {resync - restart}, kept {count - resync}")
+		return buffer
+
+	def __buffer_cached(self, source: str | bytes | mmap.mmap, content, lex: Callable[..., TokenBuffer] | None = None) -> TokenBuffer:
+		"""
+		buffer_source through the token cache. The key is a hash of `content` (the bytes the lexer
+		reads) and the lexer version, a hit is rebuilt from the stored columns without lexing.
+		"""
+		lex = lex or self.buffer_source
+		if self.token_cache is None:
+			return lex(source)
+		mode = 'text' if isinstance(source, str) else 'binary'
+		key = ContentCache.key(LEXER_VERSION, mode, content)
+		data = self.token_cache.get(key)
+		if data is not None:
+			try:
+				return TokenBuffer.from_bytes(source, data)
+			except ValueError as e:
+				get_logger().warning(f"Ignoring unreadable token cache entry {key[:12]}: {e}")
+		buffer = lex(source)
+		self.token_cache.put(key, buffer.to_bytes())
+		return buffer
+
+	def buffer_text(self, source: str, jobs: int | None = 1) -> TokenBuffer:
+		"""
+		Lex in-memory text, such as preprocessor output, through the token cache. With more than
+		one job (None for one per CPU) large texts are lexed by buffer_parallel.
+		"""
+		lex = self.buffer_source if jobs == 1 else lambda text: self.buffer_parallel(text, jobs)
+		return self.__buffer_cached(source, source.encode('utf-8', 'surrogatepass'), lex)
+
+	def lex_buffer(self, file_name: str) -> TokenBuffer:
+		with open(file_name, 'r') as file:
+			return self.buffer_text(file.read())
+
+	def lex_parallel(self, file_name: str, jobs: int | None = None) -> TokenBuffer:
+		"""Like lex_buffer, but large files are lexed in chunks by `jobs` worker processes"""
+		with open(file_name, 'r') as file:
+			return self.buffer_text(file.read(), jobs)
+
+	def lex_mmap(self, file_name: str) -> TokenBuffer:
+		"""
+		Lex an ASCII source straight from a read-only memory map of the file using bytes patterns.
+		Nothing is decoded up front, token text is decoded when the parser reads it.
+		"""
+		with open(file_name, 'rb') as file:
+			if os.fstat(file.fileno()).st_size == 0:
+				return self.buffer_source(b"")
+			source = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+		return self.__buffer_cached(source, source)
+
+	def iter_tokens(self, file_name: str) -> Iterator[Token]:
+		"""Yield the tokens of a file one at a time so the parser can consume them while lexing"""
+		with open(file_name, 'r') as file:
+			source = file.read()
+		yield from self.__scan_source(source)
+
+	def iter_source(self, source: str) -> Iterator[Token]:
+		"""Yield the tokens of in-memory text one at a time, see iter_tokens"""
+		return self.__scan_source(source)
+
+	def lex_file(self,file_name: str, whole_file: bool = False) -> List[Token]:
+		if whole_file:
+			with open(file_name, 'r') as file:
+				return self.lex_source(file.read())
 		sanitized_tokens: List[Token] = []
 		line_number = 0
 		with open(file_name, 'r') as file:
@@ -0,0 +1,28 @@
+import re
+from typing import List
+from modules.models.enums.token_type import TokenType
+
+# Token kinds the scanner can produce outside of a multi-line comment, in the
+# same first-match priority order as the TokenType declaration. COMMENT_MULTI_END
+# is only meaningful while inside a comment, so it is matched separately.
+SCANNABLE_TOKEN_TYPES: List[TokenType] = [
+	token_type for token_type in TokenType
+	if token_type not in (TokenType.ERROR, TokenType.COMMENT_MULTI_END)
+]
+
+def master_alternatives() -> str:
+	return "|".join(f"(?P<{token_type.name}>{token_type.value.pattern})" for token_type in SCANNABLE_TOKEN_TYPES)
+
+def build_master_pattern(flags: int = 0, binary: bool = False) -> re.Pattern:
+	"""
+	Combine every TokenDefinition.pattern into a single precompiled alternation.
+	Each alternative is a named group so `match.lastgroup` gives the TokenType name,
+	and Python's alternation tries branches left to right, which keeps the
+	first-match priority of the TokenType enum.
+	With `binary` the pattern is compiled for bytes input, where \\w and \\s are ASCII only.
+	"""
+	pattern = master_alternatives()
+	return re.compile(pattern.encode('ascii') if binary else pattern, flags)
+
+TOKEN_PATTERN = build_master_pattern(re.DOTALL | re.MULTILINE)
+COMMENT_END_PATTERN = re.compile(TokenType.COMMENT_MULTI_END.value.pattern)
@@ -0,0 +1,101 @@
+import re
+from typing import Iterator, List, Tuple
+from modules.lexer.ScannerPatterns import master_alternatives
+from modules.models.enums.token_type import TokenType
+
+# (token type, start offset, end offset, line, column)
+ScannedToken = Tuple[TokenType, int, int, int, int]
+
+# Without DOTALL, '.' stops at a newline, so line comments and string constants
+# end at the end of their line exactly like the line-by-line lexer. Leading blanks
+# and newlines are folded into the same match so each token costs one match call.
+SCANNER_SOURCE = r'[ \t\r\f\v]*(?:(?P<NEWLINE>\n)|' + master_alternatives() + ')'
+SOURCE_TOKEN_PATTERN = re.compile(SCANNER_SOURCE)
+WHITESPACE_PATTERN = re.compile(r'\s*')
+BINARY_TOKEN_PATTERN = re.compile(SCANNER_SOURCE.encode('ascii'))
+BINARY_WHITESPACE_PATTERN = re.compile(rb'\s*')
+
+# Group number -> TokenType, None for the NEWLINE group
+_GROUP_TYPES: List[TokenType | None] = [None] * (SOURCE_TOKEN_PATTERN.groups + 1)
+for _name, _group in SOURCE_TOKEN_PATTERN.groupindex.items():
+	_GROUP_TYPES[_group] = TokenType[_name] if _name != 'NEWLINE' else None
+
+
+class SourceScanner:
+	"""
+	Scans a whole source text by advancing an integer cursor with `pattern.match(text, pos)`.
+	Line and column are tracked from the offsets, and the multi-line comment state lives on
+	the scanner instance so that scanning can stop and resume at any offset.
+	The source may be a str, or bytes-like ASCII input such as bytes or an mmap.
+	"""
+	def __init__(self, text, pos: int = 0, line: int = 1, in_comment: bool = False):
+		self.text = text
+		self.binary = not isinstance(text, str)
+		if self.binary:
+			self.newline, self.comment_end = b'\n', b'*/'
+			self.token_pattern, self.whitespace_pattern = BINARY_TOKEN_PATTERN, BINARY_WHITESPACE_PATTERN
+		else:
+			self.newline, self.comment_end = '\n', '*/'
+			self.token_pattern, self.whitespace_pattern = SOURCE_TOKEN_PATTERN, WHITESPACE_PATTERN
+		self.pos = pos
+		self.line = line
+		self.line_start = text.rfind(self.newline, 0, pos) + 1
+		self.in_comment = in_comment
+
+	def __count_newlines(self, start: int, end: int) -> int:
+		if isinstance(self.text, (str, bytes)):
+			return self.text.count(self.newline, start, end)
+		# mmap has no count(), slicing it gives bytes
+		return self.text[start:end].count(self.newline)
+
+	def __advance_to(self, pos: int):
+		newlines = self.__count_newlines(self.pos, pos)
+		if newlines:
+			self.line += newlines
+			self.line_start = self.text.rfind(self.newline, self.pos, pos) + 1
+		self.pos = pos
+
+	def __skip_comment(self, end: int) -> bool:
+		close = self.text.find(self.comment_end, self.pos, end)
+		if close == -1:
+			self.__advance_to(end)
+			return False
+		self.__advance_to(close + len(self.comment_end))
+		self.in_comment = False
+		return True
+
+	def __unexpected_character(self) -> ValueError:
+		character = self.text[self.pos:self.pos + 1]
+		if self.binary:
+			character = bytes(character).decode('ascii', errors='replace')
+		column = self.pos - self.line_start + 1
+		return ValueError(f"Unexpected character: {character} (line {self.line}, column {column})")
+
+	def scan(self, end: int | None = None) -> Iterator[ScannedToken]:
+		text = self.text
+		end = len(text) if end is None else end
+		match_token = self.token_pattern.match
+		group_types = _GROUP_TYPES
+
+		while self.pos < end:
+			if self.in_comment and not self.__skip_comment(end):
+				return
+			match = match_token(text, self.pos, end)
+			if match is None:
+				# Trailing blanks, other whitespace characters, or something that is not a token
+				whitespace_end = self.whitespace_pattern.match(text, self.pos, end).end()
+				if whitespace_end == self.pos:
+					raise self.__unexpected_character()
+				self.__advance_to(whitespace_end)
+				continue
+			group = match.lastindex
+			token_type = group_types[group]
+			start, stop = match.span(group)
+			self.pos = stop
+			if token_type is None:
+				self.line += 1
+				self.line_start = stop
+			elif token_type is TokenType.COMMENT_MULTI_START:
+				self.in_comment = True
+			elif token_type is not TokenType.COMMENT_LINE:
+				yield (token_type, start, stop, self.line, start - self.line_start + 1)
@@ -0,0 +1,168 @@
+from array import array
+from mmap import mmap
+import struct
+import sys
+from typing import Iterator, List
+from modules.models.enums.keyword_patterns import KEYWORD_LOOKUP
+from modules.models.enums.token_type import TokenType
+from modules.models.lexer.Token import Token
+from modules.utils.interning import symbols
+
+# A token kind is stored as its index in the TokenType declaration order
+TOKEN_KINDS: List[TokenType] = list(TokenType)
+KIND_CODES: dict[TokenType, int] = {token_type: code for code, token_type in enumerate(TOKEN_KINDS)}
+KEYWORD_CODE = KIND_CODES[TokenType.KEYWORD]
+# Token kinds whose text is interned when it is read
+INTERNED_CODES = frozenset({KIND_CODES[TokenType.IDENTIFIER], KIND_CODES[TokenType.CONSTANT]})
+
+# Serialized layout: header, then the four columns back to back in little-endian order
+BUFFER_MAGIC = b'TKBF'
+BUFFER_FORMAT_VERSION = 1
+BUFFER_HEADER = struct.Struct('<4sHQ')
+
+
+class TokenView:
+	"""Lightweight stand-in for a Token that reads its fields lazily from a TokenBuffer"""
+	__slots__ = ('buffer', 'index')
+
+	def __init__(self, buffer: "TokenBuffer", index: int):
+		self.buffer = buffer
+		self.index = index
+
+	@property
+	def type(self) -> TokenType:
+		return TOKEN_KINDS[self.buffer.kinds[self.index]]
+
+	@property
+	def value(self) -> str:
+		return self.buffer.value(self.index)
+
+	@property
+	def lineNumber(self) -> int:
+		return self.buffer.lines[self.index]
+
+	@property
+	def column(self) -> int:
+		return self.buffer.column(self.index)
+
+	def __repr__(self) -> str:
+		return f"TokenView(type={self.type}, lineNumber={self.lineNumber}, value={self.value!r})"
+
+
+class TokenBuffer:
+	"""
+	Struct-of-arrays token storage. Every token is four array entries (kind code, start offset,
+	length and line) instead of a Token model, and its text is only sliced out of the source
+	when something asks for it. The source is a str, or ASCII bytes / an mmap in which case
+	text is decoded on access.
+	"""
+	source: str | bytes | mmap
+	kinds: array
+	starts: array
+	lengths: array
+	lines: array
+
+	def __init__(self, source):
+		self.source = source
+		self.binary = not isinstance(source, str)
+		self.kinds = array('B')
+		self.starts = array('Q')
+		self.lengths = array('I')
+		self.lines = array('I')
+
+	def append(self, kind: int, start: int, length: int, line: int):
+		self.kinds.append(kind)
+		self.starts.append(start)
+		self.lengths.append(length)
+		self.lines.append(line)
+
+	def __len__(self) -> int:
+		return len(self.kinds)
+
+	def __getitem__(self, index: int) -> TokenView:
+		if index < 0:
+			index += len(self.kinds)
+		if not 0 <= index < len(self.kinds):
+			raise IndexError("TokenBuffer index out of range")
+		return TokenView(self, index)
+
+	def __iter__(self) -> Iterator[TokenView]:
+		for index in range(len(self.kinds)):
+			yield TokenView(self, index)
+
+	def kind(self, index: int) -> TokenType:
+		return TOKEN_KINDS[self.kinds[index]]
+
+	def text(self, index: int) -> str:
+		start = self.starts[index]
+		text = self.source[start:start + self.lengths[index]]
+		return text.decode('ascii') if self.binary else text
+
+	def value(self, index: int) -> str:
+		"""Token value as the lexer reports it, keywords use their KeyWordPatterns name and names are interned"""
+		text = self.text(index)
+		kind = self.kinds[index]
+		if kind == KEYWORD_CODE:
+			return KEYWORD_LOOKUP[text].name
+		if kind in INTERNED_CODES:
+			return symbols.intern(text)
+		return text
+
+	def column(self, index: int) -> int:
+		start = self.starts[index]
+		return start - self.source.rfind(b'\n' if self.binary else '\n', 0, start)
+
+	def token(self, index: int) -> Token:
+		return Token(type=self.kind(index), lineNumber=self.lines[index], value=self.value(index), column=self.column(index))
+
+	def slice(self, start: int, end: int) -> "TokenBuffer":
+		"""Tokens `start` to `end` over just the part of the source they span, keeping their line numbers"""
+		if start >= end:
+			return TokenBuffer(self.source[0:0])
+		base = self.starts[start]
+		stop = self.starts[end - 1] + self.lengths[end - 1]
+		buffer = TokenBuffer(self.source[base:stop])
+		buffer.kinds = self.kinds[start:end]
+		buffer.starts = array('Q', [offset - base for offset in self.starts[start:end]])
+		buffer.lengths = self.lengths[start:end]
+		buffer.lines = self.lines[start:end]
+		return buffer
+
+	def close(self):
+		"""Release a memory-mapped source, tokens can no longer be read afterwards"""
+		if isinstance(self.source, mmap):
+			self.source.close()
+
+	def to_bytes(self) -> bytes:
+		"""Serialize the token columns, the source itself is not included"""
+		columns = (self.kinds, self.starts, self.lengths, self.lines)
+		if sys.byteorder == 'big':
+			columns = tuple(array(column.typecode, column) for column in columns)
+			for column in columns:
+				column.byteswap()
+		header = BUFFER_HEADER.pack(BUFFER_MAGIC, BUFFER_FORMAT_VERSION, len(self.kinds))
+		return b''.join([header, *(column.tobytes() for column in columns)])
+
+	@classmethod
+	def from_bytes(cls, source, data: bytes) -> "TokenBuffer":
+		"""Rebuild a buffer over `source` from the output of to_bytes"""
+		if len(data) < BUFFER_HEADER.size:
+			raise ValueError("Serialized TokenBuffer is truncated")
+		magic, version, count = BUFFER_HEADER.unpack_from(data)
+		if magic != BUFFER_MAGIC or version != BUFFER_FORMAT_VERSION:
+			raise ValueError("Not a serialized TokenBuffer or unsupported format version")
+		buffer = cls(source)
+		view = memoryview(data)
+		offset = BUFFER_HEADER.size
+		for column in (buffer.kinds, buffer.starts, buffer.lengths, buffer.lines):
+			size = count * column.itemsize
+			if offset + size > len(data):
+				raise ValueError("Serialized TokenBuffer is truncated")
+			column.frombytes(view[offset:offset + size])
+			offset += size
+			if sys.byteorder == 'big':
+				column.byteswap()
+		return buffer
+
+	def to_tokens(self) -> List[Token]:
+		return [self.token(index) for index in range(len(self.kinds))]
@@ -1,4 +1,4 @@
 from .token_type import TokenType 
-from .keyword_patterns import KeyWordPatterns
+from .keyword_patterns import KeyWordPatterns, KEYWORD_LOOKUP, BINARY_KEYWORD_LOOKUP, KEYWORD_NAMES
 
-__all__ = ['TokenType', 'KeyWordPatterns']
\ No newline at end of file
+__all__ = ['TokenType', 'KeyWordPatterns', 'KEYWORD_LOOKUP', 'BINARY_KEYWORD_LOOKUP', 'KEYWORD_NAMES']
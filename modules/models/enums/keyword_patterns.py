@@ -1,4 +1,6 @@
 from enum import Enum
+from types import MappingProxyType
+from typing import Mapping
 
 class KeyWordPatterns(Enum):
     RETURN = r'return\b'
@@ -6,4 +8,18 @@ class KeyWordPatterns(Enum):
     ELSE = r'else\b'
     WHILE = r'while\b'
     FOR = r'for\b'
-    VOID = r'void\b'
\ No newline at end of file
+    VOID = r'void\b'
+
+# Built once at import so keyword checks are a single dictionary lookup.
+# KEYWORD_LOOKUP maps identifier source text ("return") to its keyword,
+# BINARY_KEYWORD_LOOKUP does the same for bytes input (b"return"),
+# KEYWORD_NAMES maps a keyword token's value ("RETURN") back to its keyword.
+KEYWORD_LOOKUP: Mapping[str, KeyWordPatterns] = MappingProxyType(
+    {keyword.value.removesuffix(r'\b'): keyword for keyword in KeyWordPatterns}
+)
+BINARY_KEYWORD_LOOKUP: Mapping[bytes, KeyWordPatterns] = MappingProxyType(
+    {text.encode('ascii'): keyword for text, keyword in KEYWORD_LOOKUP.items()}
+)
+KEYWORD_NAMES: Mapping[str, KeyWordPatterns] = MappingProxyType(
+    {keyword.name: keyword for keyword in KeyWordPatterns}
+)
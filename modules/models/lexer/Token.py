@@ -5,4 +5,5 @@ from pydantic import BaseModel
 class Token(BaseModel):
 	type: TokenType
 	lineNumber: int
-	value: str
\ No newline at end of file
+	value: str
+	column: int = 0
\ No newline at end of file
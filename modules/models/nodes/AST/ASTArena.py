@@ -0,0 +1,412 @@
+"""
+Flat, arena-backed AST storage.
+
+An ASTArena keeps whole trees in three parallel arrays instead of one object per node: a kind
+code, the index just past the node's subtree, and a payload index into `values` for fields that
+are not nodes (constant text, function names). Nodes are stored in pre-order, so a node's first
+child directly follows it and each next child starts where the previous child's subtree ends.
+That is 9 bytes per node, the arrays pickle as a few byte strings, and building or reading the
+arena never recurses, so nesting depth does not matter.
+
+to_bytes/from_bytes give a versioned binary form for caching parsed programs: a header, the
+three columns and the roots back to back in little-endian order, then the payload values with a
+one byte tag each (see VALUE_TAGS). Tokens kept in payloads, such as parameter tokens, come back
+as Token models.
+
+Nodes are read through NodeViews. A view has the node class's field names as properties, reports
+the node class as its __class__ so isinstance checks still work, and shares the class's accept
+method, so existing visitors such as ASTLowerer walk an arena exactly like a tree.
+"""
+from array import array
+import struct
+import sys
+import types
+from typing import Any, Dict, Iterator, List, Tuple, Union, get_args, get_origin, get_type_hints
+
+from modules.models.nodes.AST.Expressions import ExpressionStatementNode
+from modules.models.nodes.AST.Functions.FunctionDefinition import FunctionDefinitionNode
+from modules.models.nodes.AST.Functions.LazyBody import LazyBody
+from modules.models.nodes.AST.Operands.BinaryOperators import BinaryAdd, BinaryDivide, BinaryMinus, BinaryModulus, BinaryMultiply, LogicalAnd, LogicalOr
+from modules.models.nodes.AST.Operands.BitwiseOperators import BitwiseAnd, BitwiseLeftShift, BitwiseOr, BitwiseRightShift, BitwiseXor
+from modules.models.nodes.AST.Operands.ConstantInteger import ConstantInteger
+from modules.models.nodes.AST.Operands.RelationalOperators import EqualRelation, GreaterThanEqualRelation, GreaterThanRelation, LessThanEqualRelation, LessThanRelation, NotEqualRelation
+from modules.models.nodes.AST.Operands.UnaryOperators import BitwiseNot, LogicalNot, Negate
+from modules.models.nodes.AST.ProgramNode import ProgramNode
+from modules.models.nodes.AST.Statements.ReturnStatementNode import ReturnStatementNode
+from modules.lexer.models.TokenBuffer import KIND_CODES as TOKEN_CODES, TOKEN_KINDS, TokenView
+from modules.models.lexer.Token import Token
+from modules.models.nodes.BaseNode import BaseNode
+from modules.utils.interning import symbols
+
+# A node kind is stored as its index here. Only append to this list, the codes are part of serialized arenas.
+NODE_KINDS: List[type] = [
+	ProgramNode, FunctionDefinitionNode, ReturnStatementNode, ExpressionStatementNode, ConstantInteger,
+	BinaryAdd, BinaryMinus, BinaryMultiply, BinaryDivide, BinaryModulus, LogicalOr, LogicalAnd,
+	BitwiseAnd, BitwiseOr, BitwiseXor, BitwiseLeftShift, BitwiseRightShift,
+	EqualRelation, NotEqualRelation, LessThanRelation, LessThanEqualRelation, GreaterThanRelation, GreaterThanEqualRelation,
+	Negate, BitwiseNot, LogicalNot,
+]
+KIND_CODES: Dict[type, int] = {node: code for code, node in enumerate(NODE_KINDS)}
+
+NO_NODE = -1
+# Kind code of the placeholder stored for an optional child that is None
+NONE_CODE = 255
+CHILD, CHILDREN, VALUE = range(3)
+
+# Serialized layout, bump ARENA_FORMAT_VERSION whenever the encoding or NODE_KINDS changes meaning
+ARENA_MAGIC = b'ASTA'
+ARENA_FORMAT_VERSION = 1
+ARENA_HEADER = struct.Struct('<4sHIII')
+NONE_TAG, STR_TAG, INT_TAG, TUPLE_TAG, LIST_TAG, TOKEN_TAG = range(6)
+VALUE_TAGS = {type(None): NONE_TAG, str: STR_TAG, int: INT_TAG, tuple: TUPLE_TAG, list: LIST_TAG, Token: TOKEN_TAG, TokenView: TOKEN_TAG}
+LENGTH = struct.Struct('<I')
+INTEGER = struct.Struct('<q')
+TOKEN = struct.Struct('<BII')
+
+
+def _encode_value(value: Any, out: bytearray):
+	tag = VALUE_TAGS.get(type(value))
+	if tag is None:
+		raise TypeError(f"Cannot serialize AST payload of type {type(value).__name__}")
+	out.append(tag)
+	if tag == STR_TAG:
+		text = value.encode('utf-8', 'surrogatepass')
+		out += LENGTH.pack(len(text))
+		out += text
+	elif tag == INT_TAG:
+		out += INTEGER.pack(value)
+	elif tag == TUPLE_TAG or tag == LIST_TAG:
+		out += LENGTH.pack(len(value))
+		for item in value:
+			_encode_value(item, out)
+	elif tag == TOKEN_TAG:
+		out += TOKEN.pack(TOKEN_CODES[value.type], value.lineNumber, value.column)
+		_encode_value(value.value, out)
+
+
+def _decode_value(data: memoryview, offset: int) -> Tuple[Any, int]:
+	tag = data[offset]
+	offset += 1
+	if tag == NONE_TAG:
+		return None, offset
+	if tag == STR_TAG:
+		(length,) = LENGTH.unpack_from(data, offset)
+		offset += LENGTH.size
+		return symbols.intern(bytes(data[offset:offset + length]).decode('utf-8', 'surrogatepass')), offset + length
+	if tag == INT_TAG:
+		return INTEGER.unpack_from(data, offset)[0], offset + INTEGER.size
+	if tag == TUPLE_TAG or tag == LIST_TAG:
+		(count,) = LENGTH.unpack_from(data, offset)
+		offset += LENGTH.size
+		items = []
+		for _ in range(count):
+			item, offset = _decode_value(data, offset)
+			items.append(item)
+		return (tuple(items) if tag == TUPLE_TAG else items), offset
+	if tag == TOKEN_TAG:
+		code, line, column = TOKEN.unpack_from(data, offset)
+		value, offset = _decode_value(data, offset + TOKEN.size)
+		return Token(type=TOKEN_KINDS[code], lineNumber=line, value=value, column=column), offset
+	raise ValueError(f"Unknown AST payload tag {tag}")
+
+
+def _is_node_type(annotation: Any) -> bool:
+	return isinstance(annotation, type) and issubclass(annotation, BaseNode)
+
+
+def _field_kind(annotation: Any) -> int:
+	"""CHILD for a (possibly optional) node, CHILDREN for a list of nodes, VALUE for anything else"""
+	if _is_node_type(annotation):
+		return CHILD
+	origin = get_origin(annotation)
+	arguments = get_args(annotation)
+	if (origin is Union or origin is types.UnionType) and len(arguments) == 2 and type(None) in arguments:
+		return CHILD if any(_is_node_type(argument) for argument in arguments) else VALUE
+	if origin is list and arguments and _is_node_type(arguments[0]):
+		return CHILDREN
+	return VALUE
+
+
+class NodeLayout:
+	"""How one node class is spread over the arena: its child fields in link order, then its value fields"""
+	def __init__(self, node: type):
+		hints = get_type_hints(node)
+		self.node = node
+		self.fields = node._fields
+		kinds = {field: _field_kind(hints[field]) for field in self.fields}
+		self.children = [field for field in self.fields if kinds[field] == CHILD]
+		self.lists = [field for field in self.fields if kinds[field] == CHILDREN]
+		self.values = [field for field in self.fields if kinds[field] == VALUE]
+		if len(self.lists) > 1:
+			raise TypeError(f"{node.__name__} has more than one list of child nodes")
+
+
+LAYOUTS: Dict[type, NodeLayout] = {node: NodeLayout(node) for node in NODE_KINDS}
+
+
+class NodeView:
+	"""Cursor over one arena node. Subclassed per node kind, see VIEW_CLASSES."""
+	__slots__ = ('arena', 'index')
+	node: type
+
+	def __init__(self, arena: "ASTArena", index: int):
+		self.arena = arena
+		self.index = index
+
+	@property
+	def children(self) -> List["NodeView | None"]:
+		return [self.arena.view(child) for child in self.arena.child_indices(self.index)]
+
+	def to_node(self) -> BaseNode:
+		return self.arena.to_tree(self.index)
+
+	def __eq__(self, other: object) -> bool:
+		if isinstance(other, NodeView) and other.arena is self.arena:
+			return other.index == self.index
+		return self.to_node() == (other.to_node() if isinstance(other, NodeView) else other)
+
+	__hash__ = None  # type: ignore
+
+	def __reduce__(self):
+		# Views pickle as a reference into their arena, which pickle stores once however many views share it
+		return self.arena.view, (self.index,)
+
+	def __repr__(self) -> str:
+		return f"{self.node.__name__}View(index={self.index})"
+
+
+def _child_property(position: int):
+	def get(self):
+		arena = self.arena
+		child = self.index + 1
+		for _ in range(position):
+			child = arena.ends[child]
+		return arena.view(child)
+	return property(get)
+
+
+def _list_property(position: int):
+	def get(self):
+		arena = self.arena
+		ends = arena.ends
+		child = self.index + 1
+		for _ in range(position):
+			child = ends[child]
+		end = ends[self.index]
+		views = []
+		while child < end:
+			views.append(arena.view(child))
+			child = ends[child]
+		return views
+	return property(get)
+
+
+def _value_property(position: int, single: bool):
+	if single:
+		return property(lambda self: self.arena.values[self.arena.payloads[self.index]])
+	return property(lambda self: self.arena.values[self.arena.payloads[self.index]][position])
+
+
+def _view_class(node: type) -> type:
+	layout = LAYOUTS[node]
+	namespace: Dict[str, Any] = {"__slots__": (), "node": node, "__class__": property(lambda self: node)}
+	for position, field in enumerate(layout.children):
+		namespace[field] = _child_property(position)
+	for field in layout.lists:
+		namespace[field] = _list_property(len(layout.children))
+	for position, field in enumerate(layout.values):
+		namespace[field] = _value_property(position, len(layout.values) == 1)
+	namespace["accept"] = node.accept
+	return type(f"{node.__name__}View", (NodeView,), namespace)
+
+
+VIEW_CLASSES: List[type] = [_view_class(node) for node in NODE_KINDS]
+
+
+class ASTArena:
+	"""Struct-of-arrays AST holding one or more trees, see the module docstring for the layout"""
+	kinds: array
+	ends: array
+	payloads: array
+	values: List[Any]
+	roots: List[int]
+
+	def __init__(self):
+		self.kinds = array('B')
+		self.ends = array('I')
+		self.payloads = array('i')
+		self.values = []
+		self.roots = []
+		self.__value_ids: Dict[Tuple[type, Any], int] = {}
+
+	def __len__(self) -> int:
+		return len(self.kinds)
+
+	def __value(self, value: Any) -> int:
+		# Equal hashable payloads are stored once, constants and names repeat a lot
+		key = (type(value), value)
+		try:
+			index = self.__value_ids.get(key)
+		except TypeError:
+			self.values.append(value)
+			return len(self.values) - 1
+		if index is None:
+			index = self.__value_ids[key] = len(self.values)
+			self.values.append(value)
+		return index
+
+	def append(self, tree: BaseNode) -> int:
+		"""Copy a tree of AST nodes (or NodeViews) into the arena and return the index of its root"""
+		kinds, ends, payloads = self.kinds, self.ends, self.payloads
+		root = len(kinds)
+		# Entries are nodes to store, or the index of a stored node whose subtree is complete
+		stack: List[Any] = [tree]
+		while stack:
+			node = stack.pop()
+			if type(node) is int:
+				ends[node] = len(kinds)
+				continue
+			index = len(kinds)
+			ends.append(0)
+			stack.append(index)
+			if node is None:
+				kinds.append(NONE_CODE)
+				payloads.append(NO_NODE)
+				continue
+			if isinstance(node, LazyBody):
+				node = node.node
+			node_type = node.node if isinstance(node, NodeView) else type(node)
+			code = KIND_CODES.get(node_type)
+			if code is None:
+				raise TypeError(f"{node_type.__name__} nodes cannot be stored in an ASTArena")
+			layout = LAYOUTS[node_type]
+			kinds.append(code)
+			if not layout.values:
+				payloads.append(NO_NODE)
+			elif len(layout.values) == 1:
+				payloads.append(self.__value(getattr(node, layout.values[0])))
+			else:
+				payloads.append(self.__value(tuple(getattr(node, field) for field in layout.values)))
+			children = [getattr(node, field) for field in layout.children]
+			for field in layout.lists:
+				children.extend(getattr(node, field))
+			children.reverse()
+			stack.extend(children)
+		self.roots.append(root)
+		return root
+
+	@classmethod
+	def from_tree(cls, tree: BaseNode) -> "ASTArena":
+		arena = cls()
+		arena.append(tree)
+		return arena
+
+	def view(self, index: int) -> NodeView | None:
+		code = self.kinds[index]
+		return None if code == NONE_CODE else VIEW_CLASSES[code](self, index)
+
+	def root(self) -> NodeView:
+		"""View of the first tree stored in the arena"""
+		return self.view(self.roots[0])
+
+	def __iter__(self) -> Iterator[NodeView]:
+		"""Views of the root of every tree stored in the arena, in the order they were appended"""
+		for root in self.roots:
+			yield self.view(root)
+
+	def kind(self, index: int) -> type | None:
+		code = self.kinds[index]
+		return None if code == NONE_CODE else NODE_KINDS[code]
+
+	def child_indices(self, index: int) -> List[int]:
+		ends = self.ends
+		children = []
+		child = index + 1
+		end = ends[index]
+		while child < end:
+			children.append(child)
+			child = ends[child]
+		return children
+
+	def to_tree(self, index: int | None = None) -> BaseNode:
+		"""Rebuild the AST node objects under `index` (default: the first root), without recursion"""
+		index = self.roots[0] if index is None else index
+		kinds, ends, payloads, values = self.kinds, self.ends, self.payloads, self.values
+		# Building the subtree from its last index down always finds a node's children already built
+		built: Dict[int, Any] = {}
+		for node in range(ends[index] - 1, index - 1, -1):
+			code = kinds[node]
+			if code == NONE_CODE:
+				built[node] = None
+				continue
+			node_type = NODE_KINDS[code]
+			layout = LAYOUTS[node_type]
+			children = [built.pop(child) for child in self.child_indices(node)]
+			fields = dict(zip(layout.children, children))
+			for field in layout.lists:
+				fields[field] = children[len(layout.children):]
+			if len(layout.values) == 1:
+				fields[layout.values[0]] = values[payloads[node]]
+			elif layout.values:
+				fields.update(zip(layout.values, values[payloads[node]]))
+			built[node] = node_type(**fields)
+		return built[index]
+
+	def __index_values(self):
+		self.__value_ids = {}
+		for index, value in enumerate(self.values):
+			try:
+				self.__value_ids.setdefault((type(value), value), index)
+			except TypeError:
+				pass
+
+	def __getstate__(self):
+		return (self.kinds, self.ends, self.payloads, self.values, self.roots)
+
+	def __setstate__(self, state):
+		self.kinds, self.ends, self.payloads, self.values, self.roots = state
+		self.__index_values()
+
+	def to_bytes(self) -> bytes:
+		"""Serialize the arena, see the module docstring for the layout"""
+		roots = array('I', self.roots)
+		columns = (self.kinds, self.ends, self.payloads, roots)
+		if sys.byteorder == 'big':
+			columns = tuple(array(column.typecode, column) for column in columns)
+			for column in columns:
+				column.byteswap()
+		values = bytearray()
+		for value in self.values:
+			_encode_value(value, values)
+		header = ARENA_HEADER.pack(ARENA_MAGIC, ARENA_FORMAT_VERSION, len(self.kinds), len(roots), len(self.values))
+		return b''.join([header, *(column.tobytes() for column in columns), values])
+
+	@classmethod
+	def from_bytes(cls, data: bytes) -> "ASTArena":
+		"""Rebuild an arena from the output of to_bytes"""
+		if len(data) < ARENA_HEADER.size:
+			raise ValueError("Serialized ASTArena is truncated")
+		magic, version, count, root_count, value_count = ARENA_HEADER.unpack_from(data)
+		if magic != ARENA_MAGIC or version != ARENA_FORMAT_VERSION:
+			raise ValueError("Not a serialized ASTArena or unsupported format version")
+		arena = cls()
+		roots = array('I')
+		view = memoryview(data)
+		offset = ARENA_HEADER.size
+		for column, length in ((arena.kinds, count), (arena.ends, count), (arena.payloads, count), (roots, root_count)):
+			size = length * column.itemsize
+			if offset + size > len(data):
+				raise ValueError("Serialized ASTArena is truncated")
+			column.frombytes(view[offset:offset + size])
+			offset += size
+			if sys.byteorder == 'big':
+				column.byteswap()
+		try:
+			for _ in range(value_count):
+				value, offset = _decode_value(view, offset)
+				arena.values.append(value)
+		except (struct.error, IndexError) as e:
+			raise ValueError("Serialized ASTArena is truncated") from e
+		arena.roots = roots.tolist()
+		arena.__index_values()
+		return arena
@@ -1,8 +1,11 @@
+from dataclasses import dataclass
 
+from modules.models.nodes.ASTNode import ASTNode
 from modules.models.nodes.BaseNode import BaseNode, VisitorModel
 
 
-class ExpressionStatementNode(BaseNode):
+@dataclass(slots=True, kw_only=True)
+class ExpressionStatementNode(ASTNode):
     expression: BaseNode
     def accept(self, visitor: VisitorModel, instructions: list[BaseNode]) -> BaseNode:
         return visitor.visit_expression_statement(self, instructions)
\ No newline at end of file
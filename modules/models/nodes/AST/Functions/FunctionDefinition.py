@@ -1,9 +1,12 @@
-from typing import List
+from dataclasses import dataclass
+from typing import Any, List, Tuple
+from modules.models.nodes.ASTNode import ASTNode
 from modules.models.nodes.BaseNode import BaseNode, VisitorModel
 
-class FunctionDefinitionNode(BaseNode):
+@dataclass(slots=True, kw_only=True)
+class FunctionDefinitionNode(ASTNode):
 	name: str
-	params: List[BaseNode]
+	params: List[Tuple[Any, Any]] # (type token, name token) pairs
 	body: BaseNode
  
 	def accept(self, visitor: VisitorModel, instructions: List[BaseNode])->BaseNode:
@@ -0,0 +1,49 @@
+from typing import Any, Callable, List
+from modules.models.nodes.ASTNode import ASTNode
+from modules.models.nodes.BaseNode import BaseNode, VisitorModel
+
+def _parsed(node: BaseNode) -> BaseNode:
+	"""Unpickles a LazyBody as the body it parsed to"""
+	return node
+
+class LazyBody(ASTNode):
+	"""
+	Function body recorded as a token range and parsed the first time something needs it, through
+	`node` or a visitor calling accept. The parsed body is cached. Syntax errors inside the body
+	are only raised at that point.
+	"""
+	__slots__ = ('start', 'end', '_parse', '_node')
+
+	def __init__(self, parse: Callable[[int, int], BaseNode], start: int, end: int):
+		self._parse = parse
+		self.start = start
+		self.end = end
+		self._node = None
+
+	@property
+	def parsed(self) -> bool:
+		return self._node is not None
+
+	@property
+	def node(self) -> BaseNode:
+		if self._node is None:
+			self._node = self._parse(self.start, self.end)
+			self._parse = None
+		return self._node
+
+	def accept(self, visitor: VisitorModel, instructions: List[Any]) -> BaseNode:
+		return self.node.accept(visitor, instructions)
+
+	def __eq__(self, other: object) -> bool:
+		return self.node == (other.node if isinstance(other, LazyBody) else other)
+
+	__hash__ = None  # type: ignore
+
+	def __reduce__(self):
+		# The parse callback holds the whole token stream, so pickle the parsed body instead
+		return _parsed, (self.node,)
+
+	def __repr__(self) -> str:
+		if self._node is None:
+			return f"LazyBody(tokens={self.start}..{self.end})"
+		return repr(self._node)
@@ -1 +1,2 @@
-from . import FunctionDefinition
\ No newline at end of file
+from . import FunctionDefinition
+from . import LazyBody
\ No newline at end of file
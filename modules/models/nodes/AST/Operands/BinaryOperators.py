@@ -1,45 +1,53 @@
+from dataclasses import dataclass
 
 from typing import Any, List
 from modules.models.nodes.AST.Operands.ExpressionNode import BinaryNode
 from modules.models.nodes.BaseNode import BaseNode, VisitorModel
 
 
+@dataclass(slots=True, kw_only=True)
 class BinaryMinus(BinaryNode):
 	left: BaseNode
 	right: BaseNode
 	def accept(self, visitor: VisitorModel, instructions:List[Any]) -> BaseNode:
 		return visitor.visit_binary_expression(self, instructions)
 
+@dataclass(slots=True, kw_only=True)
 class BinaryAdd(BinaryNode):
 	left: BaseNode
 	right: BaseNode
 	def accept(self, visitor: VisitorModel, instructions:List[Any]) -> BaseNode:
 		return visitor.visit_binary_expression(self, instructions)
 
+@dataclass(slots=True, kw_only=True)
 class BinaryMultiply(BinaryNode):
 	left: BaseNode
 	right: BaseNode
 	def accept(self, visitor: VisitorModel, instructions:List[Any]) -> BaseNode:
 		return visitor.visit_binary_expression(self, instructions)
 
+@dataclass(slots=True, kw_only=True)
 class BinaryDivide(BinaryNode):
 	left: BaseNode
 	right: BaseNode
 	def accept(self, visitor: VisitorModel, instructions:List[Any]) -> BaseNode:
 		return visitor.visit_binary_expression(self, instructions)
 
+@dataclass(slots=True, kw_only=True)
 class BinaryModulus(BinaryNode):
 	left: BaseNode
 	right: BaseNode
 	def accept(self, visitor: VisitorModel, instructions:List[Any]) -> BaseNode:
 		return visitor.visit_binary_expression(self, instructions)
 
+@dataclass(slots=True, kw_only=True)
 class LogicalOr(BinaryNode):
 	left: BaseNode
 	right: BaseNode
 	def accept(self, visitor: VisitorModel, instructions:List[Any]) -> BaseNode:
 		return visitor.visit_logical_or(self, instructions)
 
+@dataclass(slots=True, kw_only=True)
 class LogicalAnd(BinaryNode):
 	left: BaseNode
 	right: BaseNode
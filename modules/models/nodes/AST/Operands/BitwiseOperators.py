@@ -1,33 +1,39 @@
+from dataclasses import dataclass
 
 from typing import Any, List
 from modules.models.nodes.AST.Operands.ExpressionNode import BinaryNode
 from modules.models.nodes.BaseNode import BaseNode, VisitorModel
 
 
+@dataclass(slots=True, kw_only=True)
 class BitwiseAnd(BinaryNode):
 	left: BaseNode
 	right: BaseNode
 	def accept(self, visitor: VisitorModel, instructions:List[Any]) -> BaseNode:
 		return visitor.visit_bitwise_expression(self, instructions)
 
+@dataclass(slots=True, kw_only=True)
 class BitwiseOr(BinaryNode):
 	left: BaseNode
 	right: BaseNode
 	def accept(self, visitor: VisitorModel, instructions:List[Any]) -> BaseNode:
 		return visitor.visit_bitwise_expression(self, instructions)
 
+@dataclass(slots=True, kw_only=True)
 class BitwiseXor(BinaryNode):
 	left: BaseNode
 	right: BaseNode
 	def accept(self, visitor: VisitorModel, instructions:List[Any]) -> BaseNode:
 		return visitor.visit_bitwise_expression(self, instructions)
 
+@dataclass(slots=True, kw_only=True)
 class BitwiseLeftShift(BinaryNode):
 	left: BaseNode
 	right: BaseNode
 	def accept(self, visitor: VisitorModel, instructions:List[Any]) -> BaseNode:
 		return visitor.visit_bitwise_expression(self, instructions)
 
+@dataclass(slots=True, kw_only=True)
 class BitwiseRightShift(BinaryNode):
 	left: BaseNode
 	right: BaseNode
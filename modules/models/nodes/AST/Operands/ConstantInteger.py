@@ -1,7 +1,9 @@
+from dataclasses import dataclass
 from typing import Any, List
 from modules.models.nodes.AST.Operands.ExpressionNode import ExpressionNode
 from modules.models.nodes.BaseNode import BaseNode, Operand, VisitorModel
 
+@dataclass(slots=True, kw_only=True)
 class ConstantInteger(ExpressionNode):
 	value: str
 	def accept(self, visitor: VisitorModel, instructions:List[Any]) -> BaseNode:
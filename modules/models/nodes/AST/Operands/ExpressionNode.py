@@ -1,11 +1,19 @@
+from dataclasses import dataclass
+from modules.models.nodes.ASTNode import ASTNode
 from modules.models.nodes.BaseNode import BaseNode
 
-class ExpressionNode(BaseNode):
+@dataclass(kw_only=True)
+class ExpressionNode(ASTNode):
+	__slots__ = ()
 	value: str
 
-class UnaryNode(BaseNode):
+@dataclass(kw_only=True)
+class UnaryNode(ASTNode):
+	__slots__ = ()
 	operand: BaseNode
 
-class BinaryNode(BaseNode):
+@dataclass(kw_only=True)
+class BinaryNode(ASTNode):
+	__slots__ = ()
 	left: BaseNode
 	right: BaseNode
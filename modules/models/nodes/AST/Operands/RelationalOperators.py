@@ -1,38 +1,45 @@
+from dataclasses import dataclass
 
 from typing import Any, List
 from modules.models.nodes.AST.Operands.ExpressionNode import BinaryNode
 from modules.models.nodes.BaseNode import BaseNode, VisitorModel
 
+@dataclass(slots=True, kw_only=True)
 class EqualRelation(BinaryNode):
 	left: BaseNode
 	right: BaseNode
 	def accept(self, visitor: VisitorModel, instructions:List[Any]) -> BaseNode:
 		return visitor.visit_conditional_expression(self, instructions)
 
+@dataclass(slots=True, kw_only=True)
 class NotEqualRelation(BinaryNode):
 	left: BaseNode
 	right: BaseNode
 	def accept(self, visitor: VisitorModel, instructions:List[Any]) -> BaseNode:
 		return visitor.visit_conditional_expression(self, instructions)
 
+@dataclass(slots=True, kw_only=True)
 class LessThanRelation(BinaryNode):
 	left: BaseNode
 	right: BaseNode
 	def accept(self, visitor: VisitorModel, instructions:List[Any]) -> BaseNode:
 		return visitor.visit_conditional_expression(self, instructions)
 
+@dataclass(slots=True, kw_only=True)
 class LessThanEqualRelation(BinaryNode):
 	left: BaseNode
 	right: BaseNode
 	def accept(self, visitor: VisitorModel, instructions:List[Any]) -> BaseNode:
 		return visitor.visit_conditional_expression(self, instructions)
 
+@dataclass(slots=True, kw_only=True)
 class GreaterThanRelation(BinaryNode):
 	left: BaseNode
 	right: BaseNode
 	def accept(self, visitor: VisitorModel, instructions:List[Any]) -> BaseNode:
 		return visitor.visit_conditional_expression(self, instructions)
 
+@dataclass(slots=True, kw_only=True)
 class GreaterThanEqualRelation(BinaryNode):
 	left: BaseNode
 	right: BaseNode
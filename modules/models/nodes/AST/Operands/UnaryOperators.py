@@ -1,18 +1,22 @@
+from dataclasses import dataclass
 
 from typing import Any, List
 from modules.models.nodes.AST.Operands.ExpressionNode import UnaryNode
 from modules.models.nodes.BaseNode import BaseNode, VisitorModel
 
+@dataclass(slots=True, kw_only=True)
 class BitwiseNot(UnaryNode):
 	operand: BaseNode
 	def accept(self, visitor: VisitorModel, instructions:List[Any]) -> BaseNode:
 		return visitor.visit_bitwise_not(self, instructions)
 
+@dataclass(slots=True, kw_only=True)
 class LogicalNot(UnaryNode):
 	operand: BaseNode
 	def accept(self, visitor: VisitorModel, instructions:List[Any]) -> BaseNode:
 		return visitor.visit_logical_not(self, instructions)
 
+@dataclass(slots=True, kw_only=True)
 class Negate(UnaryNode):
 	operand: BaseNode
 	def accept(self, visitor: VisitorModel, instructions:List[Any]) -> BaseNode:
@@ -1,15 +1,14 @@
+from dataclasses import dataclass
 import random
 import string
 
-from modules.models.nodes import BaseNode
+from modules.models.nodes.ASTNode import ASTNode
 
-class Variable(BaseNode):
+@dataclass(slots=True, kw_only=True)
+class Variable(ASTNode):
 	name: str
 	def __init__(self, name: str | None = None):
-		if name is not None:
-			super().__init__(name=name) # type: ignore
-		else:
-			super().__init__(name="tmp." + self.generate_random_string(8)) # type: ignore
+		self.name = name if name is not None else "tmp." + self.generate_random_string(8)
 
 	def generate_random_string(self, length: int):
 		characters = string.ascii_letters + string.digits
@@ -1,9 +1,12 @@
+from dataclasses import dataclass
 from typing import Any, List
 
 from modules.models.nodes.AST.Functions.FunctionDefinition import FunctionDefinitionNode
+from modules.models.nodes.ASTNode import ASTNode
 from modules.models.nodes.BaseNode import BaseNode
 
-class ProgramNode(BaseNode):
+@dataclass(slots=True, kw_only=True)
+class ProgramNode(ASTNode):
 	functions: List[FunctionDefinitionNode]
 	def accept(self, visitor: Any, instructions:List[Any]) -> BaseNode:
 		pass
\ No newline at end of file
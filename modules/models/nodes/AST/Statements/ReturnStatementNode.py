@@ -1,9 +1,14 @@
+from dataclasses import dataclass
 from typing import Any, List
+from modules.models.nodes.ASTNode import ASTNode
 from modules.models.nodes.BaseNode import BaseNode, IRNode, VisitorModel
 
-class StatementNode(BaseNode):
+@dataclass(kw_only=True)
+class StatementNode(ASTNode):
+	__slots__ = ()
 	value: BaseNode
 
+@dataclass(slots=True, kw_only=True)
 class ReturnStatementNode(StatementNode):
 	instructions: list[BaseNode] | None = None
 	def accept(self, visitor: VisitorModel, instructions:List[Any]) -> IRNode:
@@ -0,0 +1,100 @@
+"""
+Lightweight base for AST nodes.
+
+The parser builds one node per operator and operand, so node construction sits on the hot path.
+Instead of pydantic models, AST classes are slotted dataclasses: every concrete node class is
+declared with `@dataclass(slots=True, kw_only=True)`, which gives it `__slots__`, a keyword-only
+`__init__` that only assigns, `__eq__` and `__repr__`. Abstract bases such as BinaryNode are plain
+`@dataclass(kw_only=True)` with an empty `__slots__`, so their fields get one slot each, in the
+concrete class. Field types are checked only when validation is switched on, with
+`set_ast_validation(True)` or by setting the CCOMPILER_VALIDATE_AST environment variable, which
+is meant for debugging the parser.
+"""
+import functools
+import os
+import types
+from dataclasses import fields
+from typing import Any, Dict, Tuple, Union, get_args, get_origin, get_type_hints
+
+from modules.models.nodes.BaseNode import BaseNode
+
+_validation = os.environ.get("CCOMPILER_VALIDATE_AST", "") not in ("", "0")
+# Resolved field annotations per node class, filled on first validation
+_HINTS: Dict[type, Dict[str, Any]] = {}
+
+
+def _matches(value: Any, annotation: Any) -> bool:
+	if annotation is Any:
+		return True
+	if annotation is None or annotation is type(None):
+		return value is None
+	origin = get_origin(annotation)
+	if origin is Union or origin is types.UnionType:
+		return any(_matches(value, option) for option in get_args(annotation))
+	if origin is list:
+		arguments = get_args(annotation)
+		return isinstance(value, list) and (not arguments or all(_matches(item, arguments[0]) for item in value))
+	if origin is not None:
+		return isinstance(value, origin)
+	if isinstance(annotation, type):
+		return isinstance(value, annotation)
+	return True
+
+
+def _validate(node: "ASTNode"):
+	cls = type(node)
+	hints = _HINTS.get(cls)
+	if hints is None:
+		hints = _HINTS[cls] = get_type_hints(cls)
+	for field in cls._fields:
+		value = getattr(node, field)
+		if not _matches(value, hints[field]):
+			raise TypeError(f"{cls.__name__}.{field} expects {hints[field]}, got {type(value).__name__}")
+
+
+def _checked(init):
+	@functools.wraps(init)
+	def __init__(self, *args, **kwargs):
+		init(self, *args, **kwargs)
+		_validate(self)
+	return __init__
+
+
+def _set_checked(cls: type, enabled: bool):
+	"""Wrap or unwrap the __init__ of a dataclass node class in the _validate hook"""
+	if "__dataclass_fields__" not in cls.__dict__ or "__init__" not in cls.__dict__:
+		return
+	init = cls.__dict__["__init__"]
+	checked = hasattr(init, "__wrapped__")
+	if enabled and not checked:
+		cls.__init__ = _checked(init)
+	elif checked and not enabled:
+		cls.__init__ = init.__wrapped__
+
+
+class ASTNode(BaseNode):
+	"""Base of the slotted dataclass AST nodes: construct with keyword arguments, one per field"""
+	__slots__ = ()
+	_fields: Tuple[str, ...]
+
+	def __init_subclass__(cls, **kwargs):
+		super().__init_subclass__(**kwargs)
+		# @dataclass(slots=True) builds a new class from the decorated one, which lands here with its fields
+		if "__dataclass_fields__" in cls.__dict__:
+			cls._fields = tuple(field.name for field in fields(cls))
+			_set_checked(cls, _validation)
+
+
+def set_ast_validation(enabled: bool):
+	"""Check field types on every AST node construction (slow, for debugging the parser)"""
+	global _validation
+	_validation = enabled
+	pending = ASTNode.__subclasses__()
+	while pending:
+		cls = pending.pop()
+		_set_checked(cls, enabled)
+		pending.extend(cls.__subclasses__())
+
+
+def ast_validation_enabled() -> bool:
+	return _validation
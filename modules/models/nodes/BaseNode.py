@@ -5,11 +5,14 @@ from typing_extensions import Self
 class VisitorModel:
     pass
 
-class BaseNode(BaseModel):
+class BaseNode:
+    """Visitor interface shared by the AST nodes (see ASTNode) and the pydantic IR nodes"""
+    __slots__ = ()
+
     def accept(self, visitor: VisitorModel, instructions: List[Any]) -> Self:
         raise NotImplementedError(f"No visitor method {self.__class__.__name__.lower()}")
     
-class IRNode(BaseNode):
+class IRNode(BaseNode, BaseModel):
     pass
 
 class IR_Expression(IRNode):
@@ -2,8 +2,8 @@ from typing import Any, List
 from modules.models.nodes.BaseNode import BaseNode, IRNode, VisitorModel
 
 class IRCopy(IRNode):
-	src: BaseNode 
-	dest: BaseNode
+	src: IRNode 
+	dest: IRNode
 
 	def accept(self, visitor: VisitorModel, instructions:List[Any]) -> BaseNode:
 		return visitor.visit_ir_copy(self, instructions)
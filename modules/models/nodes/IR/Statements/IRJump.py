@@ -7,13 +7,13 @@ class IRJump(IRNode):
 		return visitor.visit_ir_jump(self, instructions)
 
 class IRJumpIfZero(IRNode):
-	src: BaseNode
+	src: IRNode
 	label: str
 	def accept(self, visitor: VisitorModel, instructions:List[Any]) -> BaseNode:
 		return visitor.visit_ir_jump(self, instructions)
 
 class IRJumpIfNotZero(IRNode):
-	src: BaseNode
+	src: IRNode
 	label: str
 	def accept(self, visitor: VisitorModel, instructions:List[Any]) -> BaseNode:
 		return visitor.visit_ir_jump(self, instructions)
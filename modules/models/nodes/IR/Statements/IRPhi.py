@@ -0,0 +1,8 @@
+from typing import Dict
+from modules.models.nodes.BaseNode import IRNode
+
+
+class IRPhi(IRNode):
+	"""dest takes the operand of the predecessor block control arrived from, sources is keyed by that block's label. Only exists in SSA form, StaticSingleAssignment.destruct replaces it before legalization."""
+	dest: IRNode
+	sources: Dict[str, IRNode]
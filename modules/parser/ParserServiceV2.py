@@ -1,40 +1,157 @@
+from concurrent.futures import ProcessPoolExecutor
 from logging import Logger
-from typing import Callable, List
+import os
+from typing import Callable, Iterable, List, Tuple
+from modules.lexer.models.TokenBuffer import TokenBuffer
+from modules.models.nodes.AST.ASTArena import ASTArena
 from modules.models.nodes.AST.Functions.FunctionDefinition import FunctionDefinitionNode
 from modules.models.nodes.BaseNode import BaseNode 
 from modules.models.nodes.AST.ProgramNode import ProgramNode
 from modules.models.lexer.Token import Token
 from modules.models.enums.token_type import TokenType
+from modules.parser.Services.BufferedTokenIteratorService import BRACE_PATTERN, LBRACE_CODE, BufferedTokenIteratorService
 from modules.parser.Services.ExpressionParser import ExpressionParser
 from modules.parser.Services.FunctionParser import FunctionParser
 from modules.parser.Services.StatementParser import StatementParser
+from modules.parser.Services.StreamingTokenIteratorService import StreamingTokenIteratorService
 from modules.parser.Services.TokenIteratorService import TokenIteratorService
+from modules.utils.content_cache import DEFAULT_CACHE_SIZE, ContentCache
 from modules.utils.logger import get_logger
 
+# Below this many tokens per worker a process pool costs more than it saves
+MIN_PARALLEL_TOKENS = 20_000
+
+# Part of every AST cache key, bump it whenever a change to the parser changes the trees it builds
+PARSER_VERSION = "1"
+
+
+def split_declarations(buffer: TokenBuffer) -> List[int]:
+    """
+    Token indexes bounding the top-level declarations, found by brace matching over the kind
+    column: a declaration ends at the '}' that closes a brace opened at file scope. Starts with 0
+    and ends with len(buffer). Tokens after the last closing brace form the final range.
+    """
+    kinds = buffer.kinds
+    bounds = [0]
+    depth = 0
+    for brace in BRACE_PATTERN.finditer(kinds):
+        if kinds[brace.start()] == LBRACE_CODE:
+            depth += 1
+        elif depth:
+            depth -= 1
+            if not depth:
+                bounds.append(brace.end())
+    if bounds[-1] != len(kinds):
+        bounds.append(len(kinds))
+    return bounds
+
+
+def _parse_tokens_worker(source, data: bytes, iterative_expressions: bool) -> bytes:
+    """
+    Process pool entry point. Parses a serialized TokenBuffer slice holding whole top-level declarations
+    and returns the functions as the roots of one serialized ASTArena
+    """
+    buffer = TokenBuffer.from_bytes(source, data)
+    arena = ASTArena()
+    for function in ParserServiceV2(BufferedTokenIteratorService(), iterative_expressions).parse_lex(buffer).functions:
+        arena.append(function)
+    return arena.to_bytes()
+
+
 class ParserServiceV2():
     functions: List[FunctionDefinitionNode] = []
     expressionService: ExpressionParser
     expression_handlers: dict[TokenType, Callable[[], BaseNode]] = {}
     statement_handlers: dict[TokenType, Callable[[], BaseNode]] = {}
     token_iterator: TokenIteratorService
+    ast_cache: ContentCache | None
     _logger: Logger
     
-    def __init__(self):
-        self.token_iterator = TokenIteratorService()
-        self.expressionService = ExpressionParser(self.token_iterator)
+    def __init__(self, token_iterator: TokenIteratorService | None = None, iterative_expressions: bool = False, lazy_bodies: bool = False,
+                 cache_dir: str | None = None, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.token_iterator = token_iterator if token_iterator is not None else TokenIteratorService()
+        self.ast_cache = ContentCache(cache_dir, cache_size, suffix=".ast", name="AST cache") if cache_dir else None
+        self.expressionService = ExpressionParser(self.token_iterator, iterative_expressions)
         self.statementService = StatementParser(self.token_iterator, self.expressionService)
-        self.functionService = FunctionParser(self.token_iterator, self.expressionService, self.statementService)
+        self.functionService = FunctionParser(self.token_iterator, self.expressionService, self.statementService, lazy_bodies)
         self._logger = get_logger()
     
     ## Entry Point
     def parse_lex(self, lex_array: List[Token]) -> ProgramNode:
         self.token_iterator.lex_array = lex_array
         self.token_iterator.position = 0
+        return self.__parse_declarations()
+    
+    def parse_parallel(self, buffer: TokenBuffer, jobs: int | None = None, min_tokens: int = MIN_PARALLEL_TOKENS) -> ProgramNode:
+        """
+        Parse a TokenBuffer with its top-level declarations spread across a process pool. The buffer is
+        cut at declaration boundaries into one run of whole declarations per worker and the functions
+        are gathered back in source order, so the result is the same as parse_lex. Errors raised by a
+        worker are raised here, the first one in source order. Workers send their functions back as
+        ASTArenas and the program holds arena views, which lower exactly like parsed nodes. With lazy
+        bodies the parse is only a brace scan and is done here.
+        """
+        jobs = jobs or os.cpu_count() or 1
+        count = min(jobs, len(buffer) // max(min_tokens, 1))
+        if count < 2 or self.functionService.lazy_bodies:
+            return self.parse_lex(buffer) # type: ignore
+        ranges = self.__group_declarations(split_declarations(buffer), count)
+        if len(ranges) < 2:
+            return self.parse_lex(buffer) # type: ignore
+
+        self.functions = []
+        with ProcessPoolExecutor(max_workers=min(jobs, len(ranges))) as pool:
+            futures = []
+            for start, end in ranges:
+                part = buffer.slice(start, end)
+                futures.append(pool.submit(_parse_tokens_worker, part.source, part.to_bytes(), self.expressionService.iterative))
+            for future in futures:
+                self.functions.extend(ASTArena.from_bytes(future.result()))
+        self._logger.debug(f"Parsed {len(self.functions)} functions in {len(ranges)} parallel parts")
+        return ProgramNode(functions=self.functions)
+
+    def parse_cached(self, content: bytes, parse: Callable[[], ProgramNode]) -> ProgramNode:
+        """
+        Look the program up in the AST cache by a hash of `content` (the source bytes) and the parser
+        version. A hit is a view over the stored arena, reached without lexing or parsing. On a miss
+        `parse` builds the program, which is stored before it is returned.
+        """
+        if self.ast_cache is None:
+            return parse()
+        key = ContentCache.key(PARSER_VERSION, content)
+        data = self.ast_cache.get(key)
+        if data is not None:
+            try:
+                return ASTArena.from_bytes(data).root() # type: ignore
+            except ValueError as e:
+                self._logger.warning(f"Ignoring unreadable AST cache entry {key[:12]}: {e}")
+        program = parse()
+        self.ast_cache.put(key, ASTArena.from_tree(program).to_bytes())
+        return program
+
+    def __group_declarations(self, bounds: List[int], count: int) -> List[Tuple[int, int]]:
+        """Merge consecutive declarations into at most `count` token ranges of similar size"""
+        total = bounds[-1]
+        ranges = []
+        start = 0
+        for end in bounds[1:]:
+            if end - start >= total // count or end == total:
+                ranges.append((start, end))
+                start = end
+        return ranges
+
+    def parse_stream(self, tokens: Iterable[Token]) -> ProgramNode:
+        """Parse tokens pulled lazily from an iterator, such as LexerService.iter_tokens"""
+        if not isinstance(self.token_iterator, StreamingTokenIteratorService):
+            raise TypeError("parse_stream requires a StreamingTokenIteratorService")
+        self.token_iterator.reset(tokens)
+        return self.__parse_declarations()
+    
+    def __parse_declarations(self) -> ProgramNode:
         self.functions = []
-        while self.token_iterator.position < len(self.token_iterator.lex_array):
+        while not self.token_iterator.at_end():
             self._logger.debug(f"Parsing function at position {self.token_iterator.position}, line: {self.token_iterator.current().lineNumber}")
             result = self.functionService.parse_declaration()
             if result:
                 self.functions.append(result)
         return ProgramNode(functions=self.functions)
-    
\ No newline at end of file
@@ -0,0 +1,70 @@
+import re
+from typing import Tuple
+from modules.lexer.models.TokenBuffer import KIND_CODES, TOKEN_KINDS, TokenBuffer, TokenView
+from modules.models.enums.token_type import TokenType
+from modules.models.lexer.Token import Token
+from modules.parser.Services.TokenIteratorService import TokenIteratorService
+
+LBRACE_CODE = KIND_CODES[TokenType.LBRACE]
+BRACE_PATTERN = re.compile(b'[' + re.escape(bytes([LBRACE_CODE])) + re.escape(bytes([KIND_CODES[TokenType.RBRACE]])) + b']')
+
+
+class BufferedTokenIteratorService(TokenIteratorService):
+    """
+    Token iterator over a TokenBuffer. Type checks read the kind column directly,
+    and tokens handed to the parsers are TokenViews that only slice their text on demand.
+    """
+    buffer: TokenBuffer
+
+    def __init__(self, buffer: TokenBuffer | None = None):
+        self.buffer = buffer if buffer is not None else TokenBuffer("")
+        self.position = 0
+
+    @property
+    def lex_array(self) -> TokenBuffer:
+        return self.buffer
+
+    @lex_array.setter
+    def lex_array(self, buffer: TokenBuffer):
+        self.buffer = buffer
+
+    def at_end(self) -> bool:
+        return self.position >= len(self.buffer.kinds)
+
+    def has_tokens_ahead(self, count: int) -> bool:
+        return self.position + count < len(self.buffer.kinds)
+
+    def current(self) -> Token | TokenView:
+        if self.position < len(self.buffer.kinds):
+            return TokenView(self.buffer, self.position)
+        return Token(type=TokenType.EOF, lineNumber=-1, value="")
+
+    def peek_type(self) -> TokenType:
+        if self.position < len(self.buffer.kinds):
+            return TOKEN_KINDS[self.buffer.kinds[self.position]]
+        return TokenType.EOF
+
+    def check(self, *token_type: TokenType) -> bool:
+        if self.position >= len(self.buffer.kinds):
+            return False
+        return TOKEN_KINDS[self.buffer.kinds[self.position]] in token_type
+
+    def match(self, *types: TokenType) -> bool:
+        if self.check(*types):
+            self.position += 1
+            return True
+        return False
+
+    def skip_block(self) -> Tuple[int, int]:
+        # Only the braces are visited, found by a regex search over the kind column
+        start = self.position
+        self.consume(TokenType.LBRACE, "Expected '{' at start of block")
+        kinds = self.buffer.kinds
+        depth = 1
+        for brace in BRACE_PATTERN.finditer(kinds, self.position):
+            depth += 1 if kinds[brace.start()] == LBRACE_CODE else -1
+            if not depth:
+                self.position = brace.end()
+                return start, self.position
+        self.position = len(kinds)
+        raise SyntaxError("Expected '}' at end of block. Got: EOF")
\ No newline at end of file
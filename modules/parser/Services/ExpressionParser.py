@@ -1,151 +1,156 @@
+from typing import Any, Dict, List, Tuple, Type
 from modules.models.enums.token_type import TokenType
-from modules.models.nodes.AST.Operands.BinaryOperators import * 
+from modules.models.nodes.AST.Operands.BinaryOperators import *
 from modules.models.nodes.AST.Operands.BitwiseOperators import *
 from modules.models.nodes.AST.Operands.ConstantInteger import ConstantInteger
+from modules.models.nodes.AST.Operands.ExpressionNode import BinaryNode, UnaryNode
 from modules.models.nodes.AST.Operands.RelationalOperators import *
 from modules.models.nodes.AST.Operands.UnaryOperators import BitwiseNot, Negate
 from modules.models.nodes.BaseNode import BaseNode
 from modules.parser.Services.TokenIteratorService import TokenIteratorService
 
+LEFT = False
+RIGHT = True
+
+# Binary operators: token type -> (precedence, right associative, node class). Higher binds tighter.
+BINARY_OPERATORS: Dict[TokenType, Tuple[int, bool, Type[BinaryNode]]] = {
+    TokenType.LOGICAL_OR: (1, LEFT, LogicalOr),
+    TokenType.LOGICAL_AND: (2, LEFT, LogicalAnd),
+    TokenType.BITWISE_OR: (3, LEFT, BitwiseOr),
+    TokenType.BITWISE_XOR: (4, LEFT, BitwiseXor),
+    TokenType.BITWISE_AND: (5, LEFT, BitwiseAnd),
+    TokenType.EQ: (6, LEFT, EqualRelation),
+    TokenType.NEQ: (6, LEFT, NotEqualRelation),
+    TokenType.LT: (7, LEFT, LessThanRelation),
+    TokenType.LTE: (7, LEFT, LessThanEqualRelation),
+    TokenType.GT: (7, LEFT, GreaterThanRelation),
+    TokenType.GTE: (7, LEFT, GreaterThanEqualRelation),
+    TokenType.SHIFT_LEFT: (8, LEFT, BitwiseLeftShift),
+    TokenType.SHIFT_RIGHT: (8, LEFT, BitwiseRightShift),
+    TokenType.PLUS: (9, LEFT, BinaryAdd),
+    TokenType.MINUS: (9, LEFT, BinaryMinus),
+    TokenType.MULTIPLY: (10, LEFT, BinaryMultiply),
+    TokenType.DIVIDE: (10, LEFT, BinaryDivide),
+    TokenType.MODULUS: (10, LEFT, BinaryModulus),
+}
+
+# Prefix operators, all binding tighter than any binary operator
+UNARY_OPERATORS: Dict[TokenType, Type[UnaryNode]] = {
+    TokenType.MINUS: Negate,
+    TokenType.BITWISE_NOT: BitwiseNot,
+    TokenType.NOT: BitwiseNot,
+}
+
+LOWEST_PRECEDENCE = 1
+UNARY_PRECEDENCE = 11
+# Operator stack marker for an open parenthesis in the iterative parser
+OPEN_PARENTHESIS = (0, LEFT, None)
+
 
 class ExpressionParser:
+    """
+    Precedence-climbing expression parser driven by BINARY_OPERATORS and UNARY_OPERATORS.
+    New operators only need a table entry (and a node class with an accept method).
+
+    With `iterative` set, expressions are parsed shunting-yard style with explicit operand and
+    operator stacks instead. It builds the same tree, but its depth is not bounded by Python's
+    recursion limit, for machine-generated code nested thousands of levels deep.
+    """
     token_iterator: TokenIteratorService
-    
-    def __init__(self, token_iterator: TokenIteratorService):
+    iterative: bool
+
+    def __init__(self, token_iterator: TokenIteratorService, iterative: bool = False):
         self.token_iterator = token_iterator
+        self.iterative = iterative
 
-    def parse_expression(self) -> BaseNode:
-        return self.__parse_logical_or()
-    
-    def __parse_logical_or(self) -> BaseNode:
-        left = self.__parse_logical_and()
-        while self.token_iterator.match(TokenType.LOGICAL_OR):
-            right = self.__parse_logical_and()
-            left = LogicalOr(left=left, right=right)
-        return left  
-    
-    def __parse_logical_and(self) -> BaseNode:
-        left = self.__parse_bitwise_or()
-        while self.token_iterator.match(TokenType.LOGICAL_AND):
-            right = self.__parse_bitwise_or()
-            left = LogicalAnd(left=left, right=right)
-        return left 
-    
-    def __parse_bitwise_or(self) -> BaseNode:
-        left = self.__parse_bitwise_xor()
-        while self.token_iterator.match(TokenType.BITWISE_OR):
-            right = self.__parse_bitwise_xor()
-            left = BitwiseOr(left=left, right=right)
-        return left
-     
-    def __parse_bitwise_xor(self) -> BaseNode:
-        left = self.__parse_bitwise_and()
-        while self.token_iterator.match(TokenType.BITWISE_XOR):
-            right = self.__parse_bitwise_and()
-            left = BitwiseXor(left=left, right=right)
-        return left
-    
-    def __parse_bitwise_and(self) -> BaseNode:
-        left = self.__parse_relational_comparison()
-        while self.token_iterator.match(TokenType.BITWISE_AND):
-            right = self.__parse_relational_comparison()
-            left = BitwiseAnd(left=left, right=right)
-        return left
-    
-    def __parse_relational_comparison(self) -> BaseNode:
-        left = self.__parse_relational_lt_gt_comparison()
-        while self.token_iterator.match(TokenType.EQ, TokenType.NEQ):
-            operator = self.token_iterator.lookbehind()
-            right = self.__parse_relational_lt_gt_comparison()
-            if operator.type == TokenType.EQ:
-                left = EqualRelation(left=left, right=right)
-            elif operator.type == TokenType.NEQ:
-                left = NotEqualRelation(left=left, right=right)
-        return left
-    
-    def __parse_relational_lt_gt_comparison(self) -> BaseNode:
-        left = self.__parse_bitwise_shift()
-        while self.token_iterator.match(TokenType.LT, TokenType.LTE, TokenType.GT, TokenType.GTE):
-            operator = self.token_iterator.lookbehind()
-            right = self.__parse_bitwise_shift()
-            if operator.type == TokenType.LT:
-                left = LessThanRelation(left=left, right=right)
-            elif operator.type == TokenType.LTE:
-                left = LessThanEqualRelation(left=left, right=right)
-            elif operator.type == TokenType.GT:
-                left = GreaterThanRelation(left=left, right=right)
-            elif operator.type == TokenType.GTE:
-                left = GreaterThanEqualRelation(left=left, right=right)
-        return left
-    
-    def __parse_bitwise_shift(self) -> BaseNode:
-        left = self.__parse_additive()
-        while self.token_iterator.match(TokenType.SHIFT_LEFT, TokenType.SHIFT_RIGHT):
-            operator = self.token_iterator.lookbehind()
-            right = self.__parse_additive()
-            if operator.type == TokenType.SHIFT_LEFT:
-                left = BitwiseLeftShift(left=left, right=right)
-            elif operator.type == TokenType.SHIFT_RIGHT:
-                left = BitwiseRightShift(left=left, right=right)
-        return left
-        
-    def __parse_additive(self) -> BaseNode:
-        left = self.__parse_multiplicative()
-
-        while self.token_iterator.match(TokenType.PLUS, TokenType.MINUS):
-            operator = self.token_iterator.lookbehind()
-            right = self.__parse_multiplicative()
-            if operator.type == TokenType.PLUS:
-                left = BinaryAdd(left=left, right=right)
-            elif operator.type == TokenType.MINUS:
-                left = BinaryMinus(left=left, right=right)
-        return left
-    
-    def __parse_multiplicative(self) -> BaseNode:
-        left = self.__parse_unary()
+    def parse_expression(self, minimum_precedence: int = LOWEST_PRECEDENCE) -> BaseNode:
+        """Parse an expression whose binary operators all bind at least as tightly as `minimum_precedence`"""
+        if self.iterative:
+            return self.parse_expression_iterative(minimum_precedence)
+        return self.__parse_recursive(minimum_precedence)
+
+    def parse_expression_iterative(self, minimum_precedence: int = LOWEST_PRECEDENCE) -> BaseNode:
+        token_iterator = self.token_iterator
+        operands: List[BaseNode] = []
+        operators: List[Tuple[int, bool, Any]] = []
+        depth = 0
+        while True:
+            # Operand position: prefix operators and open parentheses, then a constant
+            while True:
+                token_type = token_iterator.peek_type()
+                if token_type == TokenType.CONSTANT:
+                    operands.append(ConstantInteger(value=token_iterator.advance().value))
+                    break
+                unary = UNARY_OPERATORS.get(token_type)
+                if unary is not None:
+                    token_iterator.advance()
+                    operators.append((UNARY_PRECEDENCE, RIGHT, unary))
+                elif token_type == TokenType.LPAREN:
+                    token_iterator.advance()
+                    operators.append(OPEN_PARENTHESIS)
+                    depth += 1
+                else:
+                    raise ValueError(f"Unhandled token type in primary: {token_iterator.current().type}")
+
+            # Operator position: close parentheses, then a binary operator or the end of the expression
+            while True:
+                token_type = token_iterator.peek_type()
+                if token_type == TokenType.RPAREN and depth:
+                    while operators[-1] is not OPEN_PARENTHESIS:
+                        self.__reduce(operands, operators.pop())
+                    operators.pop()
+                    depth -= 1
+                    token_iterator.advance()
+                    continue
+                operator = BINARY_OPERATORS.get(token_type)
+                if operator is None or (not depth and operator[0] < minimum_precedence):
+                    if depth:
+                        token_iterator.consume(TokenType.RPAREN, "Expected ')' after expression")
+                    while operators:
+                        self.__reduce(operands, operators.pop())
+                    return operands[-1]
+                precedence, right_associative, _ = operator
+                while operators and (operators[-1][0] > precedence or (operators[-1][0] == precedence and not right_associative)):
+                    self.__reduce(operands, operators.pop())
+                token_iterator.advance()
+                operators.append(operator)
+                break
 
-        while self.token_iterator.match(TokenType.MULTIPLY, TokenType.DIVIDE, TokenType.MODULUS):
-            operator = self.token_iterator.lookbehind()
-            right = self.__parse_unary()
-            if operator.type == TokenType.MULTIPLY:
-                left = BinaryMultiply(left=left, right=right)
-            elif operator.type == TokenType.DIVIDE:
-                left = BinaryDivide(left=left, right=right)
-            elif operator.type == TokenType.MODULUS:
-                left = BinaryModulus(left=left, right=right)
-                
-        return left
+    def __reduce(self, operands: List[BaseNode], operator: Tuple[int, bool, Any]):
+        precedence, _, node = operator
+        if precedence == UNARY_PRECEDENCE:
+            operands.append(node(operand=operands.pop()))
+        else:
+            right = operands.pop()
+            operands.append(node(left=operands.pop(), right=right))
+
+    def __parse_recursive(self, minimum_precedence: int) -> BaseNode:
+        token_iterator = self.token_iterator
+        left = self.__parse_unary()
+        while True:
+            operator = BINARY_OPERATORS.get(token_iterator.peek_type())
+            if operator is None or operator[0] < minimum_precedence:
+                return left
+            precedence, right_associative, node = operator
+            token_iterator.advance()
+            right = self.__parse_recursive(precedence if right_associative else precedence + 1)
+            left = node(left=left, right=right)
 
     def __parse_unary(self) -> BaseNode:
-        if self.token_iterator.match(TokenType.MINUS):
-            operator = self.token_iterator.lookbehind()
-            return Negate(operand=self.__parse_unary())
-        if self.token_iterator.match(TokenType.BITWISE_NOT):
-            operator = self.token_iterator.lookbehind()
-            return BitwiseNot(operand=self.__parse_unary())
-        if self.token_iterator.match(TokenType.NOT):
-            operator = self.token_iterator.lookbehind()
-            return BitwiseNot(operand=self.__parse_unary())
+        token_type = self.token_iterator.peek_type()
+        if token_type == TokenType.CONSTANT:
+            return ConstantInteger(value=self.token_iterator.advance().value)
+        unary = UNARY_OPERATORS.get(token_type)
+        if unary is not None:
+            self.token_iterator.advance()
+            return unary(operand=self.__parse_unary())
         return self.__parse_primary()
 
     def __parse_primary(self) -> BaseNode:
-        if self.token_iterator.match(TokenType.CONSTANT):
-            return self.__handle_constant()
         if self.token_iterator.match(TokenType.LPAREN):
-            st = self.__handle_parentheses()
+            expression = self.parse_expression()
             self.token_iterator.consume(TokenType.RPAREN, "Expected ')' after expression")
-            return st
-        
+            return expression
+
         current = self.token_iterator.current()
         raise ValueError(f"Unhandled token type in primary: {current.type}")
-    
-    def __handle_parentheses(self) -> BaseNode:
-        # Placeholder implementation
-        expr = self.parse_expression()
-        return expr
-    
-    def __handle_constant(self) -> BaseNode:
-        # Placeholder implementation
-        token = self.token_iterator.lookbehind()
-        return ConstantInteger(value=token.value)
-    
\ No newline at end of file
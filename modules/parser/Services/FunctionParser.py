@@ -1,22 +1,45 @@
+from functools import partial
 from typing import Callable, List
+from modules.lexer.models.TokenBuffer import TokenBuffer
+from modules.models.enums.keyword_patterns import KEYWORD_NAMES, KeyWordPatterns
 from modules.models.enums.token_type import TokenType
+from modules.models.lexer.Token import Token
 from modules.models.nodes.AST.Functions.FunctionDefinition import FunctionDefinitionNode
+from modules.models.nodes.AST.Functions.LazyBody import LazyBody
 from modules.models.nodes.BaseNode import BaseNode
+from modules.parser.Services.BufferedTokenIteratorService import BufferedTokenIteratorService
 from modules.parser.Services.ExpressionParser import ExpressionParser
 from modules.parser.Services.StatementParser import StatementParser
+from modules.parser.Services.StreamingTokenIteratorService import StreamingTokenIteratorService
 from modules.parser.Services.TokenIteratorService import TokenIteratorService
 
 
+def parse_body(tokens: List[Token] | TokenBuffer, start: int, end: int, iterative_expressions: bool = False) -> BaseNode:
+    """Parse the function body block spanning tokens `start` to `end`, used to resolve a LazyBody"""
+    if isinstance(tokens, TokenBuffer):
+        token_iterator = BufferedTokenIteratorService(tokens)
+    else:
+        token_iterator = TokenIteratorService()
+        token_iterator.lex_array = tokens
+    token_iterator.position = start
+    body = StatementParser(token_iterator, ExpressionParser(token_iterator, iterative_expressions)).parse_function_block()
+    if token_iterator.position != end:
+        raise SyntaxError(f"Function body ended at token {token_iterator.position}, expected {end}")
+    return body[0] # Assuming single body node for simplicity
+
+
 class FunctionParser:
     token_iterator: TokenIteratorService
     expression_parser: ExpressionParser
     statement_parser: StatementParser
     declaration_handlers: dict[str, Callable[[], BaseNode]] = {}
+    lazy_bodies: bool
     
-    def __init__(self, token_iterator: TokenIteratorService, expression_parser: ExpressionParser, statement_parser: StatementParser):
+    def __init__(self, token_iterator: TokenIteratorService, expression_parser: ExpressionParser, statement_parser: StatementParser, lazy_bodies: bool = False):
         self.token_iterator = token_iterator
         self.expression_parser = expression_parser
         self.statement_parser = statement_parser
+        self.lazy_bodies = lazy_bodies
         self.__init_declaration_handlers()
     
     def parse_preprocessor_directive(self):
@@ -57,7 +80,7 @@ class FunctionParser:
         while not self.token_iterator.check(TokenType.RPAREN):
             if self.token_iterator.check(TokenType.KEYWORD):
                 param_type = self.token_iterator.advance()
-                if param_type.value == "VOID":
+                if KEYWORD_NAMES.get(param_type.value) is KeyWordPatterns.VOID:
                     break
                 name = self.token_iterator.consume(TokenType.IDENTIFIER, "Expected parameter name")
                 parameters.append((param_type, name))
@@ -78,6 +101,11 @@ class FunctionParser:
         return_type = self.token_iterator.consume(TokenType.IDENTIFIER, "Expected return type")
         name = self.token_iterator.consume(TokenType.IDENTIFIER, "Expected function name")
         params = self.__parse_function_parameters()
+        # A streamed token window cannot be revisited later, so its bodies are always parsed now
+        if self.lazy_bodies and not isinstance(self.token_iterator, StreamingTokenIteratorService):
+            start, end = self.token_iterator.skip_block()
+            parse = partial(parse_body, self.token_iterator.lex_array, iterative_expressions=self.expression_parser.iterative)
+            return FunctionDefinitionNode(name=name.value, params=params, body=LazyBody(parse, start, end))
         body = self.statement_parser.parse_function_block()[0] # Assuming single body node for simplicity
         return FunctionDefinitionNode(name=name.value, params=params, body=body)
     
@@ -92,7 +120,7 @@ class FunctionParser:
         current_token = self.token_iterator.current()  # Should be the type (e.g., "int")
         
         # Look ahead to see the pattern
-        if self.token_iterator.position + 2 < len(self.token_iterator.lex_array):
+        if self.token_iterator.has_tokens_ahead(2):
             next_token = self.token_iterator.peek_ahead(self.token_iterator.position + 1)  # Should be name (e.g., "main")
             token_after_next = self.token_iterator.peek_ahead(self.token_iterator.position + 2)  # Should be "(" for function
             
@@ -103,9 +131,9 @@ class FunctionParser:
                 return "function"
         
         # Look ahead for variable pattern: type identifier = or type identifier ;
-        if self.token_iterator.position + 1 < len(self.token_iterator.lex_array):
+        if self.token_iterator.has_tokens_ahead(1):
             next_token = self.token_iterator.peek_ahead(self.token_iterator.position + 1)
-            if self.token_iterator.position + 2 < len(self.token_iterator.lex_array):
+            if self.token_iterator.has_tokens_ahead(2):
                 token_after_next = self.token_iterator.peek_ahead(self.token_iterator.position + 2)
                 
                 if (self.token_iterator.token_in_type_set(current_token, [TokenType.IDENTIFIER, TokenType.KEYWORD]) and
@@ -1,7 +1,6 @@
-from typing import List
-from modules.models.enums.keyword_patterns import KeyWordPatterns
+from typing import Callable, List
+from modules.models.enums.keyword_patterns import KEYWORD_NAMES, KeyWordPatterns
 from modules.models.enums.token_type import TokenType
-from modules.models.lexer.Token import Token
 from modules.models.nodes.AST.Expressions import ExpressionStatementNode
 from modules.models.nodes.AST.Statements.ReturnStatementNode import ReturnStatementNode
 from modules.models.nodes.BaseNode import BaseNode
@@ -11,18 +10,19 @@ from modules.parser.Services.TokenIteratorService import TokenIteratorService
 
 class StatementParser:
     token_iterator: TokenIteratorService
+    keyword_handlers: dict[KeyWordPatterns, Callable[[], BaseNode]] = {}
     
     def __init__(self, token_iterator: TokenIteratorService, expression_parser: ExpressionParser):
         self.token_iterator = token_iterator
         self.expression_parser = expression_parser
+        self.__init_keyword_handlers()
 
     def _parse_statement(self) -> BaseNode:
         if self.token_iterator.check(TokenType.KEYWORD):
             keyword = self.token_iterator.advance()
-            if keyword.value == KeyWordPatterns.RETURN.name:
-                st = ReturnStatementNode(value=self.expression_parser.parse_expression())
-                self.token_iterator.consume(TokenType.SEMICOLON, "Expected ';' after return statement")
-                return st
+            handler = self.keyword_handlers.get(KEYWORD_NAMES.get(keyword.value))
+            if handler:
+                return handler()
         
         expr = self.expression_parser.parse_expression()
         self.token_iterator.consume(TokenType.SEMICOLON, "Expected ';' after expression")
@@ -36,13 +36,13 @@ class StatementParser:
         self.token_iterator.consume(TokenType.RBRACE, "Expected '}' at end of function block")
         return statements
     
-    def __parse_keyword(self, token: Token) -> BaseNode:
-        match token.value:
-            case KeyWordPatterns.RETURN.name:
-                expr = ReturnStatementNode(value=self.expression_parser.parse_expression())
-                self.token_iterator.consume(TokenType.SEMICOLON, "Expected ';' after return statement")
-                return expr
-            case _:
-                raise ValueError("Unknown keyword")
+    def __parse_return(self) -> BaseNode:
+        expr = ReturnStatementNode(value=self.expression_parser.parse_expression())
+        self.token_iterator.consume(TokenType.SEMICOLON, "Expected ';' after return statement")
+        return expr
     
+    def __init_keyword_handlers(self):
+        self.keyword_handlers = {
+            KeyWordPatterns.RETURN: self.__parse_return,
+        }
 
@@ -0,0 +1,73 @@
+from collections import deque
+from typing import Iterable, Iterator
+from modules.models.lexer.Token import Token
+from modules.models.enums.token_type import TokenType
+from modules.parser.Services.TokenIteratorService import TokenIteratorService
+
+class StreamingTokenIteratorService(TokenIteratorService):
+    """
+    Token iterator that pulls tokens lazily from an iterator (e.g. LexerService.iter_tokens)
+    through a small ring buffer. Positions stay absolute so the parsers can use it exactly like
+    TokenIteratorService, but only `lookbehind` tokens before and `lookahead` tokens after the
+    current position are kept in memory.
+    """
+    lookahead_size: int
+    lookbehind_size: int
+
+    def __init__(self, tokens: Iterable[Token] = (), lookahead: int = 3, lookbehind: int = 1):
+        self.lookahead_size = lookahead
+        self.lookbehind_size = lookbehind
+        self.reset(tokens)
+
+    def reset(self, tokens: Iterable[Token]):
+        self.source: Iterator[Token] = iter(tokens)
+        self.window: deque[Token] = deque()
+        self.window_start = 0
+        self.exhausted = False
+        self.position = 0
+
+    def __fill(self, index: int) -> bool:
+        """Make sure the absolute token `index` is buffered, dropping tokens behind the window"""
+        if index > self.position + self.lookahead_size:
+            raise IndexError(f"Token {index} is beyond the {self.lookahead_size} token lookahead window")
+        while self.window_start < self.position - self.lookbehind_size:
+            self.window.popleft()
+            self.window_start += 1
+        while not self.exhausted and index >= self.window_start + len(self.window):
+            try:
+                self.window.append(next(self.source))
+            except StopIteration:
+                self.exhausted = True
+        return index < self.window_start + len(self.window)
+
+    def at_end(self) -> bool:
+        return not self.__fill(self.position)
+
+    def has_tokens_ahead(self, count: int) -> bool:
+        return self.__fill(self.position + count)
+
+    def current(self) -> Token:
+        if self.__fill(self.position):
+            return self.window[self.position - self.window_start]
+        return Token(type=TokenType.EOF, lineNumber=-1, value="")
+
+    def peek_type(self) -> TokenType:
+        return self.current().type
+
+    def consume_token(self) -> Token:
+        current_token = self.current()
+        if current_token.type != TokenType.EOF:
+            self.position += 1
+        return current_token
+
+    def peek_ahead(self, index: int = 0) -> Token:
+        if self.__fill(index):
+            return self.window[index - self.window_start]
+        return Token(type=TokenType.ERROR, lineNumber=-1, value="")
+
+    def peek_behind(self, index: int = 0) -> Token | None:
+        if index < 0:
+            return None
+        if index < self.window_start:
+            raise IndexError(f"Token {index} has already left the {self.lookbehind_size} token lookbehind window")
+        return self.window[index - self.window_start]
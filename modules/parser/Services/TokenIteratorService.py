@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Tuple
 from modules.models.lexer.Token import Token
 from modules.models.enums.token_type import TokenType
 
@@ -26,6 +26,16 @@ class TokenIteratorService():
             return self.lex_array[self.position]
         return Token(type=TokenType.EOF, lineNumber=-1, value="")
 
+    def peek_type(self) -> TokenType:
+        """Type of the current token, EOF past the end"""
+        if self.position < len(self.lex_array):
+            return self.lex_array[self.position].type
+        return TokenType.EOF
+
+    def has_tokens_ahead(self, count: int) -> bool:
+        """Check that the token `count` places after the current one exists"""
+        return self.position + count < len(self.lex_array)
+
     def peek_ahead(self, index: int = 0) -> Token:
         if index < len(self.lex_array):
             return self.lex_array[index]
@@ -79,4 +89,19 @@ class TokenIteratorService():
             return self.advance()
         
         current = self.current()
-        raise SyntaxError(f"{message}. Got: {current.type if current else 'EOF'}")
\ No newline at end of file
+        raise SyntaxError(f"{message}. Got: {current.type if current else 'EOF'}")
+
+    def skip_block(self) -> Tuple[int, int]:
+        """Step over the balanced { ... } block at the current token and return its token range"""
+        start = self.position
+        self.consume(TokenType.LBRACE, "Expected '{' at start of block")
+        depth = 1
+        while depth:
+            if self.at_end():
+                raise SyntaxError("Expected '}' at end of block. Got: EOF")
+            token_type = self.advance().type
+            if token_type == TokenType.LBRACE:
+                depth += 1
+            elif token_type == TokenType.RBRACE:
+                depth -= 1
+        return start, self.position
\ No newline at end of file
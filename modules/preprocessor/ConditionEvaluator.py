@@ -0,0 +1,137 @@
+from typing import List
+
+# Binary operators of #if expressions, higher binds tighter
+BINARY_PRECEDENCE = {
+	'*': 10, '/': 10, '%': 10,
+	'+': 9, '-': 9,
+	'<<': 8, '>>': 8,
+	'<': 7, '<=': 7, '>': 7, '>=': 7,
+	'==': 6, '!=': 6,
+	'&': 5,
+	'^': 4,
+	'|': 3,
+	'&&': 2,
+	'||': 1,
+}
+
+CHARACTER_ESCAPES = {'n': 10, 't': 9, 'r': 13, '0': 0, 'a': 7, 'b': 8, 'f': 12, 'v': 11, '\\': 92, "'": 39, '"': 34, '?': 63}
+
+
+def _divide(left: int, right: int, operator: str) -> int:
+	if right == 0:
+		raise ValueError("Division by zero in #if expression")
+	# C division truncates toward zero
+	quotient = abs(left) // abs(right)
+	if (left < 0) != (right < 0):
+		quotient = -quotient
+	return quotient if operator == '/' else left - quotient * right
+
+
+def _apply(operator: str, left: int, right: int) -> int:
+	match operator:
+		case '*': return left * right
+		case '/' | '%': return _divide(left, right, operator)
+		case '+': return left + right
+		case '-': return left - right
+		case '<<': return left << right
+		case '>>': return left >> right
+		case '<': return int(left < right)
+		case '<=': return int(left <= right)
+		case '>': return int(left > right)
+		case '>=': return int(left >= right)
+		case '==': return int(left == right)
+		case '!=': return int(left != right)
+		case '&': return left & right
+		case '^': return left ^ right
+		case '|': return left | right
+		case '&&': return int(bool(left) and bool(right))
+		case '||': return int(bool(left) or bool(right))
+	raise ValueError(f"Unknown operator '{operator}' in #if expression")
+
+
+def parse_integer(text: str) -> int:
+	digits = text.rstrip('uUlL')
+	try:
+		if len(digits) > 1 and digits[0] == '0' and digits[1] not in 'xXbB':
+			return int(digits, 8)
+		return int(digits, 0)
+	except ValueError:
+		raise ValueError(f"Invalid integer '{text}' in #if expression")
+
+
+def parse_character(text: str) -> int:
+	body = text[1:-1]
+	if body.startswith('\\') and len(body) == 2 and body[1] in CHARACTER_ESCAPES:
+		return CHARACTER_ESCAPES[body[1]]
+	if len(body) == 1:
+		return ord(body)
+	raise ValueError(f"Unsupported character constant {text} in #if expression")
+
+
+class ConditionEvaluator:
+	"""
+	Evaluates the controlling expression of #if / #elif by precedence climbing. The tokens have
+	already had `defined` resolved and macros expanded, so any identifier left evaluates to 0.
+	"""
+	def __init__(self, tokens: List[str]):
+		self.tokens = tokens
+		self.position = 0
+
+	def evaluate(self) -> int:
+		if not self.tokens:
+			raise ValueError("#if with no expression")
+		value = self.__conditional()
+		if self.position < len(self.tokens):
+			raise ValueError(f"Unexpected '{self.tokens[self.position]}' in #if expression")
+		return value
+
+	def __peek(self) -> str | None:
+		return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+	def __advance(self) -> str:
+		token = self.__peek()
+		if token is None:
+			raise ValueError("Unexpected end of #if expression")
+		self.position += 1
+		return token
+
+	def __expect(self, token: str):
+		if self.__advance() != token:
+			raise ValueError(f"Expected '{token}' in #if expression")
+
+	def __conditional(self) -> int:
+		condition = self.__binary(1)
+		if self.__peek() != '?':
+			return condition
+		self.__advance()
+		when_true = self.__conditional()
+		self.__expect(':')
+		when_false = self.__conditional()
+		return when_true if condition else when_false
+
+	def __binary(self, minimum_precedence: int) -> int:
+		left = self.__unary()
+		while (operator := self.__peek()) in BINARY_PRECEDENCE and BINARY_PRECEDENCE[operator] >= minimum_precedence:
+			self.__advance()
+			right = self.__binary(BINARY_PRECEDENCE[operator] + 1)
+			left = _apply(operator, left, right)
+		return left
+
+	def __unary(self) -> int:
+		token = self.__advance()
+		match token:
+			case '!': return int(not self.__unary())
+			case '~': return ~self.__unary()
+			case '-': return -self.__unary()
+			case '+': return self.__unary()
+			case '(':
+				value = self.__conditional()
+				self.__expect(')')
+				return value
+		if token[0].isdigit():
+			return parse_integer(token)
+		if token[0] == "'":
+			return parse_character(token)
+		if token[0].isalpha() or token[0] == '_':
+			return 0
+		raise ValueError(f"Unexpected '{token}' in #if expression")
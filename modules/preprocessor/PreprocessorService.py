@@ -0,0 +1,611 @@
+import os
+import re
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+from pydantic import ValidationError
+from modules.preprocessor.ConditionEvaluator import ConditionEvaluator
+from modules.preprocessor.models.Macro import Macro
+from modules.preprocessor.models.ParsedFile import ParsedFile
+from modules.utils.content_cache import DEFAULT_CACHE_SIZE, ContentCache
+from modules.utils.logger import get_logger
+
+# Part of every header cache key, bump it whenever the ParsedFile layout or line splitting changes
+PREPROCESSOR_VERSION = "2"
+MAX_INCLUDE_DEPTH = 200
+
+# String and character literals are matched so comment markers inside them are left alone.
+# The lookahead lets the search reject most positions on their first character.
+COMMENT_PATTERN = re.compile(r'(?=["\'/])(?:"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|(?P<line>//[^\n]*)|(?P<block>/\*.*?(?:\*/|\Z)))', re.DOTALL)
+DIRECTIVE_PATTERN = re.compile(r'^[ \t]*#[ \t]*(\w*)([^\n]*)', re.MULTILINE)
+DEFINE_PATTERN = re.compile(r'([A-Za-z_]\w*)(\(([^)]*)\))?(.*)', re.DOTALL)
+INCLUDE_PATTERN = re.compile(r'"([^"]*)"|<([^>]*)>')
+IDENTIFIER_PATTERN = re.compile(r'[A-Za-z_]\w*')
+PP_TOKEN_PATTERN = re.compile(
+	r'\s+|[A-Za-z_]\w*|\.?\d(?:[eEpP][+-]|[\w.])*|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\''
+	r'|##|\.\.\.|<<=|>>=|->|\+\+|--|<<|>>|<=|>=|==|!=|&&|\|\||[-+*/%&|^]=|.',
+	re.DOTALL,
+)
+
+# A preprocessing token is its text plus the hide set of macros that must not expand it again
+PPToken = Tuple[str, FrozenSet[str]]
+NO_HIDE: FrozenSet[str] = frozenset()
+# Text of the token left where a macro expanded to nothing, so join_tokens still sees the boundary
+PLACEMARKER = ''
+
+
+class PreprocessorError(ValueError):
+	"""A preprocessing error that already carries its file and line"""
+
+
+class _IncompleteInvocation(Exception):
+	"""A function-like macro call whose argument list continues on the next line"""
+
+
+class _PendingName(_IncompleteInvocation):
+	"""A function-like macro name at the end of a line, its '(' may start the next line"""
+
+
+def splice_lines(text: str) -> str:
+	"""Join backslash-continued lines, padding with empty lines so the line count is unchanged"""
+	if '\\\n' not in text:
+		return text
+	lines: List[str] = []
+	held: List[str] = []
+	for line in text.split('\n'):
+		if line.endswith('\\'):
+			held.append(line[:-1])
+			continue
+		held.append(line)
+		lines.append(''.join(held))
+		lines.extend([''] * (len(held) - 1))
+		held = []
+	if held:
+		lines.append(''.join(held))
+		lines.extend([''] * (len(held) - 2))
+	return '\n'.join(lines)
+
+
+def strip_comments(text: str) -> str:
+	"""
+	Replace every comment with a single space. The newlines a block comment spanned are put back
+	after the end of the line it closes on, so later lines keep their line numbers.
+	"""
+	if '/' not in text:
+		return text
+	pieces: List[str] = []
+	position = 0
+	held_newlines = 0
+	for match in COMMENT_PATTERN.finditer(text):
+		if match.lastgroup is None:
+			continue
+		before = text[position:match.start()]
+		if held_newlines and '\n' in before:
+			split = before.index('\n') + 1
+			before = before[:split] + '\n' * held_newlines + before[split:]
+			held_newlines = 0
+		pieces.append(before)
+		pieces.append(' ')
+		if match.lastgroup == 'block':
+			held_newlines += match.group().count('\n')
+		position = match.end()
+	rest = text[position:]
+	if held_newlines:
+		if '\n' in rest:
+			split = rest.index('\n') + 1
+			rest = rest[:split] + '\n' * held_newlines + rest[split:]
+		else:
+			rest += '\n' * held_newlines
+	pieces.append(rest)
+	return ''.join(pieces)
+
+
+CONDITIONAL_STARTS = ('if', 'ifdef', 'ifndef')
+CONDITIONAL_BRANCHES = ('elif', 'else')
+
+
+def _link_conditionals(blocks: List[Tuple[str | None, str, int]]) -> List[int]:
+	"""Point every conditional branch at the directive that ends it, see ParsedFile.skip_to"""
+	skip_to = [-1] * len(blocks)
+	open_branches: List[int] = []
+	for index, (directive, _, _) in enumerate(blocks):
+		if directive in CONDITIONAL_STARTS:
+			open_branches.append(index)
+		elif directive in CONDITIONAL_BRANCHES and open_branches:
+			skip_to[open_branches[-1]] = index
+			open_branches[-1] = index
+		elif directive == 'endif' and open_branches:
+			skip_to[open_branches.pop()] = index
+	return skip_to
+
+
+def _find_guard(blocks: List[Tuple[str | None, str, int]], skip_to: List[int]) -> str | None:
+	"""Name of the macro of an #ifndef X / #define X ... #endif guard around the whole file"""
+	significant = [index for index, (directive, text, _) in enumerate(blocks) if directive is not None or text.strip()]
+	if len(significant) < 3:
+		return None
+	first, second, last = significant[0], significant[1], significant[-1]
+	if blocks[first][0] != 'ifndef' or blocks[second][0] != 'define' or skip_to[first] != last:
+		return None
+	guard = blocks[first][1].strip()
+	name = IDENTIFIER_PATTERN.match(blocks[second][1])
+	return guard if name is not None and name.group() == guard else None
+
+
+def parse_source(path: str, text: str) -> ParsedFile:
+	"""
+	Split a file into directive and text blocks. Directive lines are found by one multi-line
+	regex search over the whole text, so text between directives is never looked at line by line.
+	"""
+	text = strip_comments(splice_lines(text))
+	blocks: List[Tuple[str | None, str, int]] = []
+	line = 1
+	position = 0
+	for match in DIRECTIVE_PATTERN.finditer(text):
+		if match.start() > position:
+			chunk = text[position:match.start() - 1]
+			blocks.append((None, chunk, line))
+			line += chunk.count('\n') + 1
+		blocks.append((match.group(1), match.group(2).strip(), line))
+		line += 1
+		position = match.end() + 1
+	if position <= len(text):
+		chunk = text[position:]
+		blocks.append((None, chunk, line))
+		line += chunk.count('\n') + 1
+	skip_to = _link_conditionals(blocks)
+	return ParsedFile(path=path, blocks=blocks, skip_to=skip_to, line_count=line - 1, guard=_find_guard(blocks, skip_to))
+
+
+def tokenize(text: str) -> List[PPToken]:
+	return [(match.group(), NO_HIDE) for match in PP_TOKEN_PATTERN.finditer(text)]
+
+
+def join_tokens(tokens: Iterable[PPToken]) -> str:
+	"""
+	Token texts back to source. A space is added between two tokens next to each other because of
+	an expansion when writing them together would lex as a different token, e.g. '-' '-' or 'a' 'b'.
+	Placemarkers are dropped, they only mark where a macro expanded to nothing.
+	"""
+	parts: List[str] = []
+	previous: PPToken | None = None
+	boundary = False
+	for token in tokens:
+		if token[0] == PLACEMARKER:
+			boundary = True
+			continue
+		if (previous is not None and (boundary or token[1] or previous[1])
+				and not token[0].isspace() and not previous[0].isspace()
+				and PP_TOKEN_PATTERN.match(previous[0] + token[0]).end() > len(previous[0])):
+			parts.append(' ')
+		parts.append(token[0])
+		previous = token
+		boundary = False
+	return ''.join(parts)
+
+
+def _next_significant(tokens: List[str], index: int) -> int | None:
+	while index < len(tokens):
+		if not tokens[index].isspace():
+			return index
+		index += 1
+	return None
+
+
+def _strip(tokens: List[PPToken]) -> List[PPToken]:
+	start, end = 0, len(tokens)
+	while start < end and tokens[start][0].isspace():
+		start += 1
+	while end > start and tokens[end - 1][0].isspace():
+		end -= 1
+	return tokens[start:end]
+
+
+def _stringize(tokens: List[PPToken]) -> str:
+	parts = []
+	for text, _ in tokens:
+		if text.isspace():
+			if parts and parts[-1] != ' ':
+				parts.append(' ')
+		elif text[0] in '"\'':
+			parts.append(text.replace('\\', '\\\\').replace('"', '\\"'))
+		else:
+			parts.append(text)
+	return '"' + ''.join(parts).strip() + '"'
+
+
+class PreprocessorService():
+	"""
+	In-process C preprocessor run ahead of LexerService. Handles #include, object- and function-like
+	#define (with # and ##), #undef and conditional compilation, and outputs one line for every line
+	of the main file so line numbers survive until the first #include.
+	Headers are parsed once into classified lines and cached in memory and, with `cache_dir`, on disk,
+	keyed by path, modification time and size. Expansion always runs against the current macros.
+	"""
+	macros: Dict[str, Macro]
+
+	def __init__(self, include_paths: Iterable[str] = (), defines: Dict[str, str] | None = None,
+			cache_dir: str | None = None, cache_size: int = DEFAULT_CACHE_SIZE):
+		self.include_paths = [os.path.abspath(path) for path in include_paths]
+		self.defines = dict(defines or {})
+		self.header_cache: Dict[str, Tuple[Tuple[int, int], ParsedFile]] = {}
+		self.disk_cache = ContentCache(cache_dir, cache_size, suffix=".pp", name="Header cache") if cache_dir else None
+		self.reset()
+
+	def reset(self):
+		"""Forget macros and #pragma once files from the previous translation unit"""
+		self.macros = {}
+		self.once: set[str] = set()
+		# (path, first line, last line) of every inactive region skipped, for diagnostics
+		self.skipped_ranges: List[Tuple[str, int, int]] = []
+		for name, value in self.defines.items():
+			self.define(f"{name} {value}")
+
+	def define(self, definition: str) -> Macro:
+		"""Define a macro from the text after #define, e.g. 'MAX(a, b) ((a) > (b) ? (a) : (b))'"""
+		match = DEFINE_PATTERN.match(definition)
+		if match is None:
+			raise ValueError("Macro name must be an identifier")
+		name, parameter_list, parameter_text, body_text = match.groups()
+		parameters = None
+		variadic = False
+		if parameter_list is not None:
+			parameters = [parameter.strip() for parameter in parameter_text.split(',')] if parameter_text.strip() else []
+			if parameters and parameters[-1] == '...':
+				parameters[-1] = '__VA_ARGS__'
+				variadic = True
+			for parameter in parameters:
+				if IDENTIFIER_PATTERN.fullmatch(parameter) is None:
+					raise ValueError(f"Invalid parameter '{parameter}' in macro {name}")
+		body = [' ' if text.isspace() else text for text, _ in tokenize(body_text.strip())]
+		macro = Macro(name=name, parameters=parameters, variadic=variadic, body=body)
+		self.macros[name] = macro
+		return macro
+
+	def preprocess_file(self, file_name: str) -> str:
+		self.reset()
+		output: List[str] = []
+		self.__include(os.path.realpath(file_name), output, 0)
+		return '\n'.join(output)
+
+	def preprocess_source(self, source: str, file_name: str = "<source>") -> str:
+		self.reset()
+		output: List[str] = []
+		self.__process(parse_source(os.path.realpath(file_name), source), output, 0)
+		return '\n'.join(output)
+
+	def log_stats(self):
+		skipped_lines = sum(last - first + 1 for _, first, last in self.skipped_ranges)
+		get_logger().debug(f"Skipped {skipped_lines} inactive lines in {len(self.skipped_ranges)} regions")
+		get_logger().info(f"Header cache: {len(self.header_cache)} parsed files held in memory")
+		if self.disk_cache is not None:
+			self.disk_cache.log_stats()
+
+	def __load(self, path: str) -> ParsedFile:
+		"""Parsed lines of `path`, from memory, the disk cache, or by reading the file"""
+		stat = os.stat(path)
+		version = (stat.st_mtime_ns, stat.st_size)
+		cached = self.header_cache.get(path)
+		if cached is not None and cached[0] == version:
+			return cached[1]
+		parsed = None
+		if self.disk_cache is not None:
+			key = ContentCache.key(PREPROCESSOR_VERSION, path, str(stat.st_mtime_ns), str(stat.st_size))
+			data = self.disk_cache.get(key)
+			if data is not None:
+				try:
+					parsed = ParsedFile.model_validate_json(data)
+				except ValidationError as e:
+					get_logger().warning(f"Ignoring unreadable header cache entry for {path}: {e}")
+		if parsed is None:
+			with open(path, 'r') as file:
+				parsed = parse_source(path, file.read())
+			if self.disk_cache is not None:
+				self.disk_cache.put(key, parsed.model_dump_json().encode('utf-8'))
+		self.header_cache[path] = (version, parsed)
+		return parsed
+
+	def __resolve(self, name: str, current_directory: str, quoted: bool) -> str | None:
+		directories = [current_directory, *self.include_paths] if quoted else self.include_paths
+		for directory in directories:
+			candidate = os.path.join(directory, name)
+			if os.path.isfile(candidate):
+				return os.path.realpath(candidate)
+		return None
+
+	def __include(self, path: str, output: List[str], depth: int):
+		if depth > MAX_INCLUDE_DEPTH:
+			raise PreprocessorError(f"{path}: #include nested more than {MAX_INCLUDE_DEPTH} levels deep")
+		if path in self.once:
+			return
+		parsed = self.__load(path)
+		if parsed.guard is not None and parsed.guard in self.macros:
+			get_logger().debug(f"Skipping {path}, include guard {parsed.guard} is defined")
+			return
+		self.__process(parsed, output, depth)
+
+	def __error(self, parsed: ParsedFile, number: int, message: str) -> PreprocessorError:
+		return PreprocessorError(f"{parsed.path}:{number}: {message}")
+
+	def __skip(self, parsed: ParsedFile, index: int, output: List[str]) -> int:
+		"""Jump from a branch that is not taken straight to the directive that ends it"""
+		target = parsed.skip_to[index]
+		if target == -1:
+			raise ValueError("Unterminated #if")
+		line, target_line = parsed.blocks[index][2], parsed.blocks[target][2]
+		if target_line - line > 1:
+			self.skipped_ranges.append((parsed.path, line + 1, target_line - 1))
+		# The directive's own line and every skipped line become empty lines
+		output.append('\n' * (target_line - line - 1))
+		return target
+
+	def __mentions_macro(self, text: str) -> bool:
+		macros = self.macros
+		return bool(macros) and any(name in macros for name in IDENTIFIER_PATTERN.findall(text))
+
+	def __process(self, parsed: ParsedFile, output: List[str], depth: int):
+		# One [branch taken, #else seen] frame per open conditional. Branches that are not taken
+		# are jumped over, so every block reached here is active.
+		conditions: List[List[bool]] = []
+		held: List[str] = []
+		# The held lines end in a function-like macro name, the next one decides whether it is called
+		waiting = False
+		blocks = parsed.blocks
+		index = 0
+		while index < len(blocks):
+			directive, text, number = blocks[index]
+			try:
+				if directive is None:
+					if not held and not self.__mentions_macro(text):
+						output.append(text)
+						index += 1
+						continue
+					for offset, line in enumerate(text.split('\n')):
+						number = blocks[index][2] + offset
+						if waiting and line.strip() and not line.lstrip().startswith('('):
+							self.__flush(held, output)
+							held = []
+						held.append(line)
+						try:
+							expanded = self.__expand_line(' '.join(held), final=False)
+						except _IncompleteInvocation as e:
+							waiting = isinstance(e, _PendingName)
+							continue
+						waiting = False
+						output.append(expanded)
+						output.extend([''] * (len(held) - 1))
+						held = []
+					index += 1
+					continue
+				if held:
+					# No '(' came before the directive, a macro name left waiting for one stays as it is
+					self.__flush(held, output)
+					held = []
+					waiting = False
+
+				match directive:
+					case 'if' | 'ifdef' | 'ifndef':
+						taken = self.__condition(directive, text)
+						conditions.append([taken, False])
+						if not taken:
+							index = self.__skip(parsed, index, output)
+							continue
+					case 'elif':
+						if not conditions or conditions[-1][1]:
+							raise ValueError("#elif without #if")
+						frame = conditions[-1]
+						if frame[0] or not self.__condition('if', text):
+							index = self.__skip(parsed, index, output)
+							continue
+						frame[0] = True
+					case 'else':
+						if not conditions or conditions[-1][1]:
+							raise ValueError("#else without #if")
+						frame = conditions[-1]
+						frame[1] = True
+						if frame[0]:
+							index = self.__skip(parsed, index, output)
+							continue
+						frame[0] = True
+					case 'endif':
+						if not conditions:
+							raise ValueError("#endif without #if")
+						conditions.pop()
+					case 'define':
+						self.define(text)
+					case 'undef':
+						self.macros.pop(text.strip(), None)
+					case 'include':
+						self.__include_directive(parsed, text, output, depth)
+						index += 1
+						continue
+					case 'pragma':
+						# #pragma once is the only pragma handled, the rest are dropped
+						if text.strip() == 'once':
+							self.once.add(parsed.path)
+					case 'error':
+						raise ValueError(f"#error {text}")
+					case 'warning':
+						get_logger().warning(f"{parsed.path}:{number}: #warning {text}")
+					case 'line' | '':
+						pass
+					case _:
+						raise ValueError(f"Unknown directive #{directive}")
+				output.append('')
+				index += 1
+			except PreprocessorError:
+				raise
+			except ValueError as e:
+				raise self.__error(parsed, number, str(e)) from e
+		if held:
+			try:
+				self.__flush(held, output)
+			except ValueError as e:
+				raise self.__error(parsed, parsed.line_count, str(e)) from e
+		if conditions:
+			raise self.__error(parsed, parsed.line_count, "Unterminated #if")
+
+	def __flush(self, held: List[str], output: List[str]):
+		"""Expand lines held for a macro call that never got its '(' or arguments before a directive or the end of the file"""
+		try:
+			output.append(self.__expand_line(' '.join(held)))
+		except _IncompleteInvocation:
+			raise ValueError("Unterminated argument list of a macro call")
+		output.extend([''] * (len(held) - 1))
+
+	def __include_directive(self, parsed: ParsedFile, text: str, output: List[str], depth: int):
+		match = INCLUDE_PATTERN.match(text)
+		if match is None:
+			# #include MACRO, the expansion has to be one of the two forms
+			match = INCLUDE_PATTERN.match(self.__expand_line(text).strip())
+		if match is None:
+			raise ValueError("Expected \"file\" or <file> after #include")
+		quoted, angled = match.groups()
+		name = quoted if quoted is not None else angled
+		path = self.__resolve(name, os.path.dirname(parsed.path), quoted is not None)
+		if path is None:
+			raise ValueError(f"Include file not found: {name}")
+		self.__include(path, output, depth + 1)
+
+	def __condition(self, directive: str, text: str) -> bool:
+		if directive != 'if':
+			name = text.strip()
+			if IDENTIFIER_PATTERN.fullmatch(name) is None:
+				raise ValueError(f"Expected a macro name after #{directive}")
+			return (name in self.macros) == (directive == 'ifdef')
+		tokens = tokenize(text)
+		texts = [token for token, _ in tokens]
+		resolved: List[PPToken] = []
+		index = 0
+		while index < len(tokens):
+			if texts[index] != 'defined':
+				resolved.append(tokens[index])
+				index += 1
+				continue
+			# defined NAME or defined ( NAME ), resolved before expansion
+			name_index = _next_significant(texts, index + 1)
+			parenthesized = name_index is not None and texts[name_index] == '('
+			if parenthesized:
+				name_index = _next_significant(texts, name_index + 1)
+			if name_index is None or IDENTIFIER_PATTERN.fullmatch(texts[name_index]) is None:
+				raise ValueError("Expected a macro name after defined")
+			index = name_index + 1
+			if parenthesized:
+				close = _next_significant(texts, index)
+				if close is None or texts[close] != ')':
+					raise ValueError("Expected ')' after defined(")
+				index = close + 1
+			resolved.append(('1' if texts[name_index] in self.macros else '0', NO_HIDE))
+		try:
+			expanded = self.__expand(resolved)
+		except _IncompleteInvocation:
+			raise ValueError("Unterminated argument list of a macro call")
+		return bool(ConditionEvaluator([token for token, _ in expanded if token and not token.isspace()]).evaluate())
+
+	def __expand_line(self, text: str, final: bool = True) -> str:
+		macros = self.macros
+		if not macros or not any(name in macros for name in IDENTIFIER_PATTERN.findall(text)):
+			return text
+		return join_tokens(self.__expand(tokenize(text), final))
+
+	def __expand(self, tokens: List[PPToken], final: bool = True) -> List[PPToken]:
+		"""
+		Macro-expand a token list. Every token carries a hide set of the macros it came out of,
+		which stops recursive expansion while still rescanning replacements with the tokens after them.
+		Unless `final`, more lines may follow, so a function-like macro name at the end raises
+		_PendingName to look for its '(' there.
+		"""
+		output: List[PPToken] = []
+		# Reversed so the next token is popped off the end and replacements are pushed back on it
+		pending = tokens[::-1]
+		while pending:
+			token = pending.pop()
+			text, hide = token
+			macro = self.macros.get(text)
+			if macro is None or text in hide:
+				output.append(token)
+				continue
+			if macro.parameters is None:
+				hide = hide | {text}
+				pending.extend(reversed(self.__substitute(macro, None, hide) or [(PLACEMARKER, hide)]))
+				continue
+			# A function-like macro name only expands when a '(' follows
+			index = len(pending) - 1
+			while index >= 0 and pending[index][0].isspace():
+				index -= 1
+			if index < 0 and not final:
+				raise _PendingName()
+			if index < 0 or pending[index][0] != '(':
+				output.append(token)
+				continue
+			del pending[index:]
+			arguments, closing = self.__collect_arguments(macro, pending)
+			hide = (hide & closing[1]) | {text}
+			pending.extend(reversed(self.__substitute(macro, arguments, hide) or [(PLACEMARKER, hide)]))
+		return output
+
+	def __collect_arguments(self, macro: Macro, pending: List[PPToken]) -> Tuple[List[List[PPToken]], PPToken]:
+		parameters = macro.parameters or []
+		arguments: List[List[PPToken]] = [[]]
+		depth = 0
+		while pending:
+			token = pending.pop()
+			text = token[0]
+			if text == '(':
+				depth += 1
+			elif text == ')':
+				if depth == 0:
+					break
+				depth -= 1
+			elif text == ',' and depth == 0 and (not macro.variadic or len(arguments) < len(parameters)):
+				arguments.append([])
+				continue
+			arguments[-1].append(token)
+		else:
+			raise _IncompleteInvocation()
+		arguments = [_strip(argument) for argument in arguments]
+		if len(parameters) == 0 and arguments == [[]]:
+			arguments = []
+		if macro.variadic and len(arguments) == len(parameters) - 1:
+			arguments.append([])
+		if len(arguments) != len(parameters):
+			raise ValueError(f"Macro {macro.name} expects {len(parameters)} arguments, got {len(arguments)}")
+		return arguments, token
+
+	def __substitute(self, macro: Macro, arguments: List[List[PPToken]] | None, hide: FrozenSet[str]) -> List[PPToken]:
+		"""Replacement list of one invocation with parameters, # and ## applied"""
+		body = macro.body
+		parameters = {name: index for index, name in enumerate(macro.parameters or [])}
+		result: List[PPToken] = []
+		index = 0
+		while index < len(body):
+			text = body[index]
+			following = _next_significant(body, index + 1)
+			if text == '#' and arguments is not None and following is not None and body[following] in parameters:
+				result.append((_stringize(arguments[parameters[body[following]]]), hide))
+				index = following + 1
+				continue
+			if text == '##' and following is not None:
+				while result and result[-1][0].isspace():
+					result.pop()
+				if arguments is not None and body[following] in parameters:
+					right = [(token, hide) for token, _ in arguments[parameters[body[following]]]]
+				else:
+					right = [(body[following], hide)]
+				if result and right:
+					left = result.pop()
+					result.extend((token, hide) for token, _ in tokenize(left[0] + right[0][0]))
+					right = right[1:]
+				result.extend(right)
+				index = following + 1
+				continue
+			if arguments is not None and text in parameters:
+				argument = arguments[parameters[text]]
+				if following is not None and body[following] == '##':
+					# Operands of ## are pasted as written, not expanded
+					result.extend((token, hide) for token, _ in argument)
+				else:
+					result.extend((token, token_hide | hide) for token, token_hide in self.__expand(list(argument)))
+				index += 1
+				continue
+			result.append((text, hide))
+			index += 1
+		return result
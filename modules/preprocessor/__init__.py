@@ -0,0 +1 @@
+from .PreprocessorService import PreprocessorService
@@ -0,0 +1,11 @@
+from typing import List
+from pydantic import BaseModel
+
+
+class Macro(BaseModel):
+	name: str
+	# None for object-like macros, the parameter names for function-like ones
+	parameters: List[str] | None = None
+	variadic: bool = False
+	# Replacement list as preprocessing token texts, whitespace collapsed to ' '
+	body: List[str] = []
@@ -0,0 +1,18 @@
+from typing import List, Tuple
+from pydantic import BaseModel
+
+
+class ParsedFile(BaseModel):
+	"""
+	A source file with comments removed and continuation lines spliced, split into blocks.
+	A block is either one directive, (name, arguments, line), or a run of ordinary lines,
+	(None, text, first line), with the lines still joined by newlines.
+	"""
+	path: str
+	blocks: List[Tuple[str | None, str, int]]
+	# For #if/#ifdef/#ifndef/#elif/#else blocks, the index of the #elif/#else/#endif that ends
+	# the branch, -1 when it is missing. Everything else is -1.
+	skip_to: List[int]
+	line_count: int
+	# Macro of an #ifndef/#define/#endif guard wrapping the whole file
+	guard: str | None = None
@@ -3,6 +3,8 @@ Utility modules for the C Compiler project.
 """
 
 from .logger import get_logger, setup_logger, set_log_level, debug, info, warning, error, critical
+from .content_cache import ContentCache
+from .interning import SymbolTable, symbols, intern
 
 __all__ = [
     'get_logger',
@@ -12,5 +14,9 @@ __all__ = [
     'info', 
     'warning',
     'error',
-    'critical'
+    'critical',
+    'ContentCache',
+    'SymbolTable',
+    'symbols',
+    'intern'
 ]
\ No newline at end of file
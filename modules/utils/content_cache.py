@@ -0,0 +1,99 @@
+"""
+Content addressed on-disk cache shared by the compiler stages.
+Entries are keyed by a hash of the input bytes (plus anything that changes the output, such as
+a stage version) and the directory is kept under a byte budget by evicting the least recently
+used entries first.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from .logger import get_logger
+
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+
+
+class ContentCache:
+    """
+    Directory of `<key><suffix>` files. Reading an entry touches its modification time, so the
+    mtime order is the least recently used order used for eviction. Hits and misses are counted
+    and reported through the global logger.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_CACHE_SIZE, suffix: str = ".bin", name: str = "Cache"):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(*parts) -> str:
+        """Hash the given bytes-like parts into a cache key"""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode("utf-8") if isinstance(part, str) else part)
+        return digest.hexdigest()
+
+    def __path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.suffix}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached bytes for `key`, or None on a miss"""
+        path = self.__path(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            get_logger().debug(f"{self.name} miss {key[:12]} (hits={self.hits}, misses={self.misses})")
+            return None
+        self.hits += 1
+        get_logger().debug(f"{self.name} hit {key[:12]} (hits={self.hits}, misses={self.misses})")
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Store `data` under `key`, then evict old entries if the cache is over budget"""
+        # Write to a temporary file first so a concurrent reader never sees half an entry
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, self.__path(key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in `max_bytes`"""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.suffix) and entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                total += stat.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        evicted = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted += 1
+        get_logger().debug(f"{self.name} evicted {evicted} entries, {total} bytes remain")
+
+    def log_stats(self):
+        get_logger().info(f"{self.name}: {self.hits} hits, {self.misses} misses")
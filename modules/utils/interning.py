@@ -0,0 +1,50 @@
+"""
+Symbol interning shared by every compiler stage.
+Each distinct name (identifier, constant text, pseudo register or label) is stored once. Interned
+names can be compared by identity and dictionary lookups keyed by them hit CPython's identity fast
+path. The stages key their tables on the names themselves, so the table hands out no integer ids.
+"""
+
+from typing import Dict
+
+# Names kept before the table starts over, far more than one translation unit needs
+DEFAULT_MAX_SYMBOLS = 1 << 20
+
+
+class SymbolTable:
+    """
+    Canonical instances of names. Once `max_symbols` names are held the table is emptied, so a
+    long-lived process (or a pool worker) does not keep every label and temporary it ever saw.
+    Names handed out before stay valid, they are only no longer shared with later ones.
+    """
+
+    def __init__(self, max_symbols: int = DEFAULT_MAX_SYMBOLS):
+        self.__names: Dict[str, str] = {}
+        self.max_symbols = max_symbols
+
+    def intern(self, name: str) -> str:
+        """Return the canonical instance of `name`, adding it to the table on first use"""
+        symbol = self.__names.get(name)
+        if symbol is None:
+            if len(self.__names) >= self.max_symbols:
+                self.__names.clear()
+            symbol = self.__names[name] = name
+        return symbol
+
+    def clear(self):
+        """Forget every name, e.g. between the compilations of a long-lived process"""
+        self.__names.clear()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__names
+
+    def __len__(self) -> int:
+        return len(self.__names)
+
+
+# The table shared from the lexer through code generation
+symbols = SymbolTable()
+
+
+def intern(name: str) -> str:
+    return symbols.intern(name)
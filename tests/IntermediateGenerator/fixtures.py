@@ -0,0 +1,45 @@
+# type: ignore
+"""Operands, instruction builders and source-to-Tacky helpers shared by the Tacky pass tests"""
+from modules.IntermediateGenerator.IRGenerator import IRGenerator
+from modules.IntermediateGenerator.visitors.ASTLowererVisitor import ASTLowerer
+from modules.IntermediateGenerator.visitors.StackAllocator import StackAllocator
+from modules.lexer.LexerService import LexerService
+from modules.models.enums.GenericRegisterEnum import GenericRegisterEnum
+from modules.models.nodes.IR.Operands.Immediate import Immediate
+from modules.models.nodes.IR.Operands.Pseudo import Pseudo
+from modules.models.nodes.IR.Operands.Register import Register
+from modules.models.nodes.IR.Statements.IRCopy import IRCopy
+from modules.parser.ParserServiceV2 import ParserServiceV2
+from modules.parser.Services.BufferedTokenIteratorService import BufferedTokenIteratorService
+
+AX = Register(value=GenericRegisterEnum.AX)
+R10 = Register(value=GenericRegisterEnum.R10)
+R11 = Register(value=GenericRegisterEnum.R11)
+
+
+def tmp(name):
+    return Pseudo(value=f"tmp.{name}")
+
+
+def copy(src, dest):
+    return IRCopy(src=src, dest=dest)
+
+
+def immediate(value):
+    return Immediate(value=str(value))
+
+
+def parse(source):
+    return ParserServiceV2(BufferedTokenIteratorService()).parse_lex(LexerService().buffer_text(source))
+
+
+def generate(source, optimize, ssa=False):
+    """IRFunctionDefinition of the first function in `source`, after legalization"""
+    return IRGenerator(optimize, ssa).parse_ast(parse(source)).functions[0]
+
+
+def lower(expression):
+    """Tacky instructions ASTLowerer emits for `int main(void) { return <expression>; }`"""
+    instructions = []
+    parse(f"int main(void) {{\n    return {expression};\n}}\n").functions[0].accept(ASTLowerer(StackAllocator()), instructions)
+    return instructions
@@ -0,0 +1,121 @@
+# type: ignore
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.IntermediateGenerator.IRGenerator import IRGenerator
+from modules.IntermediateGenerator.optimizations.ConstantFolder import ConstantFolder, constant_value
+from modules.lexer.LexerService import LexerService
+from modules.models.nodes.AST.ASTArena import ASTArena
+from modules.models.nodes.AST.Operands.BinaryOperators import BinaryAdd, BinaryMinus, BinaryMultiply
+from modules.models.nodes.AST.Operands.BitwiseOperators import BitwiseAnd, BitwiseXor
+from modules.models.nodes.AST.Operands.ConstantInteger import ConstantInteger
+from modules.models.nodes.AST.Operands.UnaryOperators import BitwiseNot, LogicalNot, Negate
+from modules.models.nodes.AST.Operands.Variable import Variable
+from modules.models.nodes.AST.Statements.ReturnStatementNode import ReturnStatementNode
+from modules.parser.ParserServiceV2 import ParserServiceV2
+from modules.parser.Services.BufferedTokenIteratorService import BufferedTokenIteratorService
+
+
+def parse(expression, lazy_bodies=False):
+    source = f"int main(void) {{\n    return {expression};\n}}\n"
+    parser = ParserServiceV2(BufferedTokenIteratorService(), lazy_bodies=lazy_bodies)
+    return parser.parse_lex(LexerService().buffer_text(source))
+
+
+def constant(value):
+    return ConstantInteger(value=str(value))
+
+
+class TestConstantFolder(unittest.TestCase):
+    def fold_expression(self, expression):
+        """Fold the returned expression of a one line program and give back the folded expression."""
+        return ConstantFolder().fold(parse(expression)).functions[0].body.value
+
+    def assertFoldsTo(self, expression, value):
+        self.assertEqual(constant_value(self.fold_expression(expression)), value, expression)
+
+    def test_folds_nested_arithmetic(self):
+        """Test that whole constant expressions collapse to one constant."""
+        self.assertFoldsTo("2 + 3 * 4", 14)
+        self.assertFoldsTo("(1 + 2) * -3 % 4 << (5 == 6) || ~7 && 8 >= 9", 1)
+        self.assertFoldsTo("~(12) ^ 10 | 3 & 6", -5)
+
+    def test_wraps_to_32_bits(self):
+        """Test that results overflow like 32-bit ints."""
+        self.assertFoldsTo("2147483647 + 1", -2 ** 31)
+        self.assertFoldsTo("65536 * 65536", 0)
+        self.assertFoldsTo("1 << 31", -2 ** 31)
+        self.assertFoldsTo("4294967295 + 0", -1)
+
+    def test_division_truncates_toward_zero(self):
+        """Test C division and remainder signs."""
+        self.assertFoldsTo("-7 / 2", -3)
+        self.assertFoldsTo("-7 % 2", -1)
+        self.assertFoldsTo("7 % -2", 1)
+
+    def test_octal_constants(self):
+        """Test that a leading zero is read as octal, like the assembler does."""
+        self.assertFoldsTo("010 + 1", 9)
+
+    def test_keeps_operations_left_to_run_time(self):
+        """Test that traps, out of range shifts and disagreeing right shifts are not folded."""
+        for expression in ("1 / 0", "5 % (2 - 2)", "(0 - 2147483647 - 1) / -1", "1 << 32", "-8 >> 1"):
+            self.assertIsNone(constant_value(self.fold_expression(expression)), expression)
+        self.assertFoldsTo("8 >> 1", 4)
+
+    def test_logical_not_is_not_folded(self):
+        """Test that LogicalNot keeps its run time meaning."""
+        tree = ReturnStatementNode(value=LogicalNot(operand=constant(4)))
+        self.assertEqual(ConstantFolder().fold(tree), tree)
+
+    def test_identities(self):
+        """Test algebraic identities on operands that are not constant."""
+        x = Variable(name="x")
+        cases = [
+            (BinaryAdd(left=x, right=constant(0)), x),
+            (BinaryAdd(left=constant(0), right=x), x),
+            (BinaryMinus(left=x, right=constant(0)), x),
+            (BinaryMultiply(left=constant(1), right=x), x),
+            (BinaryMultiply(left=x, right=constant(0)), constant(0)),
+            (BitwiseAnd(left=constant(0), right=x), constant(0)),
+            (BitwiseXor(left=x, right=Variable(name="x")), constant(0)),
+            (Negate(operand=Negate(operand=x)), x),
+            (BitwiseNot(operand=BitwiseNot(operand=x)), x),
+            (BinaryMinus(left=constant(0), right=x), BinaryMinus(left=constant(0), right=x)),
+            (BitwiseXor(left=x, right=Variable(name="y")), BitwiseXor(left=x, right=Variable(name="y"))),
+        ]
+        for tree, expected in cases:
+            self.assertEqual(ConstantFolder().fold(tree), expected, tree)
+
+    def test_unchanged_subtrees_are_reused(self):
+        """Test that a tree with nothing to fold comes back as the same object."""
+        tree = ReturnStatementNode(value=BinaryAdd(left=Variable(name="x"), right=Variable(name="y")))
+        self.assertIs(ConstantFolder().fold(tree), tree)
+
+    def test_deep_expression(self):
+        """Test that folding does not recurse."""
+        tree = constant(5)
+        for _ in range(sys.getrecursionlimit() * 3):
+            tree = Negate(operand=BitwiseNot(operand=tree))
+        self.assertEqual(ConstantFolder().fold(tree), constant(5 + sys.getrecursionlimit() * 3))
+
+    def test_arena_views_and_lazy_bodies(self):
+        """Test that views and unparsed bodies fold like plain trees."""
+        expected = ConstantFolder().fold(parse("2 + 3 * 4"))
+        self.assertEqual(ConstantFolder().fold(ASTArena.from_tree(parse("2 + 3 * 4")).root()), expected)
+        self.assertEqual(ConstantFolder().fold(parse("2 + 3 * 4", lazy_bodies=True)), expected)
+
+    def test_optimized_lowering_is_smaller(self):
+        """Test that IRGenerator(optimize=True) emits fewer instructions and a smaller frame."""
+        program = parse("2 + 3 * 4")
+        plain = IRGenerator().parse_ast(program).functions[0]
+        optimized = IRGenerator(optimize=True).parse_ast(program).functions[0]
+        self.assertLess(len(optimized.instructions), len(plain.instructions))
+        self.assertLess(optimized.offset, plain.offset)
+        self.assertEqual(optimized.instructions[0].src.value, "14")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+# type: ignore
+import random
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.IntermediateGenerator.optimizations.ControlFlowGraph import BasicBlock, ControlFlowGraph
+from modules.models.nodes.IR.Statements.IRJump import IRJump, IRJumpIfNotZero, IRJumpIfZero, IRLabel
+from modules.models.nodes.IR.Statements.IRReturnValue import IRreturn
+from tests.IntermediateGenerator.fixtures import AX, R11, copy, immediate
+
+
+def load(value):
+    return copy(immediate(value), AX)
+
+
+# 0: entry, 1: then, 2: else, 3: join with a loop back to itself, 4: exit
+DIAMOND = [
+    load(0),
+    IRJumpIfZero(src=R11, label="else"),
+    load(1),
+    IRJump(label="join"),
+    IRLabel(name="else"),
+    load(2),
+    IRLabel(name="join"),
+    IRJumpIfNotZero(src=R11, label="join"),
+    IRreturn(value=AX),
+]
+
+
+def random_graph(rng, size):
+    blocks = [BasicBlock(index, []) for index in range(size)]
+    for block in blocks:
+        for successor in rng.sample(range(size), rng.randint(0, min(3, size))):
+            block.successors.append(successor)
+            blocks[successor].predecessors.append(block.index)
+    return ControlFlowGraph(blocks)
+
+
+def dominator_sets(graph):
+    """Textbook iterative dominator sets to check against"""
+    reachable = set(graph.postorder())
+    dominators = {index: set(reachable) for index in reachable}
+    dominators[graph.entry] = {graph.entry}
+    changed = True
+    while changed:
+        changed = False
+        for index in reachable - {graph.entry}:
+            predecessors = [dominators[p] for p in graph.blocks[index].predecessors if p in reachable]
+            new = set.intersection(*predecessors) | {index}
+            if new != dominators[index]:
+                dominators[index] = new
+                changed = True
+    return dominators
+
+
+class TestControlFlowGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = ControlFlowGraph.from_instructions(list(DIAMOND))
+
+    def test_blocks_and_edges(self):
+        """Test that blocks split at labels and jumps and edges follow targets and fall throughs."""
+        self.assertEqual([len(block.instructions) for block in self.graph], [2, 2, 2, 2, 1])
+        self.assertEqual([block.label for block in self.graph], [None, None, "else", "join", None])
+        self.assertEqual([block.successors for block in self.graph], [[2, 1], [3], [3], [3, 4], []])
+        self.assertEqual([block.predecessors for block in self.graph], [[], [0], [0], [1, 2, 3], [3]])
+        self.assertEqual([block.fall_through for block in self.graph], [1, None, 3, 4, None])
+
+    def test_unknown_label(self):
+        """Test that a jump to a label the function does not have is refused."""
+        with self.assertRaises(KeyError):
+            ControlFlowGraph.from_instructions([IRJump(label="nowhere")])
+
+    def test_orders(self):
+        """Test postorder, reverse postorder and that unreachable blocks are left out."""
+        graph = ControlFlowGraph.from_instructions(list(DIAMOND) + [load(3), IRreturn(value=AX)])
+        self.assertEqual(len(graph), 6)
+        self.assertEqual(graph.postorder(), [4, 3, 2, 1, 0])
+        self.assertEqual(graph.reverse_postorder(), [0, 1, 2, 3, 4])
+
+    def test_dominators(self):
+        """Test immediate dominators, the tree built from them and dominance queries."""
+        self.assertEqual(self.graph.immediate_dominators(), [None, 0, 0, 0, 3])
+        tree = self.graph.dominator_tree()
+        self.assertEqual(tree.children, [[1, 2, 3], [], [], [4], []])
+        self.assertEqual(tree.preorder(), [0, 1, 2, 3, 4])
+        self.assertTrue(tree.dominates(3, 4))
+        self.assertTrue(tree.dominates(3, 3))
+        self.assertFalse(tree.dominates(1, 3))
+        self.assertFalse(tree.dominates(4, 3))
+
+    def test_dominators_match_iterative_sets(self):
+        """Test Lengauer-Tarjan against the textbook data flow solution on random graphs."""
+        rng = random.Random(24)
+        for _ in range(300):
+            graph = random_graph(rng, rng.randint(1, 12))
+            tree = graph.dominator_tree()
+            expected = dominator_sets(graph)
+            for block in range(len(graph)):
+                for dominator in range(len(graph)):
+                    self.assertEqual(tree.dominates(dominator, block), dominator in expected.get(block, ()))
+
+    def test_dominance_frontiers(self):
+        """Test that the frontiers are the join blocks where each block's dominance stops."""
+        self.assertEqual(self.graph.dominance_frontiers(), [set(), {3}, {3}, {3}, set()])
+
+    def test_split_edge(self):
+        """Test that a block put on the fall through edge of a conditional jump is jumped to and jumps on."""
+        graph = ControlFlowGraph.from_instructions(list(DIAMOND))
+        block = graph.split_edge(3, 4)
+        self.assertEqual(block.index, 5)
+        self.assertEqual((graph.blocks[3].successors, graph.blocks[3].fall_through), ([3, 5], 5))
+        self.assertEqual((block.predecessors, block.successors, graph.blocks[4].predecessors), ([3], [4], [5]))
+        instructions = graph.to_instructions()
+        self.assertEqual(instructions[-6:], [
+            IRJumpIfNotZero(src=R11, label="join"),
+            IRJump(label="lbl.block.5"),
+            IRLabel(name="lbl.block.4"),
+            IRreturn(value=AX),
+            IRLabel(name="lbl.block.5"),
+            IRJump(label="lbl.block.4"),
+        ])
+        graph = ControlFlowGraph.from_instructions(list(DIAMOND))
+        graph.split_edge(0, 2)
+        self.assertEqual(graph.blocks[0].instructions[-1], IRJumpIfZero(src=R11, label="lbl.block.5"))
+
+    def test_ensure_label_is_unique(self):
+        """Test that a label made for a block does not reuse a name a renumbered block already has."""
+        graph = ControlFlowGraph.from_instructions([IRLabel(name="lbl.block.1")] + DIAMOND)
+        self.assertEqual(graph.ensure_label(1), "lbl.block.1.1")
+        self.assertEqual(graph.ensure_label(1), "lbl.block.1.1")
+        self.assertEqual(graph.ensure_label(2), "else")
+
+    def test_round_trip(self):
+        """Test that laying the blocks out in their own order gives the instructions back."""
+        self.assertEqual(self.graph.to_instructions(), DIAMOND)
+
+    def test_reordering_keeps_fall_throughs(self):
+        """Test that blocks moved away from their fall through jump to it, labelling it if needed."""
+        instructions = self.graph.to_instructions([0, 2, 3, 4, 1])
+        self.assertEqual(instructions[:3], [load(0), IRJumpIfZero(src=R11, label="else"), IRJump(label="lbl.block.1")])
+        self.assertEqual(instructions[-3:], [IRLabel(name="lbl.block.1"), load(1), IRJump(label="join")])
+        self.assertEqual(len(ControlFlowGraph.from_instructions(instructions)), 6)
+
+    def test_long_functions(self):
+        """Test that a function thousands of blocks deep is handled without recursion."""
+        instructions = []
+        for index in range(sys.getrecursionlimit() * 3):
+            instructions += [IRLabel(name=f"l{index}"), IRJumpIfZero(src=R11, label=f"l{index}")]
+        instructions.append(IRreturn(value=AX))
+        graph = ControlFlowGraph.from_instructions(instructions)
+        self.assertEqual(graph.reverse_postorder(), list(range(len(graph))))
+        idom = graph.immediate_dominators()
+        self.assertEqual(idom[-1], len(graph) - 2)
+        self.assertTrue(graph.dominator_tree().dominates(0, len(graph) - 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
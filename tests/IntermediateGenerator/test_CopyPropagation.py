@@ -0,0 +1,113 @@
+# type: ignore
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.IntermediateGenerator.optimizations.CopyPropagation import CopyPropagation
+from modules.IntermediateGenerator.visitors.StackAllocator import StackAllocator
+from modules.models.nodes.IR.Operands.BinaryInstruction import AddInstruction, DivInstruction
+from modules.models.nodes.IR.Operands.Pseudo import Pseudo
+from modules.models.nodes.IR.Operands.UnaryInstruction import UnaryInstruction, UnaryOperationEnum
+from modules.models.nodes.IR.Statements.IRCopy import IRCopy
+from modules.models.nodes.IR.Statements.IRJump import IRJumpIfZero, IRLabel
+from modules.models.nodes.IR.Statements.IRReturnValue import IRreturn
+from tests.IntermediateGenerator.fixtures import AX, R10, R11, copy, generate, immediate, tmp
+
+
+class TestCopyPropagation(unittest.TestCase):
+    def run_pass(self, instructions):
+        return CopyPropagation().run(instructions)
+
+    def test_forwards_immediates_where_x86_takes_them(self):
+        """Test that an immediate replaces a temporary in a movl but not as an idivl or jump operand."""
+        result = self.run_pass([
+            copy(immediate(5), tmp(0)),
+            copy(tmp(0), AX),
+            DivInstruction(src=tmp(0), dest=R11),
+            IRJumpIfZero(src=tmp(0), label="end"),
+        ])
+        self.assertEqual(result[1], copy(immediate(5), AX))
+        self.assertEqual(result[2].src, tmp(0))
+        self.assertEqual(result[3].src, tmp(0))
+
+    def test_coalesces_copy_into_fresh_temporary(self):
+        """Test that `t1 := t0; not t1` operates on t0 directly when t0 is not used again."""
+        neg = lambda operand: UnaryInstruction(operator=UnaryOperationEnum.NEG, operand=operand)
+        bitwise_not = lambda operand: UnaryInstruction(operator=UnaryOperationEnum.BITWISE_NOT, operand=operand)
+        result = self.run_pass([
+            copy(R11, tmp(0)),
+            neg(tmp(0)),
+            copy(tmp(0), tmp(1)),
+            bitwise_not(tmp(1)),
+            copy(tmp(1), AX),
+            IRreturn(value=AX),
+        ])
+        self.assertEqual(result, [copy(R11, tmp(0)), neg(tmp(0)), bitwise_not(tmp(0)), copy(tmp(0), AX), IRreturn(value=AX)])
+
+    def test_drops_unread_copies(self):
+        """Test that copies into temporaries nobody reads are removed, copies into registers are kept."""
+        result = self.run_pass([copy(immediate(1), tmp(0)), copy(immediate(2), R10), IRreturn(value=R10)])
+        self.assertEqual(result, [copy(immediate(2), R10), IRreturn(value=R10)])
+
+    def test_overwritten_source_is_not_forwarded(self):
+        """Test that a temporary is not replaced by a register that changed since the copy."""
+        result = self.run_pass([
+            copy(R11, tmp(0)),
+            AddInstruction(src=R11, dest=immediate(1)),
+            copy(tmp(0), AX),
+            copy(R11, R10),
+            IRreturn(value=AX),
+        ])
+        self.assertEqual(result[2], copy(tmp(0), AX))
+
+    def test_stack_to_stack_copy_clobbers_r10(self):
+        """Test that a copy between two stack temporaries counts as a write to R10."""
+        result = self.run_pass([
+            copy(R10, tmp(0)),
+            copy(R11, tmp(1)),
+            UnaryInstruction(operator=UnaryOperationEnum.NEG, operand=tmp(1)),
+            copy(tmp(1), tmp(2)),
+            copy(tmp(0), AX),
+            AddInstruction(src=tmp(2), dest=tmp(1)),
+            copy(tmp(2), R11),
+            IRreturn(value=AX),
+        ])
+        self.assertIn(copy(tmp(1), tmp(2)), result)
+        self.assertIn(copy(tmp(0), AX), result)
+
+    def test_temporaries_shared_across_blocks_are_kept(self):
+        """Test that a temporary read after a label keeps its copy."""
+        instructions = [
+            copy(immediate(1), tmp(0)),
+            IRJumpIfZero(src=R10, label="end"),
+            IRLabel(name="end"),
+            copy(tmp(0), AX),
+            IRreturn(value=AX),
+        ]
+        self.assertEqual(self.run_pass(list(instructions)), instructions)
+
+    def test_generator_uses_fewer_copies_and_slots(self):
+        """Test that optimized functions need fewer movl and a smaller frame."""
+        source = "int main(void) {\n    return -(~(1 + 2) * 3) / (4 - 5) + (6 < 7);\n}\n"
+        plain, optimized = generate(source, False), generate(source, True)
+        copies = lambda function: sum(isinstance(instruction, IRCopy) for instruction in function.instructions)
+        self.assertLess(copies(optimized), copies(plain))
+        self.assertLess(optimized.offset, plain.offset)
+
+
+class TestStackAllocatorCompact(unittest.TestCase):
+    def test_compact(self):
+        """Test that kept temporaries get consecutive slots and registers keep theirs."""
+        allocator = StackAllocator()
+        names = [allocator.allocate_pseudo(allocator.next_temp_name()).value for _ in range(4)]
+        allocator.compact([names[3], names[1], names[3]])
+        self.assertEqual(allocator.resolve_pseudo(Pseudo(value=names[3])).offset, -4)
+        self.assertEqual(allocator.resolve_pseudo(Pseudo(value=names[1])).offset, -8)
+        self.assertEqual(allocator.stack_offset, -8)
+        with self.assertRaises(KeyError):
+            allocator.resolve_pseudo(Pseudo(value=names[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+# type: ignore
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.IntermediateGenerator.optimizations.DeadStoreElimination import DeadStoreElimination
+from modules.models.nodes.IR.Operands.BinaryInstruction import AddInstruction, DivInstruction
+from modules.models.nodes.IR.Operands.RelationalInstruction import LessThanRelationInstruction
+from modules.models.nodes.IR.Statements.IRJump import IRJump, IRJumpIfZero, IRLabel
+from modules.models.nodes.IR.Statements.IRReturnValue import IRreturn
+from tests.IntermediateGenerator.fixtures import AX, R10, R11, copy, generate, immediate, tmp
+
+
+class TestDeadStoreElimination(unittest.TestCase):
+    def run_pass(self, instructions):
+        return DeadStoreElimination().run(instructions)
+
+    def test_overwritten_stores_are_removed(self):
+        """Test that a register written again before any read loses its first store."""
+        result = self.run_pass([copy(immediate(1), R11), copy(immediate(2), R11), copy(R11, AX), IRreturn(value=AX)])
+        self.assertEqual(result, [copy(immediate(2), R11), copy(R11, AX), IRreturn(value=AX)])
+
+    def test_dead_chains_go_at_once(self):
+        """Test that stores only feeding other dead stores are removed together."""
+        result = self.run_pass([
+            copy(immediate(1), tmp(0)),
+            copy(tmp(0), R11),
+            AddInstruction(src=R11, dest=immediate(2)),
+            copy(R11, tmp(1)),
+            copy(immediate(3), AX),
+            IRreturn(value=AX),
+        ])
+        self.assertEqual(result, [copy(immediate(3), AX), IRreturn(value=AX)])
+
+    def test_relation_keeps_ax_zeroing(self):
+        """Test that clearing AX before a relation survives, the relation only writes AL."""
+        instructions = [
+            copy(immediate(0), AX),
+            copy(immediate(1), R10),
+            LessThanRelationInstruction(src=R10, dest=immediate(2)),
+            IRreturn(value=AX),
+        ]
+        self.assertEqual(self.run_pass(list(instructions)), instructions)
+
+    def test_division_is_kept(self):
+        """Test that an unused division stays, it can trap."""
+        instructions = [copy(immediate(1), AX), copy(immediate(0), R11), DivInstruction(src=R11, dest=AX), copy(immediate(2), AX), IRreturn(value=AX)]
+        self.assertEqual(self.run_pass(list(instructions)), instructions)
+
+    def test_stack_to_stack_copy_overwrites_r10(self):
+        """Test that R10 is not live across a copy between stack temporaries."""
+        result = self.run_pass([
+            copy(immediate(1), R10),
+            copy(R11, tmp(0)),
+            copy(tmp(0), tmp(1)),
+            copy(tmp(1), R11),
+            copy(R10, AX),
+            IRreturn(value=AX),
+        ])
+        self.assertNotIn(copy(immediate(1), R10), result)
+        self.assertIn(copy(tmp(0), tmp(1)), result)
+
+    def test_liveness_across_blocks(self):
+        """Test that a store read only after a jump is kept and one read by no path is removed."""
+        result = self.run_pass([
+            copy(immediate(1), tmp(0)),
+            copy(immediate(5), tmp(1)),
+            IRJumpIfZero(src=R11, label="other"),
+            copy(tmp(0), AX),
+            IRJump(label="end"),
+            IRLabel(name="other"),
+            copy(immediate(2), AX),
+            IRLabel(name="end"),
+            IRreturn(value=AX),
+        ])
+        self.assertIn(copy(immediate(1), tmp(0)), result)
+        self.assertNotIn(copy(immediate(5), tmp(1)), result)
+
+    def test_generator_drops_dead_logical_arm(self):
+        """Test that the optimized program keeps only what the returned value depends on."""
+        source = "int main(void) {\n    return (0 && (-8 >> 1)) + 3;\n}\n"
+        plain, optimized = generate(source, False), generate(source, True)
+        self.assertLess(len(optimized.instructions), len(plain.instructions))
+        self.assertFalse(any(isinstance(instruction, (IRJump, IRJumpIfZero, IRLabel)) for instruction in optimized.instructions))
+        self.assertEqual(optimized.offset, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+# type: ignore
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.codeGenerator.AssemblyGenerator import AssemblyGenerator
+from modules.IntermediateGenerator.optimizations.ControlFlowGraph import ControlFlowGraph
+from modules.IntermediateGenerator.optimizations.CopyPropagation import CopyPropagation
+from modules.IntermediateGenerator.optimizations.DeadStoreElimination import DeadStoreElimination
+from modules.IntermediateGenerator.optimizations.InstructionEffects import phi_reads, reads, writes
+from modules.IntermediateGenerator.optimizations.StaticSingleAssignment import StaticSingleAssignment
+from modules.IntermediateGenerator.optimizations.UnreachableCodeElimination import UnreachableCodeElimination
+from modules.models.nodes.IR.IRProgramNode import IRProgramNode
+from modules.models.nodes.IR.Operands.Pseudo import Pseudo
+from modules.models.nodes.IR.Operands.UnaryInstruction import UnaryInstruction, UnaryOperationEnum
+from modules.models.nodes.IR.Statements.IRCopy import IRCopy
+from modules.models.nodes.IR.Statements.IRJump import IRJump, IRJumpIfNotZero, IRJumpIfZero, IRLabel
+from modules.models.nodes.IR.Statements.IRPhi import IRPhi
+from modules.models.nodes.IR.Statements.IRReturnValue import IRreturn
+from tests.IntermediateGenerator.fixtures import AX, R11, copy, generate, immediate, lower, tmp
+
+
+def diamond(result, use_result=True):
+    """Two arms writing `result`, joined before it is returned"""
+    return [
+        IRJumpIfZero(src=R11, label="else"),
+        copy(immediate(1), result),
+        IRJump(label="join"),
+        IRLabel(name="else"),
+        copy(immediate(2), result),
+        IRLabel(name="join"),
+        copy(result if use_result else immediate(3), AX),
+        IRreturn(value=AX),
+    ]
+
+
+def written_names(graph):
+    names = []
+    for block in graph:
+        for instruction in block.instructions:
+            if isinstance(instruction, IRPhi):
+                names.append(instruction.dest.value)
+            elif isinstance(instruction, (IRCopy, UnaryInstruction)):
+                target = instruction.dest if isinstance(instruction, IRCopy) else instruction.operand
+                if isinstance(target, Pseudo):
+                    names.append(target.value)
+    return names
+
+
+class TestStaticSingleAssignment(unittest.TestCase):
+    def test_phi_at_join(self):
+        """Test that a temporary written in both arms gets a phi merging one version from each."""
+        graph = StaticSingleAssignment().construct(diamond(tmp(0)))
+        join = graph.blocks[3]
+        phi = join.instructions[1]
+        self.assertIsInstance(phi, IRPhi)
+        self.assertEqual(phi.sources, {"lbl.block.1": tmp("0.1"), "else": tmp("0.2")})
+        self.assertEqual(join.instructions[2], copy(phi.dest, AX))
+        names = written_names(graph)
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_pruned(self):
+        """Test that no phi is placed for a temporary nobody reads after the join."""
+        graph = StaticSingleAssignment().construct(diamond(tmp(0), use_result=False))
+        self.assertFalse(any(isinstance(instruction, IRPhi) for block in graph for instruction in block.instructions))
+
+    def test_in_place_temporaries_keep_their_name(self):
+        """Test that temporaries a unary instruction updates are not renamed."""
+        instructions = [copy(R11, tmp(0)), UnaryInstruction(operator=UnaryOperationEnum.NEG, operand=tmp(0)), copy(tmp(0), AX), IRreturn(value=AX)]
+        graph = StaticSingleAssignment().construct(list(instructions))
+        self.assertEqual(graph.to_instructions(), instructions)
+
+    def test_round_trip_needs_no_copies(self):
+        """Test that leaving SSA straight after entering it coalesces every phi away."""
+        instructions = lower("(1 && 2) + (3 || 0 < 1) - ~(4 && 5)")
+        ssa = StaticSingleAssignment()
+        result = ssa.destruct(ssa.construct(list(instructions)))
+        self.assertGreater(ssa.phis, 0)
+        self.assertEqual(ssa.copies, 0)
+        self.assertEqual([instruction.__class__ for instruction in result], [instruction.__class__ for instruction in instructions])
+        self.assertFalse(any(isinstance(instruction, IRPhi) for instruction in result))
+
+    def test_interfering_phis_become_parallel_copies(self):
+        """Test the swap problem: phis exchanging two values on a loop edge need a saved temporary."""
+        instructions = [
+            IRLabel(name="entry"),
+            copy(immediate(1), tmp("a.1")),
+            copy(immediate(2), tmp("b.1")),
+            IRLabel(name="loop"),
+            IRPhi(dest=tmp("a.2"), sources={"entry": tmp("a.1"), "loop": tmp("b.2")}),
+            IRPhi(dest=tmp("b.2"), sources={"entry": tmp("b.1"), "loop": tmp("a.2")}),
+            IRJumpIfNotZero(src=R11, label="loop"),
+            copy(tmp("a.2"), AX),
+            IRreturn(value=AX),
+        ]
+        ssa = StaticSingleAssignment()
+        result = ssa.destruct(ControlFlowGraph.from_instructions(instructions))
+        graph = ControlFlowGraph.from_instructions(result)
+        # The entry versions coalesce with the phis, the back edge now goes through a new block
+        self.assertEqual(result[1:3], [copy(immediate(1), tmp("a.2")), copy(immediate(2), tmp("b.2"))])
+        self.assertEqual(graph.blocks[1].instructions[-1], IRJumpIfNotZero(src=R11, label="lbl.block.3"))
+        back_edge = graph.blocks[-1].instructions
+        self.assertEqual(back_edge[-1], IRJump(label="loop"))
+        values = {"tmp.a.2": "A", "tmp.b.2": "B"}
+        for instruction in back_edge[1:-1]:
+            values[instruction.dest.value] = values[instruction.src.value]
+        self.assertEqual((values["tmp.a.2"], values["tmp.b.2"]), ("B", "A"))
+        self.assertEqual(ssa.copies, 3)
+
+    def test_phi_effects(self):
+        """Test that a phi writes its dest on entry and reads each source at the end of that source's predecessor."""
+        join = StaticSingleAssignment().construct(diamond(tmp(0))).blocks[3].instructions
+        self.assertEqual((reads(join[1]), writes(join[1])), ([], ["tmp.0.3"]))
+        self.assertEqual(phi_reads(join, "lbl.block.1"), ["tmp.0.1"])
+        self.assertEqual(phi_reads(join, "else"), ["tmp.0.2"])
+        self.assertEqual(phi_reads(join, "join"), [])
+
+    def test_copy_propagation_in_ssa_form(self):
+        """Test that copies feeding a phi are left alone, their temporaries are read in another block."""
+        instructions = StaticSingleAssignment().construct(diamond(tmp(0))).to_instructions()
+        self.assertEqual(CopyPropagation().run(list(instructions)), instructions)
+
+    def test_dead_store_elimination_in_ssa_form(self):
+        """Test that a phi keeps the stores to its sources alive, and goes with them once its dest is dead."""
+        ssa = StaticSingleAssignment()
+        instructions = ssa.construct(diamond(tmp(0))).to_instructions()
+        self.assertEqual(DeadStoreElimination().run(list(instructions)), instructions)
+        instructions[-2] = copy(immediate(3), AX)
+        elimination = DeadStoreElimination()
+        result = elimination.run(list(instructions))
+        self.assertEqual(elimination.removed, 3)
+        self.assertFalse(any(isinstance(instruction, IRPhi) for instruction in result))
+        self.assertEqual(ssa.destruct(ControlFlowGraph.from_instructions(result)), [
+            IRJumpIfZero(src=R11, label="else"),
+            IRJump(label="join"),
+            IRLabel(name="else"),
+            IRLabel(name="join"),
+            copy(immediate(3), AX),
+            IRreturn(value=AX),
+        ])
+
+    def test_unreachable_code_elimination_in_ssa_form(self):
+        """Test that phis forget the operands of removed predecessors and keep the labels they name."""
+        ssa = StaticSingleAssignment()
+        instructions = UnreachableCodeElimination().run(ssa.construct([copy(immediate(0), R11)] + diamond(tmp(0))).to_instructions())
+        self.assertEqual(instructions[:5], [
+            copy(immediate(0), R11),
+            IRLabel(name="else"),
+            copy(immediate(2), tmp("0.2")),
+            IRLabel(name="join"),
+            IRPhi(dest=tmp("0.3"), sources={"else": tmp("0.2")}),
+        ])
+        result = ssa.destruct(ControlFlowGraph.from_instructions(instructions))
+        self.assertEqual(result[2], copy(immediate(2), tmp("0.3")))
+        self.assertFalse(any(isinstance(instruction, IRPhi) for instruction in result))
+
+    def test_ir_generator_ssa_stage(self):
+        """Test that IRGenerator(ssa=True) compiles branches through SSA form down to assembly."""
+        source = "int main(void) {\n    return (1 < 2 && 3 > 4) + (2 || 0) * 10 - (0 || 3 == 3);\n}\n"
+        plain, ssa = generate(source, False), generate(source, False, ssa=True)
+        self.assertLess(len(ssa.instructions), len(plain.instructions))
+        self.assertLess(ssa.offset, plain.offset)
+        self.assertFalse(any(isinstance(instruction, IRPhi) for instruction in ssa.instructions))
+        asm = []
+        AssemblyGenerator().generate(IRProgramNode(functions=[ssa]), asm)
+        self.assertNotIn("tmp.", "".join(asm))
+        self.assertEqual(generate(source, True, ssa=True), generate(source, True))
+
+    def test_long_functions(self):
+        """Test that thousands of joins are handled without recursion."""
+        instructions = []
+        for index in range(sys.getrecursionlimit() * 2):
+            instructions += [
+                IRJumpIfZero(src=R11, label=f"else.{index}"),
+                copy(immediate(1), tmp(index)),
+                IRJump(label=f"join.{index}"),
+                IRLabel(name=f"else.{index}"),
+                copy(immediate(2), tmp(index)),
+                IRLabel(name=f"join.{index}"),
+                copy(tmp(index), R11),
+            ]
+        instructions.append(IRreturn(value=AX))
+        ssa = StaticSingleAssignment()
+        result = ssa.destruct(ssa.construct(list(instructions)))
+        self.assertEqual((ssa.phis, ssa.copies), (sys.getrecursionlimit() * 2, 0))
+        self.assertEqual(len(result), len(instructions))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+# type: ignore
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.IntermediateGenerator.optimizations.UnreachableCodeElimination import UnreachableCodeElimination
+from modules.models.nodes.IR.Operands.UnaryInstruction import UnaryInstruction, UnaryOperationEnum
+from modules.models.nodes.IR.Statements.IRJump import IRJump, IRJumpIfNotZero, IRJumpIfZero, IRLabel
+from modules.models.nodes.IR.Statements.IRReturnValue import IRreturn
+from tests.IntermediateGenerator.fixtures import AX, R11, copy, immediate, tmp
+
+
+def logical_and(left):
+    """What ASTLowerer emits for `left && R11`, returning the result"""
+    result = tmp(0)
+    return [
+        copy(left, R11),
+        IRJumpIfZero(src=R11, label="lbl.false.1"),
+        copy(R11, R11),
+        IRJumpIfZero(src=R11, label="lbl.false.1"),
+        copy(immediate(1), result),
+        IRJump(label="lbl.end.1"),
+        IRLabel(name="lbl.false.1"),
+        copy(immediate(0), result),
+        IRLabel(name="lbl.end.1"),
+        copy(result, AX),
+        IRreturn(value=AX),
+    ]
+
+
+class TestUnreachableCodeElimination(unittest.TestCase):
+    def run_pass(self, instructions):
+        return UnreachableCodeElimination().run(instructions)
+
+    def test_code_after_return(self):
+        """Test that instructions following a return without a label are dropped."""
+        result = self.run_pass([copy(immediate(1), AX), IRreturn(value=AX), copy(immediate(2), AX), IRreturn(value=AX)])
+        self.assertEqual(result, [copy(immediate(1), AX), IRreturn(value=AX)])
+
+    def test_known_false_branch_is_taken(self):
+        """Test that `0 && x` jumps straight to the false arm and the rest disappears with its labels."""
+        result = self.run_pass(logical_and(immediate(0)))
+        self.assertEqual(result, [copy(immediate(0), R11), copy(immediate(0), tmp(0)), copy(tmp(0), AX), IRreturn(value=AX)])
+
+    def test_known_true_branch_falls_through(self):
+        """Test that a jump on a nonzero constant is removed and an octal zero counts as zero."""
+        result = self.run_pass([
+            copy(immediate(7), R11),
+            IRJumpIfZero(src=R11, label="skip"),
+            copy(immediate(1), AX),
+            IRLabel(name="skip"),
+            copy(immediate("00"), R11),
+            IRJumpIfNotZero(src=R11, label="end"),
+            copy(immediate(2), AX),
+            IRLabel(name="end"),
+            IRreturn(value=AX),
+        ])
+        self.assertEqual(result, [copy(immediate(7), R11), copy(immediate(1), AX), copy(immediate("00"), R11), copy(immediate(2), AX), IRreturn(value=AX)])
+
+    def test_unknown_branch_is_kept(self):
+        """Test that a jump on a value written by an instruction other than a constant copy stays."""
+        instructions = [
+            copy(immediate(0), R11),
+            UnaryInstruction(operator=UnaryOperationEnum.BITWISE_NOT, operand=R11),
+            IRJumpIfZero(src=R11, label="end"),
+            copy(immediate(1), AX),
+            IRLabel(name="end"),
+            IRreturn(value=AX),
+        ]
+        self.assertEqual(self.run_pass(list(instructions)), instructions)
+
+    def test_branch_is_not_folded_across_blocks(self):
+        """Test that constants known before a label are forgotten after it."""
+        instructions = [
+            copy(immediate(0), R11),
+            IRLabel(name="loop"),
+            IRJumpIfNotZero(src=R11, label="loop"),
+            IRreturn(value=AX),
+        ]
+        self.assertEqual(self.run_pass(list(instructions)), instructions)
+
+
+if __name__ == "__main__":
+    unittest.main()
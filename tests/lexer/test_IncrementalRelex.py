@@ -0,0 +1,118 @@
+# type: ignore
+import random
+import tempfile
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.lexer.LexerService import LexerService
+
+SOURCE = """int main(void) {
+    return 1 < 2;
+}
+/* helper */
+int other(void) {
+    return 3 + 4;
+}
+"""
+
+
+class TestIncrementalRelex(unittest.TestCase):
+    def setUp(self):
+        self.lexer = LexerService()
+
+    def columns(self, buffer):
+        return [(buffer.kinds[i], buffer.starts[i], buffer.lengths[i], buffer.lines[i]) for i in range(len(buffer))]
+
+    def assert_edit(self, source, offset, removed, inserted):
+        buffer = self.lexer.buffer_source(source)
+        self.lexer.relex(buffer, offset, removed, inserted)
+        edited = source[:offset] + inserted + source[offset + removed:]
+        self.assertEqual(buffer.source, edited)
+        self.assertEqual(self.columns(buffer), self.columns(self.lexer.buffer_source(edited)))
+        return buffer
+
+    def test_edit_merges_with_previous_token(self):
+        """Test that '<' followed by an inserted '=' becomes '<='."""
+        offset = SOURCE.index("< 2") + 1
+        buffer = self.assert_edit(SOURCE, offset, 0, "=")
+        self.assertIn("<=", [t.value for t in buffer])
+
+    def test_edit_inside_identifier(self):
+        """Test renaming part of an identifier."""
+        offset = SOURCE.index("other") + 2
+        buffer = self.assert_edit(SOURCE, offset, 3, "HER_FN")
+        self.assertIn("otHER_FN", [t.value for t in buffer])
+
+    def test_inserted_newlines_shift_later_lines(self):
+        """Test that tokens after an inserted newline move down a line."""
+        buffer = self.assert_edit(SOURCE, SOURCE.index("return"), 0, "\n\n")
+        self.assertEqual(buffer[-1].lineNumber, 9)
+
+    def test_opening_comment_swallows_the_rest(self):
+        """Test that an unterminated '/*' comments out everything after it."""
+        offset = SOURCE.index("int other")
+        buffer = self.assert_edit(SOURCE, offset, 0, "/* ")
+        self.assertEqual(buffer[-1].value, "}")
+        self.assertEqual(buffer[-1].lineNumber, 3)
+
+    def test_removing_comment_start_resyncs(self):
+        """Test that deleting '/*' relexes the old comment text as code."""
+        offset = SOURCE.index("/* helper */")
+        buffer = self.assert_edit(SOURCE, offset, 2, "")
+        self.assertIn("helper", [t.value for t in buffer])
+
+    def test_lexer_error_leaves_buffer_unchanged(self):
+        """Test that a failed relex does not modify the buffer."""
+        buffer = self.lexer.buffer_source(SOURCE)
+        before = self.columns(buffer)
+        with self.assertRaises(ValueError):
+            self.lexer.relex(buffer, SOURCE.index("1 <"), 0, "@")
+        self.assertEqual(self.columns(buffer), before)
+        self.assertEqual(buffer.source, SOURCE)
+
+    def test_str_edit_on_mmap_buffer(self):
+        """Test that text inserted into a memory-mapped buffer is encoded to match its bytes."""
+        with tempfile.NamedTemporaryFile("w", suffix=".c", delete=False) as file:
+            file.write(SOURCE)
+        try:
+            buffer = self.lexer.lex_mmap(file.name)
+            offset = SOURCE.index("1 <")
+            self.lexer.relex(buffer, offset, 1, "3")
+            edited = SOURCE[:offset] + "3" + SOURCE[offset + 1:]
+            self.assertEqual(buffer.source, edited.encode())
+            self.assertEqual(self.columns(buffer), self.columns(self.lexer.buffer_source(edited)))
+            self.lexer.relex(buffer, offset, 1, b"42")
+            self.assertIn("42", [t.value for t in buffer])
+        finally:
+            os.remove(file.name)
+
+    def test_bytes_edit_on_text_buffer(self):
+        """Test that bytes inserted into a text buffer are decoded to match it."""
+        buffer = self.assert_edit(SOURCE, SOURCE.index("3 +"), 1, "7")
+        self.lexer.relex(buffer, buffer.source.index("7 +"), 1, b"8")
+        self.assertIn("8", [t.value for t in buffer])
+
+    def test_random_edits_match_full_lexing(self):
+        """Test a sequence of random edits against lexing from scratch."""
+        rng = random.Random(7)
+        fragments = ["/*", "*/", "//", "\n", "x", "+", "=", "<", " ", "return ", ""]
+        source = SOURCE * 4
+        buffer = self.lexer.buffer_source(source)
+        for _ in range(300):
+            offset = rng.randint(0, len(source))
+            removed = rng.randint(0, min(4, len(source) - offset))
+            inserted = rng.choice(fragments)
+            edited = source[:offset] + inserted + source[offset + removed:]
+            try:
+                expected = self.lexer.buffer_source(edited)
+            except ValueError:
+                continue
+            self.lexer.relex(buffer, offset, removed, inserted)
+            source = edited
+            self.assertEqual(self.columns(buffer), self.columns(expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
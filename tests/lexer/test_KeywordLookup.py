@@ -0,0 +1,36 @@
+# type: ignore
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.lexer.LexerService import LexerService
+from modules.models.enums.keyword_patterns import KEYWORD_LOOKUP, KEYWORD_NAMES, KeyWordPatterns
+from modules.models.enums.token_type import TokenType
+
+
+class TestKeywordLookup(unittest.TestCase):
+    def test_table_covers_every_keyword(self):
+        """Test that both tables contain one entry per keyword."""
+        self.assertEqual(set(KEYWORD_LOOKUP.values()), set(KeyWordPatterns))
+        for keyword in KeyWordPatterns:
+            self.assertIs(KEYWORD_LOOKUP[keyword.name.lower()], keyword)
+            self.assertIs(KEYWORD_NAMES[keyword.name], keyword)
+
+    def test_tables_are_read_only(self):
+        """Test that the tables cannot be modified after import."""
+        with self.assertRaises(TypeError):
+            KEYWORD_LOOKUP["int"] = KeyWordPatterns.VOID
+
+    def test_keyword_prefix_is_an_identifier(self):
+        """Test that identifiers starting with a keyword are not keywords."""
+        tokens = LexerService().lex_source("return returned iffy if")
+        self.assertEqual(
+            [(t.type, t.value) for t in tokens],
+            [(TokenType.KEYWORD, "RETURN"), (TokenType.IDENTIFIER, "returned"),
+             (TokenType.IDENTIFIER, "iffy"), (TokenType.KEYWORD, "IF")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+# type: ignore
+import copy
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from benchmarks.lexer_benchmark import CORPORA, compare, generate_corpus, run
+from modules.lexer.LexerService import LexerService
+
+
+class TestLexerBenchmark(unittest.TestCase):
+    def test_corpora_are_valid_and_sized(self):
+        """Test that every synthetic corpus lexes and reaches the requested size."""
+        lexer = LexerService()
+        for name in CORPORA:
+            source = generate_corpus(name, 5000)
+            self.assertGreaterEqual(len(source), 5000)
+            self.assertGreater(len(lexer.lex_source(source)), 0, name)
+
+    def test_corpora_are_deterministic(self):
+        """Test that the same seed generates the same corpus."""
+        self.assertEqual(generate_corpus("identifiers", 2000, seed=4), generate_corpus("identifiers", 2000, seed=4))
+
+    def test_run_and_compare(self):
+        """Test that results compare cleanly with themselves and flag a slowdown."""
+        results = run(2000, mode="buffer", repeat=1, corpora=["operators"])
+        self.assertGreater(results["results"]["operators"]["tokens"], 0)
+        self.assertEqual(compare(results, results), [])
+
+        faster = copy.deepcopy(results)
+        faster["results"]["operators"]["tokens_per_second"] *= 2
+        regressions = compare(results, faster)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("operators", regressions[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+# type: ignore
+import unittest
+from unittest.mock import mock_open, patch
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.lexer.LexerService import LexerService
+
+FUNCTION = """int f{index}(void) {{
+    /* comment {index}
+       on two lines */ return {index} + 1; // trailing /* not a comment
+    return "a /* string */";
+}}
+"""
+SOURCE = "".join(FUNCTION.format(index=index) for index in range(40))
+
+
+class TestParallelLexing(unittest.TestCase):
+    def setUp(self):
+        self.lexer = LexerService()
+
+    def columns(self, buffer):
+        return (list(buffer.kinds), list(buffer.starts), list(buffer.lengths), list(buffer.lines))
+
+    def test_matches_serial_lexing(self):
+        """Test that chunked lexing gives exactly the serial token columns."""
+        expected = self.lexer.buffer_source(SOURCE)
+        for jobs in (2, 3, 7):
+            buffer = self.lexer.buffer_parallel(SOURCE, jobs=jobs, min_chunk_size=1)
+            self.assertEqual(self.columns(buffer), self.columns(expected))
+
+    def test_matches_lex_file(self):
+        """Test that the merged stream equals lex_file output, line numbers included."""
+        with patch("builtins.open", new_callable=mock_open, read_data=SOURCE):
+            expected = self.lexer.lex_file("dummy_file.c", whole_file=True)
+        buffer = self.lexer.buffer_parallel(SOURCE, jobs=4, min_chunk_size=1)
+        self.assertEqual(buffer.to_tokens(), expected)
+
+    def test_comment_across_chunk_boundary(self):
+        """Test that a chunk starting inside a comment is re-lexed with the right state."""
+        # Every split point guess lands on a line that ends by opening a comment
+        source = "".join(f"int a{index}; /*\n skipped{index} @ */ int b{index};\n" for index in range(50))
+        expected = self.lexer.buffer_source(source)
+        buffer = self.lexer.buffer_parallel(source, jobs=5, min_chunk_size=1)
+        self.assertEqual(self.columns(buffer), self.columns(expected))
+        self.assertNotIn("skipped0", [t.value for t in buffer])
+
+    def test_lexer_error_is_raised(self):
+        """Test that an error in any chunk is reported with its real location."""
+        source = SOURCE + "int x = $;\n"
+        with self.assertRaises(ValueError) as context:
+            self.lexer.buffer_parallel(source, jobs=3, min_chunk_size=1)
+        self.assertIn(f"line {SOURCE.count(chr(10)) + 1}, column 9", str(context.exception))
+
+    def test_small_source_is_lexed_serially(self):
+        """Test that a source below the chunk size does not start a process pool."""
+        with patch.object(sys.modules[LexerService.__module__], "ProcessPoolExecutor") as pool:
+            buffer = self.lexer.buffer_parallel("int x;\n", jobs=8)
+        pool.assert_not_called()
+        self.assertEqual(len(buffer), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
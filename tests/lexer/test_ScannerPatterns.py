@@ -0,0 +1,59 @@
+# type: ignore
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.lexer.LexerService import LexerService
+from modules.lexer.ScannerPatterns import SCANNABLE_TOKEN_TYPES, TOKEN_PATTERN
+from modules.models.enums.token_type import TokenType
+
+
+class TestScannerPatterns(unittest.TestCase):
+    def setUp(self):
+        self.lexer = LexerService()
+
+    def test_priority_follows_token_type_order(self):
+        """Test that the master pattern keeps the TokenType declaration order."""
+        declared = [t for t in TokenType if t in SCANNABLE_TOKEN_TYPES]
+        self.assertEqual(SCANNABLE_TOKEN_TYPES, declared)
+        self.assertNotIn(TokenType.COMMENT_MULTI_END, SCANNABLE_TOKEN_TYPES)
+
+    def test_master_pattern_picks_first_match(self):
+        """Test that multi-character operators win over their prefixes."""
+        cases = {
+            "<=": TokenType.LTE,
+            "<<": TokenType.SHIFT_LEFT,
+            "<": TokenType.LT,
+            "&&": TokenType.LOGICAL_AND,
+            "++": TokenType.INCREMENT,
+            "#ifdef": TokenType.IFDEF,
+            "main": TokenType.IDENTIFIER,
+            "42": TokenType.CONSTANT,
+        }
+        for text, expected in cases.items():
+            match = TOKEN_PATTERN.match(text)
+            self.assertEqual(match.lastgroup, expected.name, text)
+            self.assertEqual(match.group(0), text)
+
+    def test_string_constant_group_name(self):
+        """Test that nested capture groups do not hide the token kind."""
+        token = self.lexer._LexerService__test_token('"abc" x')
+        self.assertEqual(token.type, TokenType.STRINGCONSTANT)
+        self.assertEqual(token.value, '"abc"')
+
+    def test_trailing_block_comment_keeps_tokens(self):
+        """Test that a block comment after code does not swallow the code."""
+        tokens = self.lexer._LexerService__tokenize_string("return 0; /* done */\n")
+        self.assertEqual([t.value for t in tokens], ["RETURN", "0", ";"])
+        self.assertFalse(self.lexer.comment_skip_mode)
+
+    def test_error_token(self):
+        """Test that an unknown character is reported as ERROR."""
+        token = self.lexer._LexerService__test_token("@")
+        self.assertEqual(token.type, TokenType.ERROR)
+        self.assertEqual(token.value, "@")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+# type: ignore
+import unittest
+from unittest.mock import mock_open, patch
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.lexer.LexerService import LexerService
+from modules.lexer.SourceScanner import SourceScanner
+from modules.models.enums.token_type import TokenType
+
+SOURCE = """int main(void) {
+    /* a comment
+       spanning lines */ return 1 + 2; // trailing
+    return "s" * 3;
+}
+"""
+
+
+class TestSourceScanner(unittest.TestCase):
+    def setUp(self):
+        self.lexer = LexerService()
+
+    def test_line_and_column_tracking(self):
+        """Test that line and column are derived from the offset."""
+        tokens = self.lexer.lex_source("int x;\n  return 42;\n")
+        positions = [(t.value, t.lineNumber, t.column) for t in tokens]
+        self.assertEqual(positions, [
+            ("int", 1, 1), ("x", 1, 5), (";", 1, 6),
+            ("RETURN", 2, 3), ("42", 2, 10), (";", 2, 12),
+        ])
+
+    def test_multi_line_comment_is_skipped(self):
+        """Test that a block comment spanning lines is skipped without class state."""
+        tokens = self.lexer.lex_source(SOURCE)
+        values = [t.value for t in tokens]
+        self.assertNotIn("comment", values)
+        self.assertEqual(values[6:11], ["RETURN", "1", "+", "2", ";"])
+        self.assertEqual(tokens[6].lineNumber, 3)
+        self.assertFalse(self.lexer.comment_skip_mode)
+
+    def test_matches_line_by_line_lexing(self):
+        """Test that whole-file lexing produces the same tokens as line mode."""
+        with patch("builtins.open", new_callable=mock_open, read_data=SOURCE):
+            line_tokens = self.lexer.lex_file("dummy_file.c")
+        with patch("builtins.open", new_callable=mock_open, read_data=SOURCE):
+            file_tokens = self.lexer.lex_file("dummy_file.c", whole_file=True)
+        self.assertEqual(
+            [(t.type, t.value, t.lineNumber) for t in line_tokens],
+            [(t.type, t.value, t.lineNumber) for t in file_tokens],
+        )
+
+    def test_unterminated_comment_leaves_scanner_in_comment(self):
+        """Test that the scanner reports an open comment at the end of input."""
+        scanner = SourceScanner("x /* open\nstill open")
+        tokens = list(scanner.scan())
+        self.assertEqual([t[0] for t in tokens], [TokenType.IDENTIFIER])
+        self.assertTrue(scanner.in_comment)
+        self.assertEqual(scanner.line, 2)
+
+    def test_unexpected_character(self):
+        """Test that an unknown character raises with its location."""
+        with self.assertRaises(ValueError) as context:
+            self.lexer.lex_source("int x;\n  @")
+        self.assertIn("line 2, column 3", str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
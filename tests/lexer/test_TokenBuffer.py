@@ -0,0 +1,112 @@
+# type: ignore
+import unittest
+import sys
+import os
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.lexer.LexerService import LexerService
+from modules.lexer.models.TokenBuffer import KIND_CODES, TokenBuffer
+from modules.models.enums.token_type import TokenType
+from modules.parser.ParserServiceV2 import ParserServiceV2
+from modules.parser.Services.BufferedTokenIteratorService import BufferedTokenIteratorService
+
+SOURCE = """int main(void) {
+    // comment
+    return 1 + 2 * (3 - 4) == 5;
+}
+"""
+
+
+class TestTokenBuffer(unittest.TestCase):
+    def setUp(self):
+        self.lexer = LexerService()
+        self.buffer = self.lexer.buffer_source(SOURCE)
+
+    def test_columns_match_token_models(self):
+        """Test that the buffer holds the same tokens as lex_source."""
+        tokens = self.lexer.lex_source(SOURCE)
+        self.assertEqual(len(self.buffer), len(tokens))
+        for view, token in zip(self.buffer, tokens):
+            self.assertEqual((view.type, view.value, view.lineNumber, view.column),
+                             (token.type, token.value, token.lineNumber, token.column))
+
+    def test_text_is_sliced_from_source(self):
+        """Test that token text is read from the source using start and length."""
+        index = 6  # 'return'
+        start = self.buffer.starts[index]
+        self.assertEqual(SOURCE[start:start + self.buffer.lengths[index]], "return")
+        self.assertEqual(self.buffer.kinds[index], KIND_CODES[TokenType.KEYWORD])
+        self.assertEqual(self.buffer.text(index), "return")
+        self.assertEqual(self.buffer.value(index), "RETURN")
+
+    def test_to_tokens(self):
+        """Test materialising Token models from the buffer."""
+        tokens = self.buffer.to_tokens()
+        self.assertEqual(tokens[0].type, TokenType.IDENTIFIER)
+        self.assertEqual(tokens[0].value, "int")
+        self.assertEqual(tokens[-1].type, TokenType.RBRACE)
+        self.assertEqual(tokens[-1].lineNumber, 4)
+
+    def test_index_out_of_range(self):
+        """Test that reading past the end raises IndexError."""
+        with self.assertRaises(IndexError):
+            self.buffer[len(self.buffer)]
+        self.assertEqual(self.buffer[-1].type, TokenType.RBRACE)
+
+    def test_buffered_iterator_reads_kind_column(self):
+        """Test type checks and matches on the buffered iterator."""
+        iterator = BufferedTokenIteratorService(self.buffer)
+        self.assertTrue(iterator.check(TokenType.IDENTIFIER))
+        self.assertFalse(iterator.match(TokenType.KEYWORD, TokenType.LPAREN))
+        self.assertTrue(iterator.match(TokenType.KEYWORD, TokenType.IDENTIFIER))
+        self.assertEqual(iterator.lookbehind().value, "int")
+        iterator.position = len(self.buffer)
+        self.assertTrue(iterator.at_end())
+        self.assertEqual(iterator.current().type, TokenType.EOF)
+
+    def test_parse_buffer_matches_parse_lex(self):
+        """Test that parsing from the buffer builds the same AST as a token list."""
+        expected = ParserServiceV2().parse_lex(self.lexer.lex_source(SOURCE))
+        parsed = ParserServiceV2(BufferedTokenIteratorService()).parse_lex(self.buffer)
+        self.assertEqual(parsed, expected)
+
+    def test_empty_buffer(self):
+        """Test that an empty source produces an empty buffer."""
+        self.assertEqual(len(TokenBuffer("")), 0)
+        self.assertEqual(len(self.lexer.buffer_source("  // nothing\n")), 0)
+
+    def test_mmap_matches_text_lexing(self):
+        """Test that lexing a memory-mapped file gives the same tokens as text lexing."""
+        with tempfile.NamedTemporaryFile("w", suffix=".c", delete=False) as file:
+            file.write(SOURCE)
+        try:
+            buffer = self.lexer.lex_mmap(file.name)
+            self.assertTrue(buffer.binary)
+            self.assertEqual(
+                [(t.type, t.value, t.lineNumber, t.column) for t in buffer],
+                [(t.type, t.value, t.lineNumber, t.column) for t in self.buffer],
+            )
+            self.assertIsInstance(buffer.value(0), str)
+            buffer.close()
+        finally:
+            os.remove(file.name)
+
+    def test_mmap_empty_file(self):
+        """Test that an empty file can be lexed in mmap mode."""
+        with tempfile.NamedTemporaryFile("w", suffix=".c", delete=False) as file:
+            pass
+        try:
+            self.assertEqual(len(self.lexer.lex_mmap(file.name)), 0)
+        finally:
+            os.remove(file.name)
+
+    def test_bytes_unexpected_character(self):
+        """Test that bytes input reports unexpected characters as text."""
+        with self.assertRaises(ValueError) as context:
+            self.lexer.buffer_source(b"int x = $;")
+        self.assertIn("Unexpected character: $", str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+# type: ignore
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.lexer.LexerService import LexerService
+from modules.lexer.models.TokenBuffer import TokenBuffer
+from modules.utils.content_cache import ContentCache
+
+SOURCE = "int main(void) {\n    return 1 + 2; /* done */\n}\n"
+
+
+class TestTokenCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+        self.file_name = os.path.join(self.temp_dir.name, "input.c")
+        with open(self.file_name, "w") as file:
+            file.write(SOURCE)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def columns(self, buffer):
+        return (list(buffer.kinds), list(buffer.starts), list(buffer.lengths), list(buffer.lines))
+
+    def test_buffer_round_trip(self):
+        """Test that a TokenBuffer survives serialization."""
+        buffer = LexerService().buffer_source(SOURCE)
+        restored = TokenBuffer.from_bytes(SOURCE, buffer.to_bytes())
+        self.assertEqual(self.columns(restored), self.columns(buffer))
+        self.assertEqual([t.value for t in restored], [t.value for t in buffer])
+
+    def test_truncated_data_is_rejected(self):
+        """Test that a cut off entry raises instead of yielding a short buffer."""
+        data = LexerService().buffer_source(SOURCE).to_bytes()
+        with self.assertRaises(ValueError):
+            TokenBuffer.from_bytes(SOURCE, data[:-3])
+        with self.assertRaises(ValueError):
+            TokenBuffer.from_bytes(SOURCE, b"TK")
+
+    def test_second_lex_is_a_hit(self):
+        """Test that lexing unchanged content again is served from the cache."""
+        first = LexerService(cache_dir=self.cache_dir)
+        expected = first.lex_buffer(self.file_name)
+        self.assertEqual((first.token_cache.hits, first.token_cache.misses), (0, 1))
+
+        second = LexerService(cache_dir=self.cache_dir)
+        with patch.object(LexerService, "buffer_source", side_effect=AssertionError("relexed")):
+            cached = second.lex_buffer(self.file_name)
+        self.assertEqual((second.token_cache.hits, second.token_cache.misses), (1, 0))
+        self.assertEqual(self.columns(cached), self.columns(expected))
+
+    def test_changed_content_is_a_miss(self):
+        """Test that editing the file invalidates its entry."""
+        lexer = LexerService(cache_dir=self.cache_dir)
+        lexer.lex_mmap(self.file_name).close()
+        with open(self.file_name, "a") as file:
+            file.write("int x;\n")
+        buffer = lexer.lex_mmap(self.file_name)
+        self.assertEqual(lexer.token_cache.misses, 2)
+        self.assertEqual(buffer[-1].value, ";")
+        buffer.close()
+
+    def test_corrupt_entry_is_relexed(self):
+        """Test that an unreadable entry falls back to lexing and is rewritten."""
+        LexerService(cache_dir=self.cache_dir).lex_buffer(self.file_name)
+        for name in os.listdir(self.cache_dir):
+            with open(os.path.join(self.cache_dir, name), "wb") as file:
+                file.write(b"garbage")
+        lexer = LexerService(cache_dir=self.cache_dir)
+        buffer = lexer.lex_buffer(self.file_name)
+        self.assertEqual(buffer[0].value, "int")
+        self.assertEqual(LexerService(cache_dir=self.cache_dir).lex_buffer(self.file_name).to_tokens(), buffer.to_tokens())
+
+    def test_least_recently_used_entries_are_evicted(self):
+        """Test that the cache stays under its byte budget, dropping the oldest entries."""
+        cache = ContentCache(self.cache_dir, max_bytes=350, suffix=".tokens")
+        for index in range(3):
+            key = ContentCache.key(str(index))
+            cache.put(key, b"x" * 100)
+            os.utime(os.path.join(self.cache_dir, f"{key}.tokens"), ns=(index * 10**9, index * 10**9))
+        cache.get(ContentCache.key("0"))
+        cache.put(ContentCache.key("3"), b"x" * 100)
+        self.assertIsNotNone(cache.get(ContentCache.key("0")))
+        self.assertIsNone(cache.get(ContentCache.key("1")))
+        self.assertIsNotNone(cache.get(ContentCache.key("2")))
+        self.assertIsNotNone(cache.get(ContentCache.key("3")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+# type: ignore
+import pickle
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.IntermediateGenerator.IRGenerator import IRGenerator
+from modules.codeGenerator.AssemblyGenerator import AssemblyGenerator
+from modules.lexer.LexerService import LexerService
+from modules.models.nodes.AST.ASTArena import ASTArena, NodeView
+from modules.models.nodes.AST.Functions.FunctionDefinition import FunctionDefinitionNode
+from modules.models.nodes.AST.Operands.BinaryOperators import BinaryAdd, BinaryNode
+from modules.models.nodes.AST.Operands.BitwiseOperators import BitwiseAnd
+from modules.models.nodes.AST.Operands.ConstantInteger import ConstantInteger
+from modules.models.nodes.AST.Operands.RelationalOperators import LessThanRelation
+from modules.models.nodes.AST.Operands.UnaryOperators import Negate
+from modules.models.nodes.AST.Operands.Variable import Variable
+from modules.models.nodes.AST.ProgramNode import ProgramNode
+from modules.models.nodes.AST.Statements.ReturnStatementNode import ReturnStatementNode
+from modules.parser.ParserServiceV2 import ParserServiceV2
+from modules.parser.Services.BufferedTokenIteratorService import BufferedTokenIteratorService
+
+SOURCE = """int main(void) {
+    return (1 + 2) * -3 % 4 << (5 == 6) || ~7 && 8 >= 9;
+}
+int other(void) {
+    return 10 / 2 - 1;
+}
+"""
+
+
+def parse(source):
+    return ParserServiceV2(BufferedTokenIteratorService()).parse_lex(LexerService().buffer_text(source))
+
+
+def assemble(program):
+    asm = []
+    AssemblyGenerator().generate(IRGenerator().parse_ast(program), asm)
+    return "".join(asm)
+
+
+class CheckedAdd(BinaryAdd):
+    pass
+
+
+class CheckedAnd(BitwiseAnd):
+    pass
+
+
+class CheckedLessThan(LessThanRelation):
+    pass
+
+
+class TestASTArena(unittest.TestCase):
+    def setUp(self):
+        self.program = parse(SOURCE)
+        self.arena = ASTArena.from_tree(self.program)
+
+    def test_round_trip(self):
+        """Test that a tree flattened into an arena is rebuilt unchanged."""
+        self.assertEqual(self.arena.to_tree(), self.program)
+        self.assertEqual(ASTArena.from_tree(self.arena.root()).to_tree(), self.program)
+
+    def test_preorder_layout(self):
+        """Test that nodes are stored in pre-order with each subtree ending where its next sibling starts."""
+        self.assertIs(self.arena.kind(0), ProgramNode)
+        self.assertEqual(self.arena.ends[0], len(self.arena))
+        functions = self.arena.child_indices(0)
+        self.assertEqual(functions[0], 1)
+        self.assertEqual(functions[1], self.arena.ends[1])
+        self.assertTrue(all(self.arena.kind(index) is FunctionDefinitionNode for index in functions))
+
+    def test_views_read_fields(self):
+        """Test that views expose the node fields and pass isinstance checks for the node class."""
+        root = self.arena.root()
+        self.assertIsInstance(root, ProgramNode)
+        self.assertIsInstance(root, NodeView)
+        main, other = root.functions
+        self.assertEqual([main.name, other.name], ["main", "other"])
+        self.assertIsInstance(main.body, ReturnStatementNode)
+        self.assertIsInstance(main.body.value, BinaryNode)
+        self.assertEqual(other.body.value.right.value, "1")
+        self.assertEqual(other.body.value, self.program.functions[1].body.value)
+
+    def test_lowering_views_matches_tree(self):
+        """Test that ASTLowerer walks an arena to the same assembly as the original tree."""
+        self.assertEqual(assemble(self.arena.root()), assemble(self.program))
+
+    def test_lowering_node_subclasses(self):
+        """Test that ASTLowerer lowers subclasses of the operator nodes like the nodes they extend."""
+        program = parse("int main(void) {\n    return (1 + 2) & (3 < 4);\n}\n")
+        expected = assemble(program)
+        value = program.functions[0].body.value
+        program.functions[0].body.value = CheckedAnd(
+            left=CheckedAdd(left=value.left.left, right=value.left.right),
+            right=CheckedLessThan(left=value.right.left, right=value.right.right),
+        )
+        self.assertEqual(assemble(program), expected)
+
+    def test_several_roots(self):
+        """Test that appended trees are kept as separate roots in order."""
+        arena = ASTArena()
+        for function in self.program.functions:
+            arena.append(function)
+        self.assertEqual([view.name for view in arena], ["main", "other"])
+        self.assertEqual(arena.to_tree(arena.roots[1]), self.program.functions[1])
+
+    def test_optional_child_is_none(self):
+        """Test that a missing optional child reads back as None."""
+        arena = ASTArena.from_tree(ReturnStatementNode(value=None))
+        self.assertIsNone(arena.root().value)
+        self.assertEqual(arena.to_tree(), ReturnStatementNode(value=None))
+
+    def test_values_are_shared(self):
+        """Test that equal payloads are stored once."""
+        tree = BinaryAdd(left=ConstantInteger(value="7"), right=ConstantInteger(value="7"))
+        arena = ASTArena.from_tree(tree)
+        self.assertEqual(arena.values, ["7"])
+        self.assertEqual(arena.to_tree(), tree)
+
+    def test_pickle(self):
+        """Test that arenas and views survive pickling and keep sharing one arena."""
+        restored = pickle.loads(pickle.dumps(self.arena))
+        self.assertEqual(restored.to_tree(), self.program)
+        functions = pickle.loads(pickle.dumps(self.arena.root().functions))
+        self.assertIs(functions[0].arena, functions[1].arena)
+        self.assertEqual(functions, self.program.functions)
+        # Reloaded arenas keep deduplicating payloads
+        restored.append(ConstantInteger(value="10"))
+        self.assertEqual(restored.values.count("10"), 1)
+
+    def test_deep_tree(self):
+        """Test that flattening and rebuilding do not recurse."""
+        depth = sys.getrecursionlimit() * 3
+        tree = ConstantInteger(value="1")
+        for _ in range(depth):
+            tree = Negate(operand=tree)
+        arena = ASTArena.from_tree(tree)
+        self.assertEqual(len(arena), depth + 1)
+        rebuilt = arena.to_tree()
+        for _ in range(depth):
+            rebuilt = rebuilt.operand
+        self.assertEqual(rebuilt, ConstantInteger(value="1"))
+
+    def test_unknown_node_rejected(self):
+        """Test that node classes without a kind code are refused."""
+        with self.assertRaises(TypeError):
+            ASTArena.from_tree(ReturnStatementNode(value=Variable(name="x")))
+
+
+if __name__ == "__main__":
+    unittest.main()
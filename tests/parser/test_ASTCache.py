@@ -0,0 +1,101 @@
+# type: ignore
+import os
+import tempfile
+import unittest
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.lexer.LexerService import LexerService
+from modules.models.lexer.Token import Token
+from modules.models.nodes.AST.ASTArena import ASTArena
+from modules.models.nodes.AST.ProgramNode import ProgramNode
+from modules.parser.ParserServiceV2 import ParserServiceV2
+from modules.parser.Services.BufferedTokenIteratorService import BufferedTokenIteratorService
+
+SOURCE = """int main(void) {
+    return (1 + 2) * -3 % 4 << (5 == 6) || ~7 && 8 >= 9;
+}
+int add(int a, int b) {
+    return 10 / 2 - 1;
+}
+"""
+
+
+class TestASTCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+        self.content = SOURCE.encode()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def parse(self, parser=None):
+        parser = parser or ParserServiceV2(BufferedTokenIteratorService())
+        return parser.parse_lex(LexerService().buffer_text(SOURCE))
+
+    def test_serialization_round_trip(self):
+        """Test that a program survives to_bytes/from_bytes, parameter tokens included."""
+        program = self.parse()
+        restored = ASTArena.from_bytes(ASTArena.from_tree(program).to_bytes()).to_tree()
+        self.assertEqual(restored.functions[0], program.functions[0])
+        params = restored.functions[1].params
+        self.assertIsInstance(params[0][1], Token)
+        self.assertEqual([(kind.value, name.value) for kind, name in params], [("int", "a"), ("int", "b")])
+        self.assertEqual(params[1][1].lineNumber, 4)
+        self.assertEqual(restored.functions[1].body, program.functions[1].body)
+
+    def test_bad_data_is_rejected(self):
+        """Test that truncated or foreign data raises ValueError."""
+        data = ASTArena.from_tree(self.parse()).to_bytes()
+        for bad in (data[:-3], data[:30], b"AS", b"TKBF" + data[4:]):
+            with self.assertRaises(ValueError):
+                ASTArena.from_bytes(bad)
+
+    def test_unsupported_payload(self):
+        """Test that payloads with no encoding are refused when serializing."""
+        arena = ASTArena.from_tree(self.parse())
+        arena.values.append(1.5)
+        with self.assertRaises(TypeError):
+            arena.to_bytes()
+
+    def test_second_parse_is_a_hit(self):
+        """Test that unchanged content is served from the cache without parsing."""
+        first = ParserServiceV2(BufferedTokenIteratorService(), cache_dir=self.cache_dir)
+        expected = first.parse_cached(self.content, lambda: self.parse(first))
+        self.assertIsInstance(expected, ProgramNode)
+        self.assertEqual((first.ast_cache.hits, first.ast_cache.misses), (0, 1))
+
+        second = ParserServiceV2(BufferedTokenIteratorService(), cache_dir=self.cache_dir)
+        cached = second.parse_cached(self.content, lambda: self.fail("parsed again"))
+        self.assertEqual((second.ast_cache.hits, second.ast_cache.misses), (1, 0))
+        self.assertIsInstance(cached, ProgramNode)
+        self.assertEqual(cached.functions[0], expected.functions[0])
+        self.assertEqual([function.name for function in cached.functions], ["main", "add"])
+
+    def test_changed_content_is_a_miss(self):
+        """Test that different source bytes do not share an entry."""
+        parser = ParserServiceV2(BufferedTokenIteratorService(), cache_dir=self.cache_dir)
+        parser.parse_cached(self.content, self.parse)
+        parser.parse_cached(self.content + b"\n", self.parse)
+        self.assertEqual((parser.ast_cache.hits, parser.ast_cache.misses), (0, 2))
+
+    def test_unreadable_entry_is_replaced(self):
+        """Test that a corrupt entry is reported and parsed over instead of failing the build."""
+        parser = ParserServiceV2(BufferedTokenIteratorService(), cache_dir=self.cache_dir)
+        parser.parse_cached(self.content, self.parse)
+        for entry in os.listdir(self.cache_dir):
+            with open(os.path.join(self.cache_dir, entry), "wb") as file:
+                file.write(b"garbage")
+        program = parser.parse_cached(self.content, self.parse)
+        self.assertEqual(len(program.functions), 2)
+
+    def test_without_cache_dir(self):
+        """Test that parse_cached just parses when no cache is configured."""
+        parser = ParserServiceV2(BufferedTokenIteratorService())
+        self.assertIsNone(parser.ast_cache)
+        self.assertEqual(len(parser.parse_cached(self.content, self.parse).functions), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
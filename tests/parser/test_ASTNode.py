@@ -0,0 +1,104 @@
+# type: ignore
+from dataclasses import dataclass
+import pickle
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.models.nodes.ASTNode import ASTNode, ast_validation_enabled, set_ast_validation
+from modules.models.nodes.BaseNode import BaseNode
+from modules.models.nodes.AST.Operands.BinaryOperators import BinaryAdd
+from modules.models.nodes.AST.Operands.ConstantInteger import ConstantInteger
+from modules.models.nodes.AST.Operands.UnaryOperators import Negate
+from modules.models.nodes.AST.Operands.Variable import Variable
+from modules.models.nodes.AST.Statements.ReturnStatementNode import ReturnStatementNode
+
+
+class RecordingVisitor:
+    def visit_binary_expression(self, node, instructions):
+        instructions.append(("binary", node))
+        return node
+
+
+class TestASTNode(unittest.TestCase):
+    def tearDown(self):
+        set_ast_validation(False)
+
+    def test_nodes_are_slotted(self):
+        node = BinaryAdd(left=ConstantInteger(value="1"), right=ConstantInteger(value="2"))
+        self.assertFalse(hasattr(node, "__dict__"))
+        self.assertIsInstance(node, BaseNode)
+        with self.assertRaises(AttributeError):
+            node.unknown = 1
+
+    def test_fields_are_inherited(self):
+        self.assertEqual(BinaryAdd._fields, ("left", "right"))
+        self.assertEqual(Negate._fields, ("operand",))
+        self.assertEqual(ReturnStatementNode._fields, ("value", "instructions"))
+
+    def test_defaults(self):
+        node = ReturnStatementNode(value=ConstantInteger(value="0"))
+        self.assertIsNone(node.instructions)
+
+    def test_missing_field_raises(self):
+        with self.assertRaises(TypeError):
+            BinaryAdd(left=ConstantInteger(value="1"))
+
+    def test_equality_and_repr(self):
+        first = BinaryAdd(left=ConstantInteger(value="1"), right=ConstantInteger(value="2"))
+        second = BinaryAdd(left=ConstantInteger(value="1"), right=ConstantInteger(value="2"))
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, BinaryAdd(left=ConstantInteger(value="1"), right=ConstantInteger(value="3")))
+        self.assertEqual(repr(first), "BinaryAdd(left=ConstantInteger(value='1'), right=ConstantInteger(value='2'))")
+
+    def test_accept_dispatches_to_visitor(self):
+        node = BinaryAdd(left=ConstantInteger(value="1"), right=ConstantInteger(value="2"))
+        instructions = []
+        self.assertIs(node.accept(RecordingVisitor(), instructions), node)
+        self.assertEqual(instructions, [("binary", node)])
+
+    def test_pickle_round_trip(self):
+        node = Negate(operand=ConstantInteger(value="7"))
+        self.assertEqual(pickle.loads(pickle.dumps(node)), node)
+
+    def test_no_validation_by_default(self):
+        self.assertFalse(ast_validation_enabled())
+        node = ConstantInteger(value=7)
+        self.assertEqual(node.value, 7)
+
+    def test_validation_rejects_wrong_types(self):
+        set_ast_validation(True)
+        with self.assertRaises(TypeError):
+            ConstantInteger(value=7)
+        with self.assertRaises(TypeError):
+            BinaryAdd(left="1", right=ConstantInteger(value="2"))
+        with self.assertRaises(TypeError):
+            ReturnStatementNode(value=ConstantInteger(value="0"), instructions=[1])
+        ReturnStatementNode(value=ConstantInteger(value="0"), instructions=[ConstantInteger(value="1")])
+
+    def test_validation_applies_to_classes_defined_later(self):
+        set_ast_validation(True)
+
+        @dataclass(slots=True, kw_only=True)
+        class Labelled(ASTNode):
+            label: str
+
+        with self.assertRaises(TypeError):
+            Labelled(label=1)
+        set_ast_validation(False)
+        self.assertEqual(Labelled(label=1).label, 1)
+
+    def test_mutable_default_rejected(self):
+        with self.assertRaises(ValueError):
+            @dataclass(slots=True, kw_only=True)
+            class Listed(ASTNode):
+                items: list = []
+
+    def test_custom_init_kept(self):
+        self.assertEqual(Variable("x").name, "x")
+        self.assertTrue(Variable().name.startswith("tmp."))
+
+
+if __name__ == '__main__':
+    unittest.main()
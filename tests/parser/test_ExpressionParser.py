@@ -0,0 +1,158 @@
+# type: ignore
+import random
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.lexer.LexerService import LexerService
+from modules.models.enums.token_type import TokenType
+from modules.models.nodes.AST.Operands.BinaryOperators import BinaryAdd, BinaryMinus, BinaryMultiply, LogicalAnd, LogicalOr
+from modules.models.nodes.AST.Operands.BitwiseOperators import BitwiseAnd, BitwiseLeftShift, BitwiseOr, BitwiseXor
+from modules.models.nodes.AST.Operands.ConstantInteger import ConstantInteger
+from modules.models.nodes.AST.Operands.RelationalOperators import EqualRelation, LessThanRelation
+from modules.models.nodes.AST.Operands.UnaryOperators import BitwiseNot, Negate
+from modules.parser.Services.BufferedTokenIteratorService import BufferedTokenIteratorService
+from modules.parser.Services.ExpressionParser import BINARY_OPERATORS, ExpressionParser
+from modules.parser.Services.StreamingTokenIteratorService import StreamingTokenIteratorService
+from modules.parser.Services.TokenIteratorService import TokenIteratorService
+
+
+def c(value):
+    return ConstantInteger(value=str(value))
+
+
+def random_expression(rng, depth):
+    if depth == 0 or rng.random() < 0.2:
+        return str(rng.randint(0, 99))
+    choice = rng.random()
+    if choice < 0.15:
+        return rng.choice(["-", "~", "!"]) + " " + random_expression(rng, depth - 1)
+    if choice < 0.3:
+        return "(" + random_expression(rng, depth - 1) + ")"
+    operator = rng.choice(["||", "&&", "|", "^", "&", "==", "!=", "<", "<=", ">", ">=", "<<", ">>", "+", "-", "*", "/", "%"])
+    return random_expression(rng, depth - 1) + f" {operator} " + random_expression(rng, depth - 1)
+
+
+class TestExpressionParser(unittest.TestCase):
+    def parse(self, source):
+        iterator = BufferedTokenIteratorService(LexerService().buffer_text(source))
+        expression = ExpressionParser(iterator).parse_expression()
+        self.assertTrue(iterator.at_end())
+        return expression
+
+    def test_constant(self):
+        self.assertEqual(self.parse("42"), c(42))
+
+    def test_multiplication_binds_tighter_than_addition(self):
+        self.assertEqual(self.parse("1 + 2 * 3"), BinaryAdd(left=c(1), right=BinaryMultiply(left=c(2), right=c(3))))
+
+    def test_left_associative(self):
+        self.assertEqual(self.parse("1 - 2 - 3"), BinaryMinus(left=BinaryMinus(left=c(1), right=c(2)), right=c(3)))
+
+    def test_parentheses(self):
+        self.assertEqual(self.parse("(1 + 2) * 3"), BinaryMultiply(left=BinaryAdd(left=c(1), right=c(2)), right=c(3)))
+
+    def test_unary_binds_tighter_than_binary(self):
+        self.assertEqual(self.parse("-1 + ~2"), BinaryAdd(left=Negate(operand=c(1)), right=BitwiseNot(operand=c(2))))
+        self.assertEqual(self.parse("- -1"), Negate(operand=Negate(operand=c(1))))
+
+    def test_precedence_ladder(self):
+        expected = LogicalOr(
+            left=c(1),
+            right=LogicalAnd(
+                left=c(2),
+                right=BitwiseOr(
+                    left=c(3),
+                    right=BitwiseXor(
+                        left=c(4),
+                        right=BitwiseAnd(
+                            left=c(5),
+                            right=EqualRelation(
+                                left=c(6),
+                                right=LessThanRelation(
+                                    left=c(7),
+                                    right=BitwiseLeftShift(left=c(8), right=BinaryAdd(left=c(9), right=BinaryMultiply(left=c(10), right=c(11)))),
+                                ),
+                            ),
+                        ),
+                    ),
+                ),
+            ),
+        )
+        self.assertEqual(self.parse("1 || 2 && 3 | 4 ^ 5 & 6 == 7 < 8 << 9 + 10 * 11"), expected)
+
+    def test_stops_at_non_operator(self):
+        iterator = BufferedTokenIteratorService(LexerService().buffer_text("1 + 2;"))
+        self.assertEqual(ExpressionParser(iterator).parse_expression(), BinaryAdd(left=c(1), right=c(2)))
+        self.assertEqual(iterator.peek_type(), TokenType.SEMICOLON)
+
+    def test_minimum_precedence(self):
+        iterator = BufferedTokenIteratorService(LexerService().buffer_text("1 * 2 + 3"))
+        expression = ExpressionParser(iterator).parse_expression(BINARY_OPERATORS[TokenType.MULTIPLY][0])
+        self.assertEqual(expression, BinaryMultiply(left=c(1), right=c(2)))
+        self.assertEqual(iterator.peek_type(), TokenType.PLUS)
+
+    def test_same_tree_from_every_iterator(self):
+        source = "~(1 + 2) * -3 >= 4 != 5 % 6 >> 7 || 8"
+        expected = self.parse(source)
+        lexer = LexerService()
+        listed = TokenIteratorService()
+        listed.lex_array = list(lexer.iter_source(source))
+        listed.position = 0
+        self.assertEqual(ExpressionParser(listed).parse_expression(), expected)
+        streamed = StreamingTokenIteratorService(lexer.iter_source(source))
+        self.assertEqual(ExpressionParser(streamed).parse_expression(), expected)
+
+    def test_iterative_matches_recursive(self):
+        rng = random.Random(7)
+        lexer = LexerService()
+        for _ in range(300):
+            source = random_expression(rng, 6) + ";"
+            recursive = ExpressionParser(BufferedTokenIteratorService(lexer.buffer_text(source))).parse_expression()
+            iterator = BufferedTokenIteratorService(lexer.buffer_text(source))
+            self.assertEqual(ExpressionParser(iterator, iterative=True).parse_expression(), recursive, source)
+            self.assertEqual(iterator.peek_type(), TokenType.SEMICOLON)
+
+    def test_iterative_minimum_precedence(self):
+        iterator = BufferedTokenIteratorService(LexerService().buffer_text("(1 + 2) * 2 + 3"))
+        expression = ExpressionParser(iterator, iterative=True).parse_expression(BINARY_OPERATORS[TokenType.MULTIPLY][0])
+        self.assertEqual(expression, BinaryMultiply(left=BinaryAdd(left=c(1), right=c(2)), right=c(2)))
+        self.assertEqual(iterator.peek_type(), TokenType.PLUS)
+
+    def test_iterative_stops_at_unmatched_close(self):
+        iterator = BufferedTokenIteratorService(LexerService().buffer_text("(1) + 2)"))
+        expression = ExpressionParser(iterator, iterative=True).parse_expression()
+        self.assertEqual(expression, BinaryAdd(left=c(1), right=c(2)))
+        self.assertEqual(iterator.peek_type(), TokenType.RPAREN)
+
+    def test_iterative_deep_nesting(self):
+        depth = 20000
+        source = "1 + (" * depth + "2" + ")" * depth
+        iterator = BufferedTokenIteratorService(LexerService().buffer_text(source))
+        node = ExpressionParser(iterator, iterative=True).parse_expression()
+        self.assertTrue(iterator.at_end())
+        for _ in range(depth):
+            self.assertIsInstance(node, BinaryAdd)
+            self.assertEqual(node.left, c(1))
+            node = node.right
+        self.assertEqual(node, c(2))
+
+    def test_iterative_errors(self):
+        lexer = LexerService()
+        with self.assertRaises(ValueError):
+            ExpressionParser(BufferedTokenIteratorService(lexer.buffer_text("1 +")), iterative=True).parse_expression()
+        with self.assertRaises(SyntaxError):
+            ExpressionParser(BufferedTokenIteratorService(lexer.buffer_text("((1 + 2)")), iterative=True).parse_expression()
+
+    def test_missing_operand(self):
+        with self.assertRaises(ValueError):
+            self.parse("1 +")
+
+    def test_unclosed_parenthesis(self):
+        with self.assertRaises(SyntaxError):
+            self.parse("(1 + 2")
+
+
+if __name__ == '__main__':
+    unittest.main()
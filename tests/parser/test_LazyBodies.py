@@ -0,0 +1,94 @@
+# type: ignore
+import pickle
+import unittest
+from unittest.mock import patch
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.lexer.LexerService import LexerService
+from modules.models.enums.token_type import TokenType
+from modules.models.nodes.AST.Functions.LazyBody import LazyBody
+from modules.models.nodes.AST.Statements.ReturnStatementNode import ReturnStatementNode
+from modules.parser.ParserServiceV2 import ParserServiceV2
+from modules.parser.Services import FunctionParser as function_parser
+from modules.parser.Services.BufferedTokenIteratorService import BufferedTokenIteratorService
+from modules.parser.Services.StreamingTokenIteratorService import StreamingTokenIteratorService
+from modules.parser.Services.TokenIteratorService import TokenIteratorService
+
+SOURCE = "".join(f"int f{index}(void) {{\n    return {index} * (2 + -{index});\n}}\n" for index in range(10))
+
+
+class TestLazyBodies(unittest.TestCase):
+    def setUp(self):
+        self.lexer = LexerService()
+        self.buffer = self.lexer.buffer_text(SOURCE)
+
+    def test_bodies_are_token_ranges_until_used(self):
+        """Test that lazy mode records each body without parsing it."""
+        with patch.object(function_parser, "parse_body", wraps=function_parser.parse_body) as parse_body:
+            program = ParserServiceV2(BufferedTokenIteratorService(), lazy_bodies=True).parse_lex(self.buffer)
+            self.assertEqual(parse_body.call_count, 0)
+            body = program.functions[3].body
+            self.assertIsInstance(body, LazyBody)
+            self.assertFalse(body.parsed)
+            self.assertEqual(self.buffer.kind(body.start), TokenType.LBRACE)
+            self.assertEqual(self.buffer.kind(body.end - 1), TokenType.RBRACE)
+
+            self.assertIsInstance(body.node, ReturnStatementNode)
+            self.assertIs(body.node, body.node)
+            self.assertTrue(body.parsed)
+            self.assertEqual(parse_body.call_count, 1)
+
+    def test_matches_eager_parsing(self):
+        """Test that resolved bodies equal eagerly parsed ones, for buffered and list tokens."""
+        expected = ParserServiceV2(BufferedTokenIteratorService()).parse_lex(self.buffer)
+        lazy = ParserServiceV2(BufferedTokenIteratorService(), lazy_bodies=True).parse_lex(self.buffer)
+        self.assertEqual(lazy, expected)
+        listed = ParserServiceV2(TokenIteratorService(), lazy_bodies=True).parse_lex(self.lexer.lex_source(SOURCE))
+        self.assertEqual(listed, expected)
+
+    def test_accept_delegates_to_body(self):
+        """Test that visitors reach the parsed body through LazyBody.accept."""
+        program = ParserServiceV2(BufferedTokenIteratorService(), lazy_bodies=True).parse_lex(self.buffer)
+
+        class Visitor:
+            def visit_return_statement(self, node, instructions):
+                instructions.append(node)
+                return node
+
+        instructions = []
+        program.functions[0].body.accept(Visitor(), instructions)
+        self.assertEqual(len(instructions), 1)
+        self.assertIsInstance(instructions[0], ReturnStatementNode)
+
+    def test_body_errors_are_deferred(self):
+        """Test that a syntax error in an unused body is only raised when the body is parsed."""
+        buffer = self.lexer.buffer_text("int f(void) { return 1 + ; }\nint g(void) { return 2; }\n")
+        program = ParserServiceV2(BufferedTokenIteratorService(), lazy_bodies=True).parse_lex(buffer)
+        self.assertEqual([function.name for function in program.functions], ["f", "g"])
+        with self.assertRaises(ValueError):
+            program.functions[0].body.node
+
+    def test_unclosed_body(self):
+        """Test that the brace scan reports a body missing its closing brace."""
+        buffer = self.lexer.buffer_text("int f(void) { return { 1;")
+        with self.assertRaises(SyntaxError):
+            ParserServiceV2(BufferedTokenIteratorService(), lazy_bodies=True).parse_lex(buffer)
+
+    def test_streaming_parses_eagerly(self):
+        """Test that a streamed token window falls back to parsing bodies immediately."""
+        parser = ParserServiceV2(StreamingTokenIteratorService(), lazy_bodies=True)
+        program = parser.parse_stream(self.lexer.iter_source(SOURCE))
+        self.assertIsInstance(program.functions[0].body, ReturnStatementNode)
+
+    def test_pickles_as_parsed_body(self):
+        """Test that a pickled LazyBody comes back as the plain body node."""
+        program = ParserServiceV2(BufferedTokenIteratorService(), lazy_bodies=True).parse_lex(self.buffer)
+        restored = pickle.loads(pickle.dumps(program))
+        self.assertIsInstance(restored.functions[0].body, ReturnStatementNode)
+        self.assertEqual(restored, program)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+# type: ignore
+import pickle
+import unittest
+from unittest.mock import patch
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.lexer.LexerService import LexerService
+from modules.models.enums.token_type import TokenType
+from modules.parser.ParserServiceV2 import ParserServiceV2, split_declarations
+from modules.parser.Services.BufferedTokenIteratorService import BufferedTokenIteratorService
+
+FUNCTION = """int f{index}(void) {{
+    return ({index} + 1) * ~{index} << 2 || {index} % 3;
+}}
+"""
+SOURCE = "".join(FUNCTION.format(index=index) for index in range(40))
+
+
+class TestParallelParsing(unittest.TestCase):
+    def setUp(self):
+        self.lexer = LexerService()
+        self.buffer = self.lexer.buffer_text(SOURCE)
+
+    def parser(self):
+        return ParserServiceV2(BufferedTokenIteratorService())
+
+    def test_split_declarations(self):
+        """Test that the pre-scan cuts after each closing brace at file scope."""
+        bounds = split_declarations(self.buffer)
+        self.assertEqual(len(bounds), 41)
+        self.assertEqual(bounds[0], 0)
+        self.assertEqual(bounds[-1], len(self.buffer))
+        for end in bounds[1:]:
+            self.assertEqual(self.buffer.kind(end - 1), TokenType.RBRACE)
+
+    def test_split_declarations_nested_and_trailing(self):
+        """Test that nested braces do not end a declaration and trailing tokens get their own range."""
+        buffer = self.lexer.buffer_text("int f(void) { { } } int x;")
+        self.assertEqual(split_declarations(buffer), [0, 9, 12])
+
+    def test_slice_keeps_tokens(self):
+        """Test that a TokenBuffer slice reads the same tokens from a smaller source."""
+        part = self.buffer.slice(10, 30)
+        self.assertEqual([(token.type, token.value, token.lineNumber) for token in part],
+            [(self.buffer[index].type, self.buffer[index].value, self.buffer[index].lineNumber) for index in range(10, 30)])
+        self.assertLess(len(part.source), len(self.buffer.source))
+
+    def test_matches_serial_parsing(self):
+        """Test that parsing across workers gives the same program as parse_lex."""
+        expected = self.parser().parse_lex(self.buffer)
+        for jobs in (2, 3, 7):
+            program = self.parser().parse_parallel(self.buffer, jobs=jobs, min_tokens=1)
+            self.assertEqual(program, expected)
+            self.assertEqual([function.name for function in program.functions], [f"f{index}" for index in range(40)])
+
+    def test_iterative_expressions_in_workers(self):
+        """Test that workers parse with the same expression mode."""
+        expected = self.parser().parse_lex(self.buffer)
+        parser = ParserServiceV2(BufferedTokenIteratorService(), iterative_expressions=True)
+        self.assertEqual(parser.parse_parallel(self.buffer, jobs=2, min_tokens=1), expected)
+
+    def test_worker_error_is_raised(self):
+        """Test that a syntax error inside one worker's declarations reaches the caller."""
+        buffer = self.lexer.buffer_text(SOURCE + "int broken(void) { return 1 + ; }\n" + SOURCE)
+        with self.assertRaises(ValueError):
+            self.parser().parse_parallel(buffer, jobs=3, min_tokens=1)
+
+    def test_small_input_is_parsed_serially(self):
+        """Test that a buffer below the token threshold does not start a process pool."""
+        with patch.object(sys.modules[ParserServiceV2.__module__], "ProcessPoolExecutor") as pool:
+            program = self.parser().parse_parallel(self.buffer, jobs=8)
+        pool.assert_not_called()
+        self.assertEqual(len(program.functions), 40)
+
+    def test_program_pickles(self):
+        """Test that parsed trees survive the round trip used to return them from workers."""
+        program = self.parser().parse_lex(self.buffer)
+        self.assertEqual(pickle.loads(pickle.dumps(program)), program)
+
+
+if __name__ == "__main__":
+    unittest.main()
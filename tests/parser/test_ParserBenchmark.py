@@ -0,0 +1,35 @@
+# type: ignore
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from benchmarks.parser_benchmark import SHAPES, format_report, growth, run
+from modules.lexer.LexerService import LexerService
+from modules.parser.Services.BufferedTokenIteratorService import BufferedTokenIteratorService
+from modules.parser.Services.ExpressionParser import ExpressionParser
+
+
+class TestParserBenchmark(unittest.TestCase):
+    def test_shapes_parse(self):
+        """Test that every shape generates a complete expression."""
+        lexer = LexerService()
+        for name, shape in SHAPES.items():
+            iterator = BufferedTokenIteratorService(lexer.buffer_text(shape(50)))
+            ExpressionParser(iterator, iterative=True).parse_expression()
+            self.assertTrue(iterator.at_end(), name)
+
+    def test_run_reports_recursion_failures(self):
+        """Test that the recursive mode is reported as failing past the recursion limit."""
+        depth = sys.getrecursionlimit() * 2
+        results = run([100, depth], shapes=["parentheses"], repeat=1)
+        timings = results["results"]["parentheses"]
+        self.assertIsNone(timings["recursive"][str(depth)]["seconds"])
+        self.assertIsNotNone(timings["iterative"][str(depth)]["seconds"])
+        self.assertIsNone(growth(results, "parentheses", "recursive"))
+        self.assertIsNotNone(growth(results, "parentheses", "iterative"))
+        self.assertIn("recursion", format_report(results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+# type: ignore
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.lexer.LexerService import LexerService
+from modules.models.enums.token_type import TokenType
+from modules.parser.ParserServiceV2 import ParserServiceV2
+from modules.parser.Services.StreamingTokenIteratorService import StreamingTokenIteratorService
+
+SOURCE = """#ifdef SUPPRESS_WARNINGS
+#pragma GCC diagnostic ignored "-Wparentheses"
+#endif
+int main(void) {
+    return (1 + 2) * 3 == 9 && ~4 < -5;
+}
+"""
+
+
+class TestStreamingTokenIteratorService(unittest.TestCase):
+    def setUp(self):
+        self.tokens = LexerService().lex_source(SOURCE)
+
+    def test_pulls_tokens_lazily(self):
+        """Test that tokens are only pulled from the source when needed."""
+        pulled = []
+        def source():
+            for token in self.tokens:
+                pulled.append(token)
+                yield token
+        iterator = StreamingTokenIteratorService(source())
+        self.assertEqual(len(pulled), 0)
+        self.assertEqual(iterator.current().type, TokenType.IFDEF)
+        self.assertEqual(len(pulled), 1)
+        self.assertTrue(iterator.has_tokens_ahead(2))
+        self.assertEqual(len(pulled), 3)
+
+    def test_window_stays_bounded(self):
+        """Test that the ring buffer never holds more than lookbehind + lookahead + 1 tokens."""
+        iterator = StreamingTokenIteratorService(iter(self.tokens))
+        largest = 0
+        while not iterator.at_end():
+            iterator.has_tokens_ahead(iterator.lookahead_size)
+            largest = max(largest, len(iterator.window))
+            iterator.advance()
+        self.assertLessEqual(largest, iterator.lookbehind_size + iterator.lookahead_size + 1)
+        self.assertEqual(iterator.current().type, TokenType.EOF)
+
+    def test_lookbehind_and_window_limits(self):
+        """Test lookbehind inside the window and errors outside of it."""
+        iterator = StreamingTokenIteratorService(iter(self.tokens))
+        iterator.advance()
+        iterator.advance()
+        self.assertEqual(iterator.lookbehind().value, self.tokens[1].value)
+        iterator.current()
+        with self.assertRaises(IndexError):
+            iterator.peek_behind(0)
+        with self.assertRaises(IndexError):
+            iterator.peek_ahead(iterator.position + iterator.lookahead_size + 1)
+
+    def test_parse_stream_matches_parse_lex(self):
+        """Test that streamed parsing builds the same AST as parsing a token list."""
+        expected = ParserServiceV2().parse_lex(list(self.tokens))
+        parser = ParserServiceV2(StreamingTokenIteratorService())
+        streamed = parser.parse_stream(iter(self.tokens))
+        self.assertEqual(streamed, expected)
+
+    def test_parse_stream_requires_streaming_iterator(self):
+        """Test that parse_stream rejects a list-backed token iterator."""
+        with self.assertRaises(TypeError):
+            ParserServiceV2().parse_stream(iter(self.tokens))
+
+
+if __name__ == "__main__":
+    unittest.main()
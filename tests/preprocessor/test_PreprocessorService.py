@@ -0,0 +1,196 @@
+# type: ignore
+import os
+import tempfile
+import unittest
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.preprocessor.PreprocessorService import PreprocessorError, PreprocessorService, parse_source
+
+
+class TestPreprocessorService(unittest.TestCase):
+    def setUp(self):
+        self.preprocessor = PreprocessorService()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(text)
+        return path
+
+    def code(self, source):
+        """Non-empty output lines, stripped"""
+        return [line.strip() for line in self.preprocessor.preprocess_source(source).split("\n") if line.strip()]
+
+    def test_object_and_function_macros(self):
+        """Test object-like and function-like expansion with nested calls."""
+        source = "#define N 3\n#define ADD(a, b) ((a) + (b))\n#define TWICE(x) ADD(x, x)\nint a = TWICE(N);\n"
+        self.assertEqual(self.code(source), ["int a = ((3) + (3));"])
+
+    def test_stringize_paste_and_variadic(self):
+        """Test #, ## and __VA_ARGS__."""
+        source = ('#define STR(x) #x\n#define CAT(a, b) a ## b\n#define CALL(f, ...) f(__VA_ARGS__)\n'
+                  'char *s = STR(say "hi");\nint CAT(va, r1) = CALL(g, 1, 2);\n')
+        self.assertEqual(self.code(source), ['char *s = "say \\"hi\\"";', "int var1 = g(1, 2);"])
+
+    def test_recursive_macro_is_not_expanded_again(self):
+        """Test that a macro does not expand inside its own expansion."""
+        source = "#define f(x) x + f(x)\n#define loop loop\nint r = f(2) + loop;\n"
+        self.assertEqual(self.code(source), ["int r = 2 + f(2) + loop;"])
+
+    def test_empty_macro_keeps_tokens_apart(self):
+        """Test that tokens on both sides of a macro that expands to nothing are not lexed as one."""
+        source = "#define EMPTY\n#define NONE(x)\nint r = 5 -EMPTY-1;\nint s = a+NONE(1)+b;\nint t = -EMPTY 1;\n"
+        self.assertEqual(self.code(source), ["int r = 5 - -1;", "int s = a+ +b;", "int t = - 1;"])
+
+    def test_call_spanning_lines_keeps_line_count(self):
+        """Test that a macro call continued on the next line expands and keeps later line numbers."""
+        source = "#define ADD(a, b) a + b\nint m = ADD(1,\n    2);\nint n;\n"
+        lines = self.preprocessor.preprocess_source(source).split("\n")
+        self.assertEqual(lines[1], "int m = 1 + 2;")
+        self.assertEqual(lines[2], "")
+        self.assertEqual(lines[3], "int n;")
+
+    def test_macro_name_at_end_of_line(self):
+        """Test that a function-like macro name ending a line is called when the next line opens with '('."""
+        source = "#define SQ(x) ((x)*(x))\nreturn SQ\n\n  (5);\nint n;\n"
+        lines = self.preprocessor.preprocess_source(source).split("\n")
+        self.assertEqual(lines[1:5], ["return ((5)*(5));", "", "", "int n;"])
+        source = "#define SQ(x) ((x)*(x))\nint SQ\n;\nint n;\nint SQ\n#define M 1\nint m = SQ"
+        lines = self.preprocessor.preprocess_source(source).split("\n")
+        self.assertEqual(lines[1:7], ["int SQ", ";", "int n;", "int SQ", "", "int m = SQ"])
+
+    def test_conditionals(self):
+        """Test #if/#elif/#else/#endif nesting, defined and #if arithmetic."""
+        source = """#define LEVEL 2
+#if LEVEL > 3
+int a;
+#elif defined(LEVEL) && LEVEL * 2 == 4
+int b;
+#ifndef LEVEL
+int c;
+#else
+int d;
+#endif
+#else
+int e;
+#endif
+#if UNDEFINED || (1 ? 0 : 1)
+int f;
+#endif
+"""
+        self.assertEqual(self.code(source), ["int b;", "int d;"])
+
+    def test_inactive_regions_are_skipped_and_recorded(self):
+        """Test that dead branches are jumped over without processing and reported as ranges."""
+        source = """#define ADD(a, b) a + b
+#if 0
+#error never reached
+#bogus
+int broken = ADD(1;
+#elif 1
+int live;
+#else
+int dead;
+#endif
+#ifdef MISSING
+#if 1
+#endif
+#endif
+"""
+        output = self.preprocessor.preprocess_source(source, "input.c").split("\n")
+        self.assertEqual([line for line in output if line.strip()], ["int live;"])
+        self.assertEqual(len(output), source.count("\n") + 1)
+        path = os.path.realpath("input.c")
+        self.assertEqual(self.preprocessor.skipped_ranges, [(path, 3, 5), (path, 9, 9), (path, 12, 13)])
+
+    def test_undef(self):
+        """Test that #undef removes a macro."""
+        self.assertEqual(self.code("#define N 1\n#undef N\nint n = N;\n"), ["int n = N;"])
+
+    def test_comments_and_strings(self):
+        """Test that directives in comments are ignored and strings are left alone."""
+        source = '/* #define N 1\n */\nchar *s = "N // not a comment"; // N\nint n = N;\n'
+        self.preprocessor.define("N 5")
+        output = self.preprocessor.preprocess_source(source).split("\n")
+        self.assertEqual(output[2].strip(), 'char *s = "N // not a comment";')
+        self.assertEqual(output[3], "int n = N;")
+
+    def test_line_numbers_are_kept(self):
+        """Test that the output has one line per line of the input."""
+        source = "#define A 1\n/* two\nlines */ int a = A;\n#if 0\nx\n#endif\nint b = \\\n 2;\nint c;\n"
+        output = self.preprocessor.preprocess_source(source).split("\n")
+        self.assertEqual(len(output), source.count("\n") + 1)
+        self.assertEqual(output[1].strip(), "int a = 1;")
+        self.assertEqual(output[6], "int b =  2;")
+        self.assertEqual(output[8], "int c;")
+
+    def test_includes_guards_and_pragma_once(self):
+        """Test quoted and angle includes, include guards and #pragma once."""
+        self.write("inc/guarded.h", "#ifndef GUARDED_H\n#define GUARDED_H\nint guarded;\n#endif\n")
+        self.write("inc/once.h", "#pragma once\nint once;\n")
+        self.write("local.h", '#include "inc/once.h"\nint local;\n')
+        main = self.write("main.c", '#include "local.h"\n#include <guarded.h>\n#include <guarded.h>\n#include "inc/once.h"\nint main;\n')
+        preprocessor = PreprocessorService([os.path.join(self.root, "inc")])
+        code = [line for line in preprocessor.preprocess_file(main).split("\n") if line.strip()]
+        self.assertEqual(code, ["int once;", "int local;", "int guarded;", "int main;"])
+
+    def test_errors_carry_location(self):
+        """Test that errors report the file and line."""
+        cases = [
+            ("int a;\n#error stop here\n", ":2: #error stop here"),
+            ("#if 1\nint a;\n", "Unterminated #if"),
+            ("#endif\n", "#endif without #if"),
+            ('#include "missing.h"\n', "Include file not found: missing.h"),
+            ("#define F(a, b) a\nint x = F(1);\n", "expects 2 arguments, got 1"),
+            ("#if 1 / 0\n#endif\n", "Division by zero"),
+            ("#bogus\n", "Unknown directive #bogus"),
+        ]
+        for source, message in cases:
+            with self.assertRaises(PreprocessorError) as context:
+                self.preprocessor.preprocess_source(source, "input.c")
+            self.assertIn(message, str(context.exception))
+
+    def test_predefined_macros_reset_per_file(self):
+        """Test that -D macros apply to every file and #defines do not leak between files."""
+        preprocessor = PreprocessorService(defines={"DEBUG": "1"})
+        self.assertIn("int a = 1;", preprocessor.preprocess_source("#define X 2\nint a = DEBUG;\n"))
+        self.assertIn("int b = X;", preprocessor.preprocess_source("int b = X;\n"))
+
+    def test_headers_are_cached_in_memory_and_on_disk(self):
+        """Test that a header is parsed once, reused from disk, and reparsed after it changes."""
+        header = self.write("header.h", "#define VALUE 1\n")
+        main = self.write("main.c", '#include "header.h"\nint v = VALUE;\n')
+        cache_dir = os.path.join(self.root, "cache")
+
+        first = PreprocessorService(cache_dir=cache_dir)
+        self.assertIn("int v = 1;", first.preprocess_file(main))
+        cached = first.header_cache[os.path.realpath(header)][1]
+        first.preprocess_file(main)
+        self.assertIs(first.header_cache[os.path.realpath(header)][1], cached)
+        self.assertEqual(first.disk_cache.misses, 2)
+
+        second = PreprocessorService(cache_dir=cache_dir)
+        self.assertIn("int v = 1;", second.preprocess_file(main))
+        self.assertEqual((second.disk_cache.hits, second.disk_cache.misses), (2, 0))
+
+        self.write("header.h", "#define VALUE 22\n")
+        os.utime(header, ns=(10**9, 10**9))
+        self.assertIn("int v = 22;", second.preprocess_file(main))
+        self.assertEqual(second.disk_cache.misses, 1)
+
+    def test_guard_detection(self):
+        """Test that only a guard wrapping the whole file is recognised."""
+        self.assertEqual(parse_source("a.h", "#ifndef A\n#define A\nint a;\n#endif\n").guard, "A")
+        self.assertIsNone(parse_source("b.h", "#ifndef B\n#define B\n#endif\nint b;\n").guard)
+        self.assertIsNone(parse_source("c.h", "#ifndef C\n#define C\n#endif\n#ifdef X\n#endif\n").guard)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+# type: ignore
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.IntermediateGenerator.visitors.StackAllocator import PSEUDO_REGISTERS, StackAllocator
+from modules.lexer.LexerService import LexerService
+from modules.models.enums.GenericRegisterEnum import GenericRegisterEnum
+from modules.models.nodes.IR.Operands.Register import Register
+from modules.utils.interning import SymbolTable, symbols
+
+
+class TestInterning(unittest.TestCase):
+    def test_symbol_table(self):
+        """Test that equal names share one instance."""
+        table = SymbolTable()
+        first = table.intern("".join(["co", "unt"]))
+        second = table.intern("".join(["cou", "nt"]))
+        self.assertIs(first, second)
+        table.intern("other")
+        self.assertIn("count", table)
+        self.assertEqual(len(table), 2)
+        table.clear()
+        self.assertNotIn("count", table)
+
+    def test_symbol_table_is_bounded(self):
+        """Test that a full table starts over instead of growing, and earlier names stay usable."""
+        table = SymbolTable(max_symbols=3)
+        names = [table.intern(f"lbl.end.{index}") for index in range(10)]
+        self.assertLessEqual(len(table), 3)
+        self.assertEqual(names, [f"lbl.end.{index}" for index in range(10)])
+        self.assertIs(table.intern("".join(["lbl.end.", "9"])), names[9])
+
+    def test_lexer_interns_identifiers_and_constants(self):
+        """Test that repeated identifiers and constants come out of the lexer as one object."""
+        lexer = LexerService()
+        source = "int value(void) { return 10 + 10; }\nint value;\n"
+        for tokens in (list(lexer.buffer_source(source)), lexer.lex_source(source)):
+            values = [t.value for t in tokens]
+            names = [v for v in values if v == "value"]
+            constants = [v for v in values if v == "10"]
+            self.assertIs(names[0], names[1])
+            self.assertIs(constants[0], constants[1])
+            self.assertIs(names[0], symbols.intern("value"))
+
+    def test_allocator_names_are_interned(self):
+        """Test that temporaries and registers keep their names and are shared across functions."""
+        first, second = StackAllocator(), StackAllocator()
+        temp = first.allocate_pseudo(first.next_temp_name())
+        self.assertEqual(temp.value, "tmp.0")
+        self.assertIs(temp.value, second.next_temp_name())
+        self.assertEqual(first.temp_counter, 1)
+
+        register = first.allocate_register(GenericRegisterEnum.R11)
+        self.assertEqual(register.value, f"reg.{GenericRegisterEnum.R11}")
+        self.assertIn(register.value, PSEUDO_REGISTERS)
+        self.assertEqual(first.resolve_pseudo(register), Register(value=GenericRegisterEnum.R11))
+        self.assertEqual(first.stack_offset, -4)
+
+
+if __name__ == "__main__":
+    unittest.main()